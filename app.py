@@ -10,10 +10,23 @@ from flask import (
 )
 import os
 import tempfile
+import hashlib
+import shutil
+import io
+import gzip
+import sqlite3
+import threading
+import zipfile
+from collections import deque, ChainMap, OrderedDict
+from collections.abc import Mapping
+from contextlib import closing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 import pandas as pd
 import numpy as np
 from collections import defaultdict
 from itertools import combinations
+import heapq
 import os
 from werkzeug.utils import secure_filename
 import logging
@@ -27,9 +40,19 @@ import sys
 if sys.version_info >= (3, 12):
     import setuptools
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    from scipy import sparse as scipy_sparse
+except ImportError:
+    scipy_sparse = None
+
 app = Flask(__name__)
 app.secret_key = "bundling_recommendation_key"
-app.config["ALLOWED_EXTENSIONS"] = {"csv", "xlsx", "xls"}
+app.config["ALLOWED_EXTENSIONS"] = {"csv", "xlsx", "xls", "csv.gz", "csv.zst", "zip"}
 app.config["SESSION_TYPE"] = "filesystem"
 app.config["SESSION_PERMANENT"] = False
 app.config["SESSION_USE_SIGNER"] = True
@@ -47,6 +70,81 @@ if not os.path.exists(app.config["UPLOAD_FOLDER"]):
 if not os.path.exists(app.config["SESSION_FILE_DIR"]):
     os.makedirs(app.config["SESSION_FILE_DIR"])
 
+# Cache kolumnar hasil parsing upload (satu entri per hash isi file)
+app.config["INGEST_CACHE_FOLDER"] = os.environ.get(
+    "INGEST_CACHE_FOLDER", os.path.join(UPLOAD_FOLDER, "ingest_cache")
+)
+app.config["INGEST_CACHE_MAX_BYTES"] = int(
+    os.environ.get("INGEST_CACHE_MAX_BYTES", 2 * 1024**3)
+)
+
+# Batas memori cache in-process (frame, transaksi, lattice) per worker
+app.config["ANALYSIS_CACHE_MAX_BYTES"] = int(
+    os.environ.get("ANALYSIS_CACHE_MAX_BYTES", 1024**3)
+)
+
+# Batas memori cache kolom tanggal yang sudah diparse
+app.config["DATE_CACHE_MAX_BYTES"] = int(
+    os.environ.get("DATE_CACHE_MAX_BYTES", 256 * 1024**2)
+)
+
+# Katalog produk persisten (SQLite) + penghitung penjualan per SKU
+app.config["CATALOG_DB_PATH"] = os.environ.get(
+    "CATALOG_DB_PATH", os.path.join(UPLOAD_FOLDER, "catalog.sqlite3")
+)
+
+# Basket order persisten yang ditambah per export harian (dedup Order ID)
+app.config["BASKET_STORE_PATH"] = os.environ.get(
+    "BASKET_STORE_PATH", os.path.join(UPLOAD_FOLDER, "baskets.sqlite3")
+)
+
+# Pencocokan SKU fuzzy master produk <-> export pesanan
+app.config["SKU_FUZZY_MATCHING"] = os.environ.get("SKU_FUZZY_MATCHING", "1") != "0"
+app.config["SKU_MATCH_MIN_CONFIDENCE"] = float(
+    os.environ.get("SKU_MATCH_MIN_CONFIDENCE", 0.75)
+)
+
+# Gabungkan basket identik menjadi satu transaksi berbobot sebelum mining
+app.config["COLLAPSE_DUPLICATE_BASKETS"] = (
+    os.environ.get("COLLAPSE_DUPLICATE_BASKETS", "1") != "0"
+)
+
+# Algoritma mining itemset default: "eclat" atau "fpgrowth" (bisa dipilih per analisis)
+app.config["MINING_ALGORITHM"] = os.environ.get("MINING_ALGORITHM", "eclat")
+
+# Representasi tidlist ECLAT: "tidlist" (array tid) atau "bitset" (uint64 terpaket)
+app.config["ECLAT_ENGINE"] = os.environ.get("ECLAT_ENGINE", "tidlist")
+
+# Itemset yang disimpan ECLAT: "all" (semua itemset frekuen), "closed" (lossless)
+# atau "maximal" (paling ringkas); mode ringkas mengurangi memori dan jumlah rule
+app.config["ECLAT_ITEMSET_MODE"] = os.environ.get("ECLAT_ITEMSET_MODE", "all")
+
+# Kepadatan prefix (support / total transaksi) mulai dari mana ECLAT memakai
+# diffset (dEclat) alih-alih tidlist penuh; > 1 mematikan mode diffset
+app.config["ECLAT_DIFFSET_DENSITY"] = float(os.environ.get("ECLAT_DIFFSET_DENSITY", 0.2))
+
+# Jumlah proses untuk mining paralel (mis. analisis tren per window)
+app.config["MINING_WORKERS"] = int(
+    os.environ.get("MINING_WORKERS", min(4, os.cpu_count() or 1))
+)
+
+# Proses ECLAT per equivalence class 1-item; paralel hanya jika jumlah
+# kandidat 3-itemset (pasangan partner per class) minimal ECLAT_PARALLEL_MIN_WORK
+app.config["ECLAT_WORKERS"] = int(
+    os.environ.get("ECLAT_WORKERS", app.config["MINING_WORKERS"])
+)
+app.config["ECLAT_PARALLEL_MIN_WORK"] = int(
+    os.environ.get("ECLAT_PARALLEL_MIN_WORK", 200000)
+)
+
+# Batas memori dan jumlah proses untuk ingest CSV besar per-chunk
+app.config["INGEST_MEMORY_BUDGET"] = int(
+    os.environ.get("INGEST_MEMORY_BUDGET", 512 * 1024**2)
+)
+app.config["INGEST_WORKERS"] = int(
+    os.environ.get("INGEST_WORKERS", min(4, os.cpu_count() or 1))
+)
+
 try:
     from flask_session import Session
 
@@ -57,38 +155,896 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Nama file di content store: "<sha256>.<ekstensi>"
+CONTENT_NAME_RE = re.compile(r"^[0-9a-f]{64}\.[a-z0-9.]+$")
+
+# CSV terkompresi didekompresi saat parsing, tidak pernah ditulis ke disk
+COMPRESSED_CSV_EXTENSIONS = {"csv.gz", "csv.zst", "zip"}
+CSV_EXTENSIONS = {"csv"} | COMPRESSED_CSV_EXTENSIONS
+
+
+class ColumnarCache:
+    """Cache kolumnar di disk untuk file upload yang sudah diparsing.
+
+    Setiap entri disimpan per kolom sebagai file .npy (bisa di-memory-map),
+    kolom teks disimpan sebagai kode kategori + daftar kategori. Key entri
+    adalah hash SHA-256 dari isi file, jadi file yang sama hanya diparsing sekali.
+
+    Kolom dimuat sebagai memory-map copy-on-write: frame hasil load boleh
+    diubah pemanggilnya (perubahan hanya di memori proses itu, file cache
+    tidak tersentuh) tanpa menyalin kolom saat dimuat.
+    """
+
+    MANIFEST = "manifest.json"
+    # Naikkan jika isi entri berubah (mis. kebijakan dtype parsing); entri
+    # dengan versi lain dianggap tidak ada dan diparse ulang
+    FORMAT_VERSION = 3
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.logger = logger
+        self._digests = {}
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def file_digest(self, filepath):
+        """Hash SHA-256 isi file, dimemo berdasarkan path, ukuran dan mtime"""
+        # File di content store sudah bernama "<sha256>.<ext>"
+        content_digest = FileHandler.stored_digest(filepath)
+        if content_digest is not None:
+            return content_digest
+
+        stat = os.stat(filepath)
+        memo_key = (os.path.abspath(filepath), stat.st_size, stat.st_mtime_ns)
+        digest = self._digests.get(memo_key)
+        if digest is None:
+            sha = hashlib.sha256()
+            with open(filepath, "rb") as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    sha.update(block)
+            digest = sha.hexdigest()
+            self._digests[memo_key] = digest
+        return digest
+
+    @staticmethod
+    def projection_key(digest, columns):
+        """Key entri cache untuk subset kolom dari file yang sama"""
+        names = json.dumps(sorted(str(col) for col in columns))
+        return f"{digest}-{hashlib.sha1(names.encode()).hexdigest()[:12]}"
+
+    def artifact_path(self, digest, name):
+        """Path file turunan kecil (mis. indeks tanggal) milik sebuah file upload"""
+        artifact_dir = os.path.join(self.cache_dir, "indexes")
+        os.makedirs(artifact_dir, exist_ok=True)
+        suffix = hashlib.sha1(name.encode()).hexdigest()[:12]
+        return os.path.join(artifact_dir, f"{digest}-{suffix}.npz")
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def load(self, key, columns=None):
+        """Muat entri cache sebagai DataFrame (None jika tidak ada / rusak)"""
+        entry_dir = self._entry_dir(key)
+        manifest_path = os.path.join(entry_dir, self.MANIFEST)
+        if not os.path.exists(manifest_path):
+            return None
+
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            if manifest.get("version") != self.FORMAT_VERSION:
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                return None
+
+            data = {}
+            for i, col in enumerate(manifest["columns"]):
+                name = col["name"]
+                if columns is not None and name not in columns:
+                    continue
+                values = np.load(
+                    os.path.join(entry_dir, f"{i}.npy"), mmap_mode="c"
+                )
+                if col["kind"] == "category":
+                    categories = np.load(
+                        os.path.join(entry_dir, f"{i}.categories.npy"),
+                        allow_pickle=True,
+                    )
+                    values = pd.Categorical.from_codes(
+                        values, categories=pd.Index(categories, dtype=object)
+                    )
+                data[name] = values
+
+            df = pd.DataFrame(data, index=pd.RangeIndex(manifest["rows"]), copy=False)
+            # Key entri proyeksi berbentuk "<hash>-<kolom>", ambil hash file-nya
+            df.attrs["content_hash"] = key.split("-", 1)[0]
+            os.utime(manifest_path)
+            return df
+
+        except Exception as e:
+            self.logger.warning(f"Cache entry {key} tidak bisa dibaca: {str(e)}")
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return None
+
+    def store(self, key, df):
+        """Simpan DataFrame ke cache, return False jika tidak bisa dicache"""
+        if not all(isinstance(name, (str, int, float)) for name in df.columns):
+            return False
+
+        tmp_dir = tempfile.mkdtemp(prefix=f".{key}-", dir=self.cache_dir)
+        try:
+            columns = []
+            for i, name in enumerate(df.columns):
+                series = df.iloc[:, i]
+                if isinstance(series.dtype, np.dtype) and series.dtype.kind in "biufmM":
+                    np.save(os.path.join(tmp_dir, f"{i}.npy"), series.to_numpy())
+                    columns.append({"name": name, "kind": "array"})
+                else:
+                    codes, uniques = pd.factorize(series)
+                    dtype = np.int16 if len(uniques) < 2**15 else np.int32
+                    np.save(os.path.join(tmp_dir, f"{i}.npy"), codes.astype(dtype))
+                    np.save(
+                        os.path.join(tmp_dir, f"{i}.categories.npy"),
+                        np.asarray(uniques, dtype=object),
+                        allow_pickle=True,
+                    )
+                    columns.append({"name": name, "kind": "category"})
+
+            with open(os.path.join(tmp_dir, self.MANIFEST), "w") as f:
+                json.dump(
+                    {"version": self.FORMAT_VERSION, "rows": len(df), "columns": columns}, f
+                )
+
+            try:
+                os.rename(tmp_dir, self._entry_dir(key))
+            except OSError:
+                # Entri yang sama sudah ditulis oleh worker lain
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+            self.evict()
+            return True
+
+        except Exception as e:
+            self.logger.warning(f"Gagal menyimpan cache {key}: {str(e)}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return False
+
+    def evict(self):
+        """Hapus entri yang paling lama tidak dipakai sampai di bawah batas ukuran"""
+        entries = []
+        total_bytes = 0
+        for key in os.listdir(self.cache_dir):
+            entry_dir = self._entry_dir(key)
+            manifest_path = os.path.join(entry_dir, self.MANIFEST)
+            if key.startswith(".") or not os.path.exists(manifest_path):
+                continue
+            size = sum(
+                os.path.getsize(os.path.join(entry_dir, name))
+                for name in os.listdir(entry_dir)
+            )
+            entries.append((os.path.getmtime(manifest_path), size, entry_dir))
+            total_bytes += size
+
+        entries.sort()
+        while total_bytes > self.max_bytes and len(entries) > 1:
+            _, size, entry_dir = entries.pop(0)
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total_bytes -= size
+            self.logger.info(f"Evicted ingest cache entry {os.path.basename(entry_dir)}")
+
+
+ingest_cache = ColumnarCache(
+    app.config["INGEST_CACHE_FOLDER"], app.config["INGEST_CACHE_MAX_BYTES"]
+)
+
+
+class MemoryLRUCache:
+    """Cache LRU in-process dengan batas total ukuran (byte).
+
+    Dipakai bersama oleh semua request dalam satu worker, jadi akses dilindungi
+    lock. Nilai yang disimpan dianggap read-only oleh pemakainya; frame
+    dikembalikan sebagai salinan lewat BundlingRecommendationSystem.load_frame.
+    """
+
+    # Jumlah elemen yang diukur saat mengestimasi ukuran koleksi besar
+    SIZE_SAMPLE = 64
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.logger = logger
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def estimate_size(cls, value):
+        """Estimasi ukuran objek di memori (byte)"""
+        if isinstance(value, pd.DataFrame):
+            return int(value.memory_usage(index=True, deep=True).sum())
+        if isinstance(value, pd.Series):
+            return int(value.memory_usage(index=True, deep=True))
+        if isinstance(value, np.ndarray):
+            return int(value.nbytes)
+        if isinstance(value, dict):
+            items = list(value.items())
+            if not items:
+                return sys.getsizeof(value)
+            sample = items[:: max(1, len(items) // cls.SIZE_SAMPLE)]
+            per_item = sum(
+                cls.estimate_size(k) + cls.estimate_size(v) for k, v in sample
+            ) / len(sample)
+            return int(sys.getsizeof(value) + per_item * len(items))
+        if isinstance(value, (list, tuple, set, frozenset)):
+            items = list(value) if not isinstance(value, (list, tuple)) else value
+            if not items:
+                return sys.getsizeof(value)
+            sample = items[:: max(1, len(items) // cls.SIZE_SAMPLE)]
+            per_item = sum(cls.estimate_size(v) for v in sample) / len(sample)
+            return int(sys.getsizeof(value) + per_item * len(items))
+        if hasattr(value, "__dict__"):
+            # Objek indeks/store: ukur atribut-atributnya
+            return int(sys.getsizeof(value) + cls.estimate_size(vars(value)))
+        return sys.getsizeof(value)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+            return default
+
+    def put(self, key, value, size=None):
+        if size is None:
+            size = self.estimate_size(value)
+        if size > self.max_bytes:
+            self.logger.info(f"Cache entry {key[0]} terlalu besar ({size:,} bytes)")
+            return
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute, cache_if=None):
+        """Ambil dari cache atau hitung lalu simpan (jika `cache_if(value)` benar)"""
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+        value = compute()
+        if value is not None and (cache_if is None or cache_if(value)):
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "current_bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0,
+            }
+
+
+def _factorize_columns(chunk, columns):
+    """Encode setiap kolom chunk menjadi (codes, uniques)"""
+    return {col: pd.factorize(chunk[col]) for col in columns}
+
+
+def _parse_csv_bytes(raw, names, columns):
+    """Worker: parse blok byte CSV (tanpa header) menjadi kolom ter-encode"""
+    chunk = pd.read_csv(
+        io.BytesIO(raw), header=None, names=names, usecols=columns, dtype=str
+    )
+    return _factorize_columns(chunk, columns)
+
+
+def _parse_csv_range(filepath, start, end, names, columns):
+    """Worker: parse satu rentang byte CSV dan kembalikan kolom ter-encode"""
+    with open(filepath, "rb") as f:
+        f.seek(start)
+        raw = f.read(end - start)
+    return _parse_csv_bytes(raw, names, columns)
+
+
+class ChunkedCsvReader:
+    """Ingest CSV besar per-chunk dengan proyeksi kolom.
+
+    Hanya kolom yang diminta yang diparsing, setiap chunk langsung di-encode
+    menjadi kode kategori, dan chunk diparsing paralel di process pool.
+    Ukuran chunk diturunkan dari memory budget sehingga puncak memori tidak
+    bergantung pada ukuran file.
+    """
+
+    # Perkiraan rasio memori hasil parsing terhadap ukuran byte mentah
+    EXPANSION_FACTOR = 4
+    MIN_CHUNK_BYTES = 8 * 1024 * 1024
+    SCAN_BLOCK_BYTES = 4 * 1024 * 1024
+
+    def __init__(self, memory_budget, workers):
+        self.memory_budget = memory_budget
+        self.workers = max(1, workers)
+        self.logger = logger
+
+    @property
+    def chunk_bytes(self):
+        return max(
+            self.MIN_CHUNK_BYTES,
+            self.memory_budget // (self.workers * self.EXPANSION_FACTOR),
+        )
+
+    @staticmethod
+    def _first_safe_newline(data):
+        """Posisi newline pertama yang tidak berada di dalam field ber-quote"""
+        nl = data.find(b"\n")
+        while nl >= 0 and data.count(b'"', 0, nl) % 2:
+            nl = data.find(b"\n", nl + 1)
+        return nl
+
+    @staticmethod
+    def _last_safe_newline(data):
+        """Posisi newline terakhir yang tidak berada di dalam field ber-quote"""
+        total_quotes = data.count(b'"')
+        quotes_after = 0
+        end = len(data)
+        nl = data.rfind(b"\n")
+        while nl >= 0:
+            quotes_after += data.count(b'"', nl, end)
+            end = nl
+            if (total_quotes - quotes_after) % 2 == 0:
+                return nl
+            nl = data.rfind(b"\n", 0, nl)
+        return -1
+
+    def _header_end(self, filepath):
+        """Offset byte setelah baris header (mengabaikan newline di dalam quote)"""
+        head = b""
+        with open(filepath, "rb") as f:
+            # Header bisa lebih panjang dari satu blok scan
+            while True:
+                block = f.read(self.SCAN_BLOCK_BYTES)
+                head += block
+                nl = self._first_safe_newline(head)
+                if nl >= 0:
+                    return nl + 1
+                if not block:
+                    return len(head)
+
+    def iter_blocks(self, stream):
+        """Potong stream CSV menjadi blok byte tanpa header, berakhir di batas baris"""
+        pending = b""
+        header_done = False
+        while True:
+            block = stream.read(self.chunk_bytes)
+            data = pending + block
+            if not header_done:
+                nl = self._first_safe_newline(data)
+                if nl < 0 and block:
+                    pending = data
+                    continue
+                data = data[nl + 1 :] if nl >= 0 else b""
+                header_done = True
+
+            if not block:
+                if data:
+                    yield data
+                return
+
+            cut = self._last_safe_newline(data)
+            if cut < 0:
+                pending = data
+                continue
+            yield data[: cut + 1]
+            pending = data[cut + 1 :]
+
+    def split_ranges(self, filepath, data_start):
+        """Bagi file menjadi rentang byte yang berakhir di batas baris.
+
+        Newline hanya dipakai sebagai batas jika jumlah tanda kutip sebelumnya
+        genap, jadi field ber-quote yang berisi newline tidak terpotong.
+        """
+        size = os.path.getsize(filepath)
+        chunk_bytes = self.chunk_bytes
+        bounds = [data_start]
+        target = data_start + chunk_bytes
+        quotes = 0
+
+        with open(filepath, "rb") as f:
+            f.seek(data_start)
+            offset = data_start
+            while target < size:
+                block = f.read(self.SCAN_BLOCK_BYTES)
+                if not block:
+                    break
+                cursor = 0
+                while target < offset + len(block):
+                    nl = block.find(b"\n", max(target - offset, cursor))
+                    if nl < 0:
+                        break
+                    quotes += block.count(b'"', cursor, nl)
+                    cursor = nl
+                    if quotes % 2 == 0:
+                        bounds.append(offset + nl + 1)
+                        target = offset + nl + 1 + chunk_bytes
+                    else:
+                        target = offset + nl + 1
+                quotes += block.count(b'"', cursor)
+                offset += len(block)
+
+        if bounds[-1] < size:
+            bounds.append(size)
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    @staticmethod
+    def merge_parts(parts, columns):
+        """Gabungkan kolom ter-encode dari setiap chunk menjadi Categorical"""
+        data = {}
+        for col in columns:
+            all_uniques = [np.asarray(part[col][1], dtype=object) for part in parts]
+            merged_codes, categories = pd.factorize(
+                np.concatenate(all_uniques) if all_uniques else np.array([], object)
+            )
+            codes_list = []
+            offset = 0
+            for part in parts:
+                codes, uniques = part[col]
+                mapping = np.append(
+                    merged_codes[offset : offset + len(uniques)], -1
+                ).astype(np.int32)
+                codes_list.append(mapping[codes])
+                offset += len(uniques)
+            codes = (
+                np.concatenate(codes_list) if codes_list else np.array([], np.int32)
+            )
+            data[col] = pd.Categorical.from_codes(
+                codes, categories=pd.Index(categories, dtype=object)
+            )
+        return pd.DataFrame(data)
+
+    def read_stream(self, filepath, names, columns):
+        """Parse CSV terkompresi blok demi blok sambil didekompresi"""
+        parts = []
+        with FileHandler.open_csv_stream(filepath) as stream:
+            blocks = self.iter_blocks(stream)
+            if self.workers > 1:
+                with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                    # Batasi blok yang sedang diproses agar memori tetap datar
+                    in_flight = deque()
+                    for raw in blocks:
+                        in_flight.append(
+                            pool.submit(_parse_csv_bytes, raw, names, columns)
+                        )
+                        if len(in_flight) >= self.workers:
+                            parts.append(in_flight.popleft().result())
+                    parts.extend(future.result() for future in in_flight)
+            else:
+                parts = [_parse_csv_bytes(raw, names, columns) for raw in blocks]
+        return parts
+
+    def read(self, filepath, usecols):
+        """Baca hanya kolom `usecols` dari CSV (kolom yang tidak ada diabaikan)"""
+        with FileHandler.open_csv_stream(filepath) as stream:
+            names = pd.read_csv(stream, nrows=0).columns.tolist()
+        columns = [col for col in names if col in usecols]
+
+        start_time = time.time()
+        if FileHandler.file_extension(filepath) in COMPRESSED_CSV_EXTENSIONS:
+            parts = self.read_stream(filepath, names, columns)
+        else:
+            ranges = self.split_ranges(filepath, self._header_end(filepath))
+            parts = self.read_ranges(filepath, ranges, names, columns)
+
+        df = self.merge_parts(parts, columns)
+        self.logger.info(
+            f"Chunked ingest {os.path.basename(filepath)}: {len(df)} rows, "
+            f"{len(columns)} columns, {len(parts)} chunks ({time.time() - start_time:.1f}s)"
+        )
+        return df
+
+    def read_ranges(self, filepath, ranges, names, columns):
+        """Parse rentang byte CSV tidak terkompresi, paralel jika lebih dari satu"""
+        if len(ranges) > 1 and self.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                futures = [
+                    pool.submit(_parse_csv_range, filepath, start, end, names, columns)
+                    for start, end in ranges
+                ]
+                return [future.result() for future in futures]
+        return [
+            _parse_csv_range(filepath, start, end, names, columns)
+            for start, end in ranges
+        ]
+
+
+chunked_csv_reader = ChunkedCsvReader(
+    app.config["INGEST_MEMORY_BUDGET"], app.config["INGEST_WORKERS"]
+)
+
+
+class XlsxStreamReader:
+    """Pembaca XLSX streaming (openpyxl read-only) dengan proyeksi kolom.
+
+    Baris dibaca satu per satu dan hanya sel dari kolom yang diminta yang
+    disimpan. Konversi sel dan inferensi tipe mengikuti pd.read_excel.
+    """
+
+    DESCRIPTION_PREFIX = "Platform unique"
+
+    def __init__(self):
+        self.logger = logger
+
+    @staticmethod
+    def _convert_cell(value):
+        """Konversi nilai sel seperti reader openpyxl milik pandas"""
+        if value is None:
+            return ""
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        return value
+
+    @classmethod
+    def is_description_row(cls, row):
+        return bool(row) and str(row[0]).startswith(cls.DESCRIPTION_PREFIX)
+
+    def iter_rows(self, filepath, sheet_name=None):
+        """Generator baris (list nilai sel) dari sheet, tanpa trailing sel kosong"""
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(
+            filepath, read_only=True, data_only=True, keep_links=False
+        )
+        try:
+            sheet = (
+                workbook[sheet_name]
+                if sheet_name is not None
+                else workbook.worksheets[0]
+            )
+            sheet.reset_dimensions()
+            for values in sheet.iter_rows(values_only=True):
+                row = [self._convert_cell(value) for value in values]
+                while row and row[-1] == "":
+                    row.pop()
+                yield row
+        finally:
+            workbook.close()
+
+    def _rows_to_frame(self, rows):
+        """Bangun DataFrame dari baris (baris pertama = header) via TextParser"""
+        from pandas.io.parsers import TextParser
+
+        width = max((len(row) for row in rows), default=0)
+        rows = [row + [""] * (width - len(row)) for row in rows]
+        return TextParser(rows, header=0, skip_blank_lines=False).read()
+
+    def _stream(self, filepath, usecols, sheet_name, skip_description, limit=None):
+        """Stream sheet: kembalikan (header, baris terproyeksi, jumlah baris data)"""
+        rows_iter = self.iter_rows(filepath, sheet_name)
+        header = next(rows_iter, [])
+        if usecols is None:
+            indices = None
+        else:
+            indices = [i for i, name in enumerate(header) if name in usecols]
+            header = [header[i] for i in indices]
+
+        rows = []
+        pending_empty = 0
+        row_count = 0
+        for position, row in enumerate(rows_iter):
+            # Baris deskripsi export marketplace ada di 2 baris data pertama
+            if skip_description and position < 2 and self.is_description_row(row):
+                rows.clear()
+                pending_empty = 0
+                row_count = 0
+                continue
+
+            if not row:
+                # Baris kosong di akhir sheet diabaikan seperti pd.read_excel
+                pending_empty += 1
+                continue
+
+            for _ in range(pending_empty):
+                if limit is None or len(rows) < limit:
+                    rows.append([])
+            row_count += pending_empty + 1
+            pending_empty = 0
+
+            if limit is None or len(rows) < limit:
+                if indices is not None:
+                    row = [row[i] if i < len(row) else "" for i in indices]
+                rows.append(row)
+
+        return header, rows, row_count
+
+    def read(self, filepath, usecols=None, sheet_name=None, skip_description=False):
+        """Baca sheet menjadi DataFrame, hanya kolom `usecols` jika diberikan"""
+        header, rows, _ = self._stream(filepath, usecols, sheet_name, skip_description)
+        return self._rows_to_frame([header] + rows)
+
+    def inspect(self, filepath, preview_rows=5, sheet_name=None):
+        """Kolom, jumlah baris data dan preview tanpa membangun seluruh frame"""
+        header, rows, row_count = self._stream(
+            filepath, None, sheet_name, skip_description=True, limit=preview_rows
+        )
+        preview = self._rows_to_frame([header] + rows)
+        return {
+            "columns": preview.columns.tolist(),
+            "row_count": row_count,
+            "preview": preview,
+        }
+
+
+xlsx_stream_reader = XlsxStreamReader()
+
 
 class FileHandler:
     """Class untuk menangani operasi file"""
 
+    @staticmethod
+    def file_extension(filename):
+        """Ekstensi file, termasuk ekstensi ganda CSV terkompresi (mis. "csv.gz")"""
+        name = filename.lower()
+        for extension in ("csv.gz", "csv.zst"):
+            if name.endswith("." + extension):
+                return extension
+        return name.rsplit(".", 1)[1] if "." in name else ""
+
     @staticmethod
     def allowed_file(filename):
         """Cek apakah ekstensi file diizinkan"""
         return (
-            "." in filename
-            and filename.rsplit(".", 1)[1].lower() in app.config["ALLOWED_EXTENSIONS"]
+            FileHandler.file_extension(filename) in app.config["ALLOWED_EXTENSIONS"]
         )
 
     @staticmethod
-    def read_file(filepath):
-        """Baca file CSV atau Excel"""
+    def open_csv_stream(filepath):
+        """Buka CSV sebagai stream biner, didekompresi on-the-fly jika perlu"""
+        extension = FileHandler.file_extension(filepath)
+        if extension == "csv.gz":
+            return gzip.open(filepath, "rb")
+        if extension == "csv.zst":
+            if zstandard is None:
+                raise ValueError("Dukungan file .zst membutuhkan paket zstandard")
+            return zstandard.ZstdDecompressor().stream_reader(open(filepath, "rb"))
+        if extension == "zip":
+            with zipfile.ZipFile(filepath) as archive:
+                # Stream tetap bisa dibaca setelah arsip ditutup
+                return archive.open(FileHandler.zip_csv_member(archive))
+        return open(filepath, "rb")
+
+    @staticmethod
+    def zip_csv_member(archive):
+        """Nama satu-satunya file CSV di arsip zip; ValueError jika tidak tepat satu"""
+        members = [
+            name
+            for name in archive.namelist()
+            if name.lower().endswith(".csv") and not name.endswith("/")
+        ]
+        if not members:
+            raise ValueError("Arsip zip tidak berisi file CSV")
+        if len(members) > 1:
+            raise ValueError(
+                f"Arsip zip berisi {len(members)} file CSV ({', '.join(members)}); "
+                "upload satu file CSV per arsip"
+            )
+        return members[0]
+
+    @staticmethod
+    def validate_archive(filepath):
+        """Cek arsip zip sebelum dibaca; ValueError dengan pesan jelas jika tidak valid"""
+        if FileHandler.file_extension(filepath) == "zip":
+            with zipfile.ZipFile(filepath) as archive:
+                FileHandler.zip_csv_member(archive)
+
+    @staticmethod
+    def read_file(filepath, use_cache=True, usecols=None, sheet_name=None):
+        """Baca file CSV atau Excel, lewat cache kolumnar jika tersedia.
+
+        Jika `usecols` diberikan hanya kolom tersebut yang dibaca; CSV besar
+        kemudian diparsing per-chunk secara paralel dengan memori terbatas,
+        XLSX dibaca streaming dengan openpyxl read-only (baris deskripsi
+        "Platform unique" dilewati saat streaming). Semua jalur CSV
+        memakai dtype=str, sehingga hasilnya sama baik dari cache maupun
+        tidak (mis. Order ID numerik dengan NaN tetap "12345", bukan 12345.0).
+        """
         try:
-            if filepath.endswith(".csv"):
-                return pd.read_csv(filepath)
+            cache_key = None
+            if use_cache:
+                digest = ingest_cache.file_digest(filepath)
+                if sheet_name is None:
+                    df = ingest_cache.load(digest, columns=usecols)
+                    if df is not None:
+                        return df
+
+                cache_key = digest
+                if usecols is not None or sheet_name is not None:
+                    key_parts = list(usecols or [])
+                    if sheet_name is not None:
+                        key_parts.append(f"sheet:{sheet_name}")
+                    cache_key = ingest_cache.projection_key(digest, key_parts)
+                    df = ingest_cache.load(cache_key)
+                    if df is not None:
+                        return df
+
+            if FileHandler.file_extension(filepath) in CSV_EXTENSIONS:
+                if usecols is None:
+                    with FileHandler.open_csv_stream(filepath) as stream:
+                        df = pd.read_csv(stream, dtype=str)
+                else:
+                    df = chunked_csv_reader.read(filepath, usecols)
+            elif filepath.endswith(".xlsx"):
+                df = xlsx_stream_reader.read(
+                    filepath, usecols, sheet_name, skip_description=True
+                )
             else:
-                return pd.read_excel(filepath)
+                df = pd.read_excel(
+                    filepath,
+                    sheet_name=sheet_name or 0,
+                    usecols=(lambda col: col in usecols) if usecols else None,
+                )
+
+            # Kembalikan versi dari cache agar tipe kolom selalu konsisten
+            if cache_key is not None and ingest_cache.store(cache_key, df):
+                cached_df = ingest_cache.load(cache_key)
+                if cached_df is not None:
+                    return cached_df
+            return df
         except Exception as e:
             logger.error(f"Error reading file {filepath}: {str(e)}")
             return None
 
+    @staticmethod
+    def inspect_file(filepath, preview_rows=5):
+        """Kolom, jumlah baris dan preview file tanpa memuat seluruh isi.
+
+        Baris deskripsi ("Platform unique ...") di awal export ikut dilewati.
+        Arsip zip yang tidak berisi tepat satu CSV menaikkan ValueError agar
+        pesannya sampai ke pengguna.
+        """
+        FileHandler.validate_archive(filepath)
+        try:
+            if filepath.endswith(".xlsx"):
+                return xlsx_stream_reader.inspect(filepath, preview_rows)
+
+            if FileHandler.file_extension(filepath) in CSV_EXTENSIONS:
+                with FileHandler.open_csv_stream(filepath) as stream:
+                    head = pd.read_csv(stream, nrows=preview_rows + 2, dtype=str)
+                row_count = len(
+                    chunked_csv_reader.read(filepath, head.columns.tolist()[:1])
+                )
+            else:
+                head = FileHandler.read_file(filepath)
+                if head is None:
+                    return None
+                row_count = len(head)
+
+            for position in range(min(2, len(head))):
+                if XlsxStreamReader.is_description_row(
+                    [str(head.iloc[position, 0])]
+                ):
+                    head = head.iloc[position + 1 :].reset_index(drop=True)
+                    row_count -= position + 1
+                    break
+
+            return {
+                "columns": head.columns.tolist(),
+                "row_count": row_count,
+                "preview": head.head(preview_rows),
+            }
+        except Exception as e:
+            logger.error(f"Error inspecting file {filepath}: {str(e)}")
+            return None
+
+    @staticmethod
+    def content_store_dir(upload_folder):
+        return os.path.join(upload_folder, "content")
+
+    @staticmethod
+    def stored_digest(filepath):
+        """Hash isi file jika file berada di content store, selain itu None"""
+        directory, name = os.path.split(os.path.abspath(filepath))
+        if os.path.basename(directory) != "content" or not CONTENT_NAME_RE.match(name):
+            return None
+        return name.split(".", 1)[0]
+
+    @staticmethod
+    def detect_extension(filename, head, fileobj=None):
+        """Tentukan ekstensi asli file dari magic bytes, fallback ke nama file"""
+        extension = FileHandler.file_extension(filename)
+        if head.startswith(b"PK\x03\x04"):
+            if fileobj is None:
+                return "zip" if extension == "zip" else "xlsx"
+            # Workbook XLSX juga berupa zip, bedakan dari isinya
+            with zipfile.ZipFile(fileobj) as archive:
+                is_workbook = "[Content_Types].xml" in archive.namelist()
+            return "xlsx" if is_workbook else "zip"
+        if head.startswith(b"\xd0\xcf\x11\xe0"):
+            return "xls"
+        if head.startswith(b"\x1f\x8b"):
+            return "csv.gz"
+        if head.startswith(b"\x28\xb5\x2f\xfd"):
+            return "csv.zst"
+        if extension in ("xlsx", "xls", "zip", "csv.gz", "csv.zst"):
+            # Isi bukan workbook/arsip, perlakukan sebagai CSV biasa
+            return "csv"
+        return extension or "csv"
+
     @staticmethod
     def save_file(file, upload_folder, filename=None):
-        """Simpan file yang diupload"""
+        """Simpan file upload secara content-addressed.
+
+        File disimpan sebagai "<sha256>.<ekstensi asli>" di content store,
+        upload ulang dengan isi yang sama tidak ditulis ulang. `filename`
+        hanya nama tampilan untuk session.
+        """
         try:
             if filename is None:
                 filename = secure_filename(file.filename)
-            filepath = os.path.join(upload_folder, filename)
-            file.save(filepath)
+            store_dir = FileHandler.content_store_dir(upload_folder)
+            os.makedirs(store_dir, exist_ok=True)
+
+            stream = file.stream
+            sha = hashlib.sha256()
+            head = b""
+            tmp_path = None
+            tmp_file = None
+            if not stream.seekable():
+                # Stream tidak bisa dibaca ulang, tulis sambil hashing
+                fd, tmp_path = tempfile.mkstemp(prefix=".upload-", dir=store_dir)
+                tmp_file = os.fdopen(fd, "wb")
+
+            try:
+                for block in iter(lambda: stream.read(1024 * 1024), b""):
+                    sha.update(block)
+                    if len(head) < 16:
+                        head += block[:16]
+                    if tmp_file is not None:
+                        tmp_file.write(block)
+            finally:
+                if tmp_file is not None:
+                    tmp_file.close()
+
+            digest = sha.hexdigest()
+            if tmp_path is None:
+                stream.seek(0)
+                extension = FileHandler.detect_extension(
+                    file.filename or filename, head, stream
+                )
+            else:
+                with open(tmp_path, "rb") as tmp_file:
+                    extension = FileHandler.detect_extension(
+                        file.filename or filename, head, tmp_file
+                    )
+            filepath = os.path.join(store_dir, f"{digest}.{extension}")
+
+            if os.path.exists(filepath):
+                logger.info(f"Upload {filename} sudah ada di content store ({digest[:12]})")
+                if tmp_path is not None:
+                    os.remove(tmp_path)
+            else:
+                if tmp_path is None:
+                    stream.seek(0)
+                    fd, tmp_path = tempfile.mkstemp(prefix=".upload-", dir=store_dir)
+                    with os.fdopen(fd, "wb") as tmp_file:
+                        shutil.copyfileobj(stream, tmp_file, 1024 * 1024)
+                os.replace(tmp_path, filepath)
+
             return filepath, filename
         except Exception as e:
             logger.error(f"Error saving file: {str(e)}")
@@ -98,6 +1054,16 @@ class FileHandler:
 class DateFilter:
     """Class untuk filtering data berdasarkan tanggal"""
 
+    # Format tanggal yang dikenali: (regex awal string, format strptime)
+    DATE_FORMATS = [
+        (r"^(\d{1,2}/\d{1,2}/\d{4})", "%d/%m/%Y"),
+        (r"^(\d{4}-\d{1,2}-\d{1,2})", "%Y-%m-%d"),
+        (r"^(\d{1,2}-\d{1,2}-\d{4})", "%d-%m-%Y"),
+    ]
+
+    # Kolom tanggal yang sudah diparse, dipakai bersama semua instance
+    _parsed_cache = MemoryLRUCache(app.config["DATE_CACHE_MAX_BYTES"])
+
     @staticmethod
     def extract_date_from_datetime(datetime_string):
         """Ekstrak tanggal dari string datetime"""
@@ -127,37 +1093,112 @@ class DateFilter:
 
         return datetime_str.split(" ")[0] if " " in datetime_str else datetime_str
 
+    @staticmethod
+    def parse_date_string(date_str):
+        """Parse string tanggal (dd/mm/yyyy, yyyy-mm-dd, dd-mm-yyyy), None jika gagal"""
+        try:
+            if "/" in date_str:
+                return datetime.strptime(date_str, "%d/%m/%Y")
+            elif "-" in date_str:
+                parts = date_str.split("-")
+                if len(parts[0]) == 4:
+                    return datetime.strptime(date_str, "%Y-%m-%d")
+                else:
+                    return datetime.strptime(date_str, "%d-%m-%Y")
+            return None
+        except:
+            return None
+
+    def extract_dates(self, values):
+        """Versi vektor extract_date_from_datetime + parsing ke datetime64.
+
+        Format dideteksi per nilai unik (bukan per baris), lalu setiap format
+        dikonversi sekaligus dengan pd.to_datetime. Return (label, tanggal)
+        sejajar dengan `values`: label = string tanggal hasil ekstraksi.
+        """
+        text = pd.Series(values, dtype=object).map(str).str.strip()
+        labels = pd.Series(None, index=text.index, dtype=object)
+        dates = pd.Series(pd.NaT, index=text.index, dtype="datetime64[ns]")
+        remaining = pd.Series(True, index=text.index)
+
+        for pattern, date_format in self.DATE_FORMATS:
+            extracted = text.str.extract(pattern, expand=False)
+            matched = extracted.notna() & remaining
+            if not matched.any():
+                continue
+            labels[matched] = extracted[matched]
+            dates[matched] = pd.to_datetime(
+                extracted[matched], format=date_format, errors="coerce"
+            )
+            remaining &= ~matched
+
+        # Nilai lain yang mengandung angka tetap dipakai sebagai label apa adanya
+        fallback = remaining & text.str.contains(r"\d") & (text.str.lower() != "order")
+        labels[fallback] = text[fallback].str.split(" ").str[0]
+        return labels.to_numpy(), dates.to_numpy()
+
+    def parse_date_column(self, df, column_name):
+        """Parse kolom tanggal sekali per file, hasil disimpan di cache.
+
+        Return (dates, label_codes, labels): `dates` datetime64 per baris (NaT
+        jika tidak valid), `label_codes` indeks ke `labels` per baris (-1 jika
+        kosong) dan `labels` daftar string tanggal unik.
+        """
+        digest = df.attrs.get("content_hash")
+        key = ("dates", digest, column_name, len(df))
+        if digest is not None:
+            cached = self._parsed_cache.get(key)
+            if cached is not None and cached["index"].equals(df.index):
+                return cached["dates"], cached["label_codes"], cached["labels"]
+
+        column = df[column_name]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            codes = column.cat.codes.to_numpy()
+            uniques = column.cat.categories.to_numpy(dtype=object)
+        else:
+            codes, uniques = pd.factorize(column)
+
+        unique_labels, unique_dates = self.extract_dates(uniques)
+        label_of_unique, labels = pd.factorize(unique_labels)
+        labels = np.asarray(labels, dtype=object)
+
+        # Nilai kosong (code -1) dipetakan ke slot terakhir: NaT / tanpa label
+        unique_dates = np.append(unique_dates, np.datetime64("NaT"))
+        label_of_unique = np.append(label_of_unique, -1)
+        dates = unique_dates[codes]
+        label_codes = label_of_unique[codes]
+
+        if digest is not None:
+            self._parsed_cache.put(
+                key,
+                {
+                    "index": df.index,
+                    "dates": dates,
+                    "label_codes": label_codes,
+                    "labels": labels,
+                },
+                size=dates.nbytes + label_codes.nbytes + labels.nbytes,
+            )
+        return dates, label_codes, labels
+
     def get_unique_dates_from_column(self, df, column_name):
         """Mendapatkan tanggal unik dari kolom datetime setelah transformasi"""
         if column_name not in df.columns:
             return []
 
-        dates = df[column_name].apply(self.extract_date_from_datetime)
-        valid_dates = dates.dropna()
-        valid_dates = valid_dates[valid_dates.str.len() > 5]
-        unique_dates = valid_dates.unique().tolist()
-
-        try:
-
-            def parse_date(date_str):
-                try:
-                    if "/" in date_str:
-                        return datetime.strptime(date_str, "%d/%m/%Y")
-                    elif "-" in date_str and date_str.count("-") == 2:
-                        parts = date_str.split("-")
-                        if len(parts[0]) == 4:
-                            return datetime.strptime(date_str, "%Y-%m-%d")
-                        else:
-                            return datetime.strptime(date_str, "%d-%m-%Y")
-                    return datetime.strptime(date_str, "%Y-%m-%d")
-                except:
-                    return datetime(1900, 1, 1)
+        _, label_codes, labels = self.parse_date_column(df, column_name)
+        present = np.unique(label_codes[label_codes >= 0])
+        unique_dates = [
+            label for label in labels[present] if len(label) > 5
+        ]
 
-            unique_dates.sort(key=parse_date)
-        except:
-            unique_dates.sort()
-
-        return unique_dates
+        # Urutkan berdasarkan tanggal; label yang tidak bisa diparse di depan
+        _, sort_dates = self.extract_dates(unique_dates)
+        sort_keys = np.where(
+            np.isnat(sort_dates), np.datetime64("1900-01-01"), sort_dates
+        )
+        order = np.argsort(sort_keys, kind="stable")
+        return [unique_dates[i] for i in order]
 
     def filter_dataframe_by_date_range(self, df, date_column, start_date, end_date):
         """Filter DataFrame berdasarkan rentang tanggal"""
@@ -165,41 +1206,15 @@ class DateFilter:
             return df, "Kolom tanggal tidak ditemukan"
 
         try:
-            df_copy = df.copy()
-            df_copy["extracted_date"] = df_copy[date_column].apply(
-                self.extract_date_from_datetime
-            )
-
-            def parse_date_string(date_str):
-                try:
-                    if "/" in date_str:
-                        return datetime.strptime(date_str, "%d/%m/%Y")
-                    elif "-" in date_str:
-                        parts = date_str.split("-")
-                        if len(parts[0]) == 4:
-                            return datetime.strptime(date_str, "%Y-%m-%d")
-                        else:
-                            return datetime.strptime(date_str, "%d-%m-%Y")
-                    return None
-                except:
-                    return None
-
-            start_dt = parse_date_string(start_date)
-            end_dt = parse_date_string(end_date)
+            start_dt = self.parse_date_string(start_date)
+            end_dt = self.parse_date_string(end_date)
 
             if start_dt is None or end_dt is None:
                 return df, "Format tanggal tidak valid"
 
-            def date_in_range(date_str):
-                if pd.isna(date_str) or date_str is None:
-                    return False
-                date_obj = parse_date_string(date_str)
-                if date_obj is None:
-                    return False
-                return start_dt <= date_obj <= end_dt
-
-            mask = df_copy["extracted_date"].apply(date_in_range)
-            filtered_df = df[mask].copy()
+            dates, _, _ = self.parse_date_column(df, date_column)
+            mask = (dates >= np.datetime64(start_dt)) & (dates <= np.datetime64(end_dt))
+            filtered_df = df[mask]
 
             return filtered_df, None
 
@@ -207,7 +1222,227 @@ class DateFilter:
             return df, f"Error saat filtering: {str(e)}"
 
 
+class DateIndex:
+    """Indeks per hari dari kolom tanggal sebuah file.
+
+    Menyimpan hari-hari unik (terurut) beserta jumlah baris dan jumlah order
+    per hari, plus prefix sum-nya. Daftar tanggal, histogram harian dan jumlah
+    baris/order dalam rentang apa pun dijawab dengan binary search tanpa
+    menyentuh DataFrame.
+    """
+
+    def __init__(self, days, labels, row_counts, order_counts, total_rows):
+        self.days = days.astype("datetime64[D]")
+        self.labels = labels
+        self.row_counts = row_counts.astype(np.int64)
+        self.order_counts = order_counts.astype(np.int64)
+        self.total_rows = int(total_rows)
+        self.row_prefix = np.concatenate([[0], np.cumsum(self.row_counts)])
+        self.order_prefix = np.concatenate([[0], np.cumsum(self.order_counts)])
+
+    @classmethod
+    def build(cls, df, date_column, order_column, date_filter):
+        """Bangun indeks dari DataFrame (sekali per file)"""
+        dates, label_codes, labels = date_filter.parse_date_column(df, date_column)
+        valid = ~np.isnat(dates)
+        day_values = dates[valid].astype("datetime64[D]")
+        days, first_index, inverse, row_counts = np.unique(
+            day_values, return_index=True, return_inverse=True, return_counts=True
+        )
+        day_labels = np.asarray(labels, dtype=object)[label_codes[valid][first_index]]
+
+        if order_column in df.columns:
+            order_codes, order_uniques = pd.factorize(df[order_column])
+            order_codes = order_codes[valid]
+            has_order = order_codes >= 0
+            pairs = np.unique(
+                inverse[has_order].astype(np.int64) * len(order_uniques)
+                + order_codes[has_order]
+            )
+            order_counts = np.bincount(
+                pairs // max(len(order_uniques), 1), minlength=len(days)
+            )
+        else:
+            order_counts = row_counts
+
+        return cls(days, day_labels.astype(str), row_counts, order_counts, len(df))
+
+    def save(self, path):
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(
+            tmp_path,
+            days=self.days,
+            labels=self.labels.astype(str),
+            row_counts=self.row_counts,
+            order_counts=self.order_counts,
+            total_rows=np.array(self.total_rows),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(
+                data["days"],
+                data["labels"],
+                data["row_counts"],
+                data["order_counts"],
+                data["total_rows"],
+            )
+
+    def unique_dates(self):
+        """Label tanggal unik, terurut"""
+        return [label for label in self.labels.tolist() if len(label) > 5]
+
+    def histogram(self):
+        """Jumlah baris dan order per hari"""
+        return [
+            {"date": label, "rows": int(rows), "orders": int(orders)}
+            for label, rows, orders in zip(
+                self.labels.tolist(), self.row_counts, self.order_counts
+            )
+        ]
+
+    def count_range(self, start_dt, end_dt):
+        """(jumlah baris, jumlah order) dengan tanggal di [start_dt, end_dt]"""
+        lo = np.searchsorted(self.days, np.datetime64(start_dt, "D"), side="left")
+        hi = np.searchsorted(self.days, np.datetime64(end_dt, "D"), side="right")
+        if hi <= lo:
+            return 0, 0
+        return (
+            int(self.row_prefix[hi] - self.row_prefix[lo]),
+            int(self.order_prefix[hi] - self.order_prefix[lo]),
+        )
+
+
+class SkuMatcher:
+    """Pencocokan SKU transaksi ke SKU master produk.
+
+    Urutan pencocokan: sama persis, key ternormalisasi (lowercase, tanpa spasi,
+    strip, titik, garis bawah, garis miring), SKU master terpanjang yang menjadi
+    prefix (SKU transaksi dengan suffix varian), lalu kemiripan trigram lewat
+    inverted index. Kandidat trigram hanya diambil dari posting list trigram
+    paling jarang milik SKU tersebut, sehingga tidak ada perbandingan ke
+    seluruh katalog. Angka dalam SKU dianggap identitas produk: prefix tidak
+    boleh memotong angka dan kandidat trigram harus memiliki angka yang sama.
+    """
+
+    KEY_RE = re.compile(r"[^0-9a-z]+")
+    DIGITS_RE = re.compile(r"[0-9]+")
+    MIN_PREFIX_LENGTH = 4
+    MAX_QUERY_GRAMS = 8
+    MAX_CANDIDATES = 20
+
+    def __init__(self, master_skus, min_confidence=0.75):
+        self.min_confidence = min_confidence
+        self.master_skus = list(dict.fromkeys(master_skus))
+        self.exact = set(self.master_skus)
+
+        self.by_key = {}
+        for sku in self.master_skus:
+            self.by_key.setdefault(self.normalize_key(sku), sku)
+        self.keys = list(self.by_key)
+        self.max_key_length = max((len(key) for key in self.keys), default=0)
+
+        postings = defaultdict(list)
+        self.key_grams = []
+        for position, key in enumerate(self.keys):
+            grams = self.trigrams(key)
+            self.key_grams.append(len(grams))
+            for gram in grams:
+                postings[gram].append(position)
+        self.postings = {
+            gram: np.asarray(positions, dtype=np.int32)
+            for gram, positions in postings.items()
+        }
+        self.key_grams = np.asarray(self.key_grams, dtype=np.int32)
+        self.matches = {}
+
+    @classmethod
+    def normalize_key(cls, sku):
+        return cls.KEY_RE.sub("", str(sku).lower())
+
+    @staticmethod
+    def trigrams(key):
+        padded = f"  {key} "
+        return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+    def _prefix_match(self, key):
+        """SKU master terpanjang yang menjadi prefix key"""
+        for length in range(min(len(key) - 1, self.max_key_length), self.MIN_PREFIX_LENGTH - 1, -1):
+            if key[length - 1].isdigit() and key[length].isdigit():
+                continue
+            master = self.by_key.get(key[:length])
+            if master is not None:
+                # 0.9 untuk suffix pendek, turun mendekati 0.45 untuk suffix panjang
+                return master, round(0.9 * (0.5 + 0.5 * length / len(key)), 4)
+        return None, 0.0
+
+    def _trigram_match(self, key):
+        grams = self.trigrams(key)
+        known = sorted(
+            (self.postings[gram] for gram in grams if gram in self.postings), key=len
+        )[: self.MAX_QUERY_GRAMS]
+        if not known:
+            return None, 0.0
+
+        candidates, shared = np.unique(np.concatenate(known), return_counts=True)
+        if len(candidates) > self.MAX_CANDIDATES:
+            top = np.argpartition(-shared, self.MAX_CANDIDATES)[: self.MAX_CANDIDATES]
+            candidates = candidates[top]
+
+        digits = self.DIGITS_RE.findall(key)
+        best, best_score = None, 0.0
+        for position in candidates.tolist():
+            candidate_key = self.keys[position]
+            if self.DIGITS_RE.findall(candidate_key) != digits:
+                continue
+            overlap = len(grams & self.trigrams(candidate_key))
+            dice = 2 * overlap / (len(grams) + self.key_grams[position])
+            if dice > best_score or (dice == best_score and best is not None and candidate_key < best):
+                best, best_score = candidate_key, dice
+        if best is None:
+            return None, 0.0
+        return self.by_key[best], round(0.9 * best_score, 4)
+
+    def match(self, sku):
+        """(sku master atau None, confidence 0..1, metode)"""
+        cached = self.matches.get(sku)
+        if cached is not None:
+            return cached
+
+        if sku in self.exact:
+            result = (sku, 1.0, "exact")
+        else:
+            key = self.normalize_key(sku)
+            result = (None, 0.0, "none")
+            if key in self.by_key:
+                result = (self.by_key[key], 0.95, "normalized")
+            elif key:
+                for method, finder in (("prefix", self._prefix_match), ("trigram", self._trigram_match)):
+                    master, confidence = finder(key)
+                    if master is not None and confidence >= self.min_confidence:
+                        result = (master, confidence, method)
+                        break
+
+        self.matches[sku] = result
+        return result
+
+    def mapping_table(self, skus):
+        """DataFrame transaction_sku, master_sku, confidence, method"""
+        rows = [(sku,) + self.match(sku) for sku in skus]
+        return pd.DataFrame(
+            rows, columns=["transaction_sku", "master_sku", "confidence", "method"]
+        )
+
+
 class ProductAnalyzer:
+    # Nilai SKU yang dianggap kosong setelah strip + lowercase
+    NULL_TOKENS = ["nan", "none", "", "null"]
+
+    # Matcher per katalog master (key: hash isi SKU master), mapping ikut tersimpan
+    _matcher_cache = MemoryLRUCache(64 * 1024**2)
+
     def __init__(self):
         self.transaction_product_col = "Seller SKU"
         self.logger = logger
@@ -223,169 +1458,211 @@ class ProductAnalyzer:
                     return df.columns[i]
         return None
 
-    def analyze_product_sales(self, transaction_df, product_df):
-        try:
-            self.logger.info("=== STARTING PRODUCT ANALYSIS ===")
-            self.logger.info(f"Product file shape: {product_df.shape}")
-            self.logger.info(f"Product file columns: {product_df.columns.tolist()}")
-
-            product_sku_col = None
-            product_code_col = None
-
-            for col in product_df.columns:
-                col_lower = str(col).lower()
-                if "sku" in col_lower and "penjual" in col_lower:
-                    product_sku_col = col
-                elif "kode" in col_lower and "produk" in col_lower:
-                    product_code_col = col
-
-            if not product_sku_col:
-                product_sku_col = product_df.columns[0]
-            if not product_code_col:
-                product_code_col = (
-                    product_df.columns[1]
-                    if len(product_df.columns) > 1
-                    else product_df.columns[0]
-                )
+    def get_matcher(self, master_index):
+        """SkuMatcher untuk katalog master ini (dibangun sekali, lalu dari cache)"""
+        min_confidence = app.config["SKU_MATCH_MIN_CONFIDENCE"]
+        key = (
+            "sku_matcher",
+            int(pd.util.hash_pandas_object(pd.Series(master_index), index=False).sum()),
+            len(master_index),
+            min_confidence,
+        )
+        return self._matcher_cache.get_or_compute(
+            key, lambda: SkuMatcher(master_index.tolist(), min_confidence)
+        )
 
-            self.logger.info(
-                f"Using columns: SKU='{product_sku_col}', Code='{product_code_col}'"
-            )
-            master_products = set()
-            product_mapping = {}
-
-            processed_count = 0
-            skipped_count = 0
-
-            for idx, row in product_df.iterrows():
-                try:
-                    product_sku = row[product_sku_col]
-                    product_code = (
-                        row[product_code_col]
-                        if product_code_col != product_sku_col
-                        else f"P{idx+1}"
-                    )
+    def resolve_fuzzy_skus(self, master_index, transaction_counts):
+        """Alihkan penjualan SKU transaksi yang tidak ada di master ke SKU master terdekat.
 
-                    if pd.isna(product_sku):
-                        skipped_count += 1
-                        continue
+        Return (transaction_counts baru, daftar mapping non-exact).
+        """
+        unmatched = transaction_counts.index[~transaction_counts.index.isin(master_index)]
+        if len(unmatched) == 0:
+            return transaction_counts, []
 
-                    sku_clean = str(product_sku).strip()
-                    code_clean = (
-                        str(product_code).strip()
-                        if pd.notna(product_code)
-                        else f"P{idx+1}"
-                    )
+        start_time = time.time()
+        table = self.get_matcher(master_index).mapping_table(unmatched)
+        table = table[table["master_sku"].notna()].copy()
+        table["sales_count"] = transaction_counts.reindex(table["transaction_sku"]).to_numpy()
 
-                    if not sku_clean or sku_clean.lower() in [
-                        "nan",
-                        "none",
-                        "",
-                        "null",
-                    ]:
-                        skipped_count += 1
-                        continue
+        resolved_counts = transaction_counts.add(
+            table.groupby("master_sku")["sales_count"].sum(), fill_value=0
+        )
+        self.logger.info(
+            f"Fuzzy SKU matching: {len(table)} dari {len(unmatched)} SKU transaksi "
+            f"dipetakan ke master ({time.time() - start_time:.2f}s)"
+        )
+        return resolved_counts, table.to_dict("records")
 
-                    master_products.add(sku_clean)
-                    product_mapping[sku_clean] = {
-                        "name": sku_clean,
-                        "code": code_clean,
-                    }
-                    processed_count += 1
+    def normalize_master(self, product_df):
+        """Ambil SKU master yang valid dari file produk.
 
-                except Exception as e:
-                    self.logger.warning(f"Error processing row {idx}: {e}")
-                    skipped_count += 1
-                    continue
+        Return (product_mapping {sku: {"name", "code"}}, kolom SKU yang dipakai).
+        """
+        self.logger.info(f"Product file shape: {product_df.shape}")
+        self.logger.info(f"Product file columns: {product_df.columns.tolist()}")
+
+        product_sku_col = None
+        product_code_col = None
+
+        for col in product_df.columns:
+            col_lower = str(col).lower()
+            if "sku" in col_lower and "penjual" in col_lower:
+                product_sku_col = col
+            elif "kode" in col_lower and "produk" in col_lower:
+                product_code_col = col
+
+        if not product_sku_col:
+            product_sku_col = product_df.columns[0]
+        if not product_code_col:
+            product_code_col = (
+                product_df.columns[1]
+                if len(product_df.columns) > 1
+                else product_df.columns[0]
+            )
 
-            self.logger.info(
-                f"Master data processed: {processed_count}, skipped: {skipped_count}"
+        self.logger.info(
+            f"Using columns: SKU='{product_sku_col}', Code='{product_code_col}'"
+        )
+        # Normalisasi master: strip, buang token null; kode terakhir menang
+        # untuk SKU duplikat, urutan mengikuti kemunculan pertama
+        sku_values = product_df[product_sku_col]
+        sku_clean = sku_values.astype(str).str.strip()
+        valid = sku_values.notna() & ~sku_clean.str.lower().isin(self.NULL_TOKENS)
+
+        fallback_codes = pd.Series(
+            [f"P{idx+1}" for idx in product_df.index], index=product_df.index
+        )
+        if product_code_col != product_sku_col:
+            code_values = product_df[product_code_col]
+            code_clean = code_values.astype(str).str.strip().where(
+                code_values.notna(), fallback_codes
             )
+        else:
+            code_clean = fallback_codes
 
-            if len(master_products) == 0:
-                return (
-                    None,
-                    "Tidak ada data produk yang valid ditemukan dalam file master data.",
-                )
-            transaction_products = set()
-            transaction_counts = defaultdict(int)
+        master_rows = pd.DataFrame(
+            {"name": sku_clean[valid], "code": code_clean[valid]}
+        )
+        master_order = master_rows["name"].drop_duplicates(keep="first")
+        master_codes = master_rows.drop_duplicates("name", keep="last").set_index(
+            "name"
+        )["code"]
+        product_mapping = {
+            name: {"name": name, "code": code}
+            for name, code in zip(
+                master_order, master_codes.reindex(master_order).tolist()
+            )
+        }
 
-            for idx, row in transaction_df.iterrows():
-                try:
-                    product_code = row[self.transaction_product_col]
-                    if pd.isna(product_code):
-                        continue
-                    code_clean = str(product_code).strip()
-
-                    if not code_clean or code_clean.lower() in [
-                        "nan",
-                        "none",
-                        "",
-                        "null",
-                    ]:
-                        continue
+        processed_count = int(valid.sum())
+        skipped_count = len(product_df) - processed_count
+        self.logger.info(
+            f"Master data processed: {processed_count}, skipped: {skipped_count}"
+        )
 
-                    transaction_products.add(code_clean)
-                    transaction_counts[code_clean] += 1
+        return product_mapping, product_sku_col
 
-                except Exception as e:
-                    self.logger.warning(f"Error processing transaction row {idx}: {e}")
-                    continue
+    def count_transaction_skus(self, transaction_df):
+        """Jumlah baris order per SKU transaksi (sudah di-strip, tanpa token null)"""
+        # Hitung per nilai unik lalu gabungkan hasil normalisasinya
+        line_codes, line_uniques = pd.factorize(
+            transaction_df[self.transaction_product_col]
+        )
+        unique_clean = pd.Index(line_uniques).astype(str).str.strip()
+        unique_counts = pd.Series(
+            np.bincount(line_codes[line_codes >= 0], minlength=len(unique_clean)),
+            index=unique_clean,
+        )
+        unique_counts = unique_counts[
+            (unique_counts.to_numpy() > 0)
+            & ~unique_clean.str.lower().isin(self.NULL_TOKENS)
+        ]
+        return unique_counts.groupby(level=0, sort=False).sum()
+
+    def build_sales_result(self, product_mapping, transaction_counts, product_sku_col):
+        """Hasil analisis terjual/tidak terjual dari master dan jumlah penjualan per SKU"""
+        if len(product_mapping) == 0:
+            return (
+                None,
+                "Tidak ada data produk yang valid ditemukan dalam file master data.",
+            )
+        master_index = pd.Index(list(product_mapping))
 
-            sold_products_exact = master_products.intersection(transaction_products)
-            sold_products = sold_products_exact
+        sku_mapping = []
+        if app.config["SKU_FUZZY_MATCHING"]:
+            transaction_counts, sku_mapping = self.resolve_fuzzy_skus(
+                master_index, transaction_counts
+            )
+        transaction_index = transaction_counts.index
 
-            if len(sold_products) == 0:
-                master_lower = {p.lower(): p for p in master_products}
-                transaction_lower = {p.lower() for p in transaction_products}
-                sold_lower = set(master_lower.keys()).intersection(transaction_lower)
-                sold_products = {master_lower[p] for p in sold_lower}
+        sold_mask = master_index.isin(transaction_index)
+        sold_products = set(master_index[sold_mask])
 
-            unsold_products = master_products - sold_products
-            sold_stats = []
-            for product in sold_products:
-                count = transaction_counts.get(product, 0)
-                sold_stats.append((product, count))
+        if len(sold_products) == 0:
+            master_lower = master_index.str.lower()
+            sold_mask = master_lower.isin(transaction_index.str.lower())
+            # SKU master yang hanya berbeda huruf besar/kecil: ambil yang terakhir
+            sold_lower = pd.Series(master_index[sold_mask], index=master_lower[sold_mask])
+            sold_products = set(sold_lower[~sold_lower.index.duplicated(keep="last")])
 
-            sold_stats.sort(key=lambda x: x[1], reverse=True)
-            total_products = len(master_products)
-            sold_count = len(sold_products)
-            unsold_count = len(unsold_products)
+        master_products = set(master_index)
+        sold_counts = (
+            transaction_counts.reindex(sorted(sold_products)).fillna(0).astype(int)
+        )
+        sold_counts = sold_counts.sort_values(ascending=False, kind="stable")
+        sold_stats = list(zip(sold_counts.index, sold_counts.tolist()))
+
+        unsold_products = master_products - sold_products
+        total_products = len(master_products)
+        sold_count = len(sold_products)
+        unsold_count = len(unsold_products)
+
+        result = {
+            "total_products": total_products,
+            "sold_products_count": sold_count,
+            "unsold_products_count": unsold_count,
+            "sold_percentage": (
+                (sold_count / total_products * 100) if total_products > 0 else 0
+            ),
+            "unsold_percentage": (
+                (unsold_count / total_products * 100) if total_products > 0 else 0
+            ),
+            "sold_products": [
+                {
+                    "code": product_mapping[code].get("code", code),
+                    "name": product_mapping[code].get("name", code),
+                    "sales_count": count,
+                }
+                for code, count in sold_stats
+            ],
+            "unsold_products": [
+                {
+                    "code": product_mapping[code].get("code", code),
+                    "name": product_mapping[code].get("name", code),
+                    "sales_count": 0,
+                }
+                for code in sorted(unsold_products)
+            ],
+            "top_selling": sold_stats[:10],
+            "sku_mapping": sku_mapping,
+            "fuzzy_matched_count": len(sku_mapping),
+            "product_mapping": {k: v["name"] for k, v in product_mapping.items()},
+            "transaction_product_col": self.transaction_product_col,
+            "product_product_col": product_sku_col,
+            "product_name_col": product_sku_col,
+        }
 
-            result = {
-                "total_products": total_products,
-                "sold_products_count": sold_count,
-                "unsold_products_count": unsold_count,
-                "sold_percentage": (
-                    (sold_count / total_products * 100) if total_products > 0 else 0
-                ),
-                "unsold_percentage": (
-                    (unsold_count / total_products * 100) if total_products > 0 else 0
-                ),
-                "sold_products": [
-                    {
-                        "code": product_mapping[code].get("code", code),
-                        "name": product_mapping[code].get("name", code),
-                        "sales_count": count,
-                    }
-                    for code, count in sold_stats
-                ],
-                "unsold_products": [
-                    {
-                        "code": product_mapping[code].get("code", code),
-                        "name": product_mapping[code].get("name", code),
-                        "sales_count": 0,
-                    }
-                    for code in sorted(unsold_products)
-                ],
-                "top_selling": sold_stats[:10],
-                "product_mapping": {k: v["name"] for k, v in product_mapping.items()},
-                "transaction_product_col": self.transaction_product_col,
-                "product_product_col": product_sku_col,
-                "product_name_col": product_sku_col,
-            }
+        return result, None
 
-            return result, None
+    def analyze_product_sales(self, transaction_df, product_df):
+        try:
+            self.logger.info("=== STARTING PRODUCT ANALYSIS ===")
+            product_mapping, product_sku_col = self.normalize_master(product_df)
+            transaction_counts = self.count_transaction_skus(transaction_df)
+            return self.build_sales_result(
+                product_mapping, transaction_counts, product_sku_col
+            )
 
         except Exception as e:
             import traceback
@@ -396,9 +1673,251 @@ class ProductAnalyzer:
             return None, error_msg
 
 
+class CatalogStore:
+    """Katalog produk persisten (SQLite) dengan penghitung penjualan per SKU.
+
+    Master produk disimpan sekali; upload master berikutnya diterapkan sebagai
+    diff (SKU baru, dihapus, kode/urutan berubah), jadi biaya per upload
+    sebanding dengan besar diff. Cek master aktif, penerapan diff dan
+    pembacaan katalog berjalan dalam satu transaksi (snapshot), sehingga
+    request lain dengan master berbeda tidak bisa menimpa katalog di
+    antaranya. Jumlah penjualan per SKU disimpan per file transaksi (source)
+    dengan primary key (source, sku), sehingga analisis terjual/tidak terjual
+    untuk file yang sudah dikenal cukup dengan query tanpa membaca ulang file.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS catalog (
+            sku TEXT PRIMARY KEY,
+            code TEXT NOT NULL,
+            position INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS catalog_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+        CREATE TABLE IF NOT EXISTS sales_sources (
+            source TEXT PRIMARY KEY,
+            created_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS sku_sales (
+            source TEXT NOT NULL,
+            sku TEXT NOT NULL,
+            sales_count INTEGER NOT NULL,
+            PRIMARY KEY (source, sku)
+        );
+        CREATE INDEX IF NOT EXISTS sku_sales_sku ON sku_sales (sku);
+    """
+
+    # Jumlah file transaksi yang penjualannya disimpan (yang terlama dibuang)
+    MAX_SALES_SOURCES = 20
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.logger = logger
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(self.SCHEMA)
+            self._migrate(conn)
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    @staticmethod
+    def _migrate(conn):
+        """Sesuaikan skema lama: katalog tanpa position, atau katalog per digest"""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(catalog)")}
+        if "position" not in columns:
+            conn.execute(
+                "ALTER TABLE catalog ADD COLUMN position INTEGER NOT NULL DEFAULT 0"
+            )
+            conn.execute("UPDATE catalog SET position = rowid")
+        conn.execute("CREATE INDEX IF NOT EXISTS catalog_position ON catalog (position)")
+
+        tables = {
+            name
+            for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+        if "catalog_masters" not in tables:
+            return
+        latest = conn.execute(
+            "SELECT digest, sku_col FROM catalog_masters ORDER BY created_at DESC LIMIT 1"
+        ).fetchone()
+        if latest and not conn.execute("SELECT 1 FROM catalog LIMIT 1").fetchone():
+            conn.execute(
+                "INSERT INTO catalog (sku, code, position) "
+                "SELECT sku, code, position FROM catalog_items WHERE digest = ?",
+                (latest[0],),
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO catalog_meta (key, value) VALUES (?, ?)",
+                [("master_digest", latest[0]), ("sku_col", latest[1])],
+            )
+        conn.execute("DROP TABLE IF EXISTS catalog_items")
+        conn.execute("DROP TABLE catalog_masters")
+
+    def master_state(self):
+        """Metadata master yang sedang aktif (digest, kolom SKU) atau None"""
+        with closing(self._connect()) as conn:
+            meta = dict(conn.execute("SELECT key, value FROM catalog_meta"))
+        return meta if "master_digest" in meta else None
+
+    def _apply_master(self, conn, digest, product_mapping, sku_col):
+        """Terapkan master sebagai diff di transaksi conn; return jumlah per jenis"""
+        existing = {
+            sku: (code, position)
+            for sku, code, position in conn.execute("SELECT sku, code, position FROM catalog")
+        }
+        added, changed = [], []
+        moved = 0
+        for position, (sku, info) in enumerate(product_mapping.items()):
+            current = existing.get(sku)
+            if current is None:
+                added.append((sku, info["code"], position))
+            elif current != (info["code"], position):
+                changed.append((info["code"], position, sku))
+                moved += current[0] == info["code"]
+        removed = [(sku,) for sku in existing if sku not in product_mapping]
+
+        conn.executemany("DELETE FROM catalog WHERE sku = ?", removed)
+        conn.executemany("INSERT INTO catalog (sku, code, position) VALUES (?, ?, ?)", added)
+        conn.executemany("UPDATE catalog SET code = ?, position = ? WHERE sku = ?", changed)
+        conn.executemany(
+            "INSERT OR REPLACE INTO catalog_meta (key, value) VALUES (?, ?)",
+            [("master_digest", digest), ("sku_col", str(sku_col))],
+        )
+
+        diff = {
+            "added": len(added),
+            "removed": len(removed),
+            "changed": len(changed) - moved,
+            "moved": moved,
+        }
+        self.logger.info(f"Catalog updated from {digest[:12]}: {diff}")
+        return diff
+
+    def snapshot(self, digest, source, load_master):
+        """Katalog master `digest` beserta penjualan file `source`, atomik.
+
+        Jika master aktif berbeda, load_master() -> (product_mapping, sku_col)
+        dipanggil lalu diterapkan sebagai diff. Cek, diff dan pembacaan ada
+        dalam satu transaksi BEGIN IMMEDIATE. Return (katalog {sku: {"name",
+        "code"}} urut master, kolom SKU, Series penjualan) atau None jika
+        master tidak berisi SKU valid.
+        """
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute("BEGIN IMMEDIATE")
+            meta = dict(conn.execute("SELECT key, value FROM catalog_meta"))
+            if meta.get("master_digest") != digest:
+                product_mapping, sku_col = load_master()
+                if not product_mapping:
+                    return None
+                self._apply_master(conn, digest, product_mapping, sku_col)
+                meta["sku_col"] = str(sku_col)
+
+            rows = conn.execute("SELECT sku, code FROM catalog ORDER BY position").fetchall()
+            sales = self._sales_counts(conn, source)
+        catalog = {sku: {"name": sku, "code": code} for sku, code in rows}
+        return catalog, meta["sku_col"], sales
+
+    def has_sales(self, source):
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT 1 FROM sales_sources WHERE source = ?", (source,)
+            ).fetchone()
+        return row is not None
+
+    def record_sales(self, source, transaction_counts):
+        """Simpan jumlah penjualan per SKU untuk satu file transaksi"""
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM sku_sales WHERE source = ?", (source,))
+            conn.executemany(
+                "INSERT INTO sku_sales (source, sku, sales_count) VALUES (?, ?, ?)",
+                (
+                    (source, sku, int(count))
+                    for sku, count in transaction_counts.items()
+                ),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO sales_sources (source, created_at) VALUES (?, ?)",
+                (source, time.time()),
+            )
+
+            stale = conn.execute(
+                "SELECT source FROM sales_sources ORDER BY created_at DESC LIMIT -1 OFFSET ?",
+                (self.MAX_SALES_SOURCES,),
+            ).fetchall()
+            conn.executemany("DELETE FROM sku_sales WHERE source = ?", stale)
+            conn.executemany("DELETE FROM sales_sources WHERE source = ?", stale)
+
+    @staticmethod
+    def _sales_counts(conn, source):
+        """Jumlah penjualan per SKU: SKU katalog (urut master) lalu SKU di luar katalog"""
+        matched = conn.execute(
+            "SELECT c.sku, s.sales_count FROM catalog c "
+            "JOIN sku_sales s ON s.source = ? AND s.sku = c.sku ORDER BY c.position",
+            (source,),
+        ).fetchall()
+        unmatched = conn.execute(
+            "SELECT s.sku, s.sales_count FROM sku_sales s "
+            "LEFT JOIN catalog c ON c.sku = s.sku "
+            "WHERE s.source = ? AND c.sku IS NULL",
+            (source,),
+        ).fetchall()
+        rows = matched + unmatched
+        return pd.Series(
+            [count for _, count in rows],
+            index=pd.Index([sku for sku, _ in rows], dtype=object),
+            dtype=np.int64,
+        )
+
+
 class DataProcessor:
+    # Kolom export pesanan yang dibutuhkan pipeline analisis
+    TRANSACTION_COLUMNS = ["Order ID", "Seller SKU", "SKU ID", "Created Time"]
+
     def __init__(self):
         self.logger = logger
+        self._basket_store = None
+
+    @property
+    def basket_store(self):
+        """BasketStore persisten (dibuka saat pertama dipakai)"""
+        if self._basket_store is None:
+            self._basket_store = BasketStore(app.config["BASKET_STORE_PATH"])
+        return self._basket_store
+
+    def append_orders(
+        self,
+        df,
+        order_col="Order ID",
+        product_col="Seller SKU",
+        sku_id_col="SKU ID",
+        date_col="Created Time",
+    ):
+        """Tambahkan order baru dari sebuah export ke basket store.
+
+        Return (ringkasan delta, error).
+        """
+        try:
+            if order_col not in df.columns or product_col not in df.columns:
+                return None, f"Kolom {order_col} atau {product_col} tidak ditemukan dalam data"
+
+            orders, products, days = TransactionStore.clean_lines(
+                df, order_col, product_col, sku_id_col, date_col
+            )
+            summary = self.basket_store.append(
+                orders, products, days, digest=df.attrs.get("content_hash")
+            )
+            return summary, None
+
+        except Exception as e:
+            import traceback
+
+            self.logger.error(f"Error dalam menambahkan order ke basket store: {str(e)}")
+            self.logger.error(traceback.format_exc())
+            return None, f"Error: {str(e)}"
 
     def prepare_transactions(
         self,
@@ -433,8 +1952,7 @@ class DataProcessor:
             if using_sku_id:
                 cols_to_use.append(sku_id_col)
 
-            df_subset = df[cols_to_use].copy()
-            df_clean = df_subset.dropna(subset=cols_to_use)
+            df_clean = df[cols_to_use].dropna(subset=cols_to_use)
 
             df_clean[order_col] = df_clean[order_col].astype(str)
             df_clean[product_col] = df_clean[product_col].astype(str)
@@ -443,19 +1961,15 @@ class DataProcessor:
 
             df_clean[product_col] = df_clean[product_col].str.strip()
 
-            if len(df_clean) > 2:
-                df_work = df_clean.iloc[2:].copy()
+            skip = TransactionStore.description_rows(df_clean[order_col])
+            if skip:
+                df_work = df_clean.iloc[skip:].copy()
                 self.logger.info(
-                    f"Data setelah skip 2 baris pertama: {len(df_work)} rows"
+                    f"Data setelah skip baris deskripsi: {len(df_work)} rows"
                 )
             else:
                 df_work = df_clean.copy()
 
-            unique_orders = df_work[order_col].unique()
-            order_mapping = {
-                order_id: f"T{i+1}" for i, order_id in enumerate(unique_orders)
-            }
-            df_work["TID"] = df_work[order_col].map(order_mapping)
             product_counts = df_work[product_col].value_counts().to_dict()
             self.logger.info(f"Total unique products: {len(product_counts)}")
 
@@ -471,31 +1985,23 @@ class DataProcessor:
             self.logger.info(f"Original products: {len(product_counts)}")
             self.logger.info(f"Filtered products: {len(filtered_products)}")
 
-            transactions_by_order = defaultdict(list)
-
-            for _, row in df_work.iterrows():
-                order_id = row["TID"]
-                product = row[product_col]
-
-                if (
-                    product in filtered_products
-                    and product not in transactions_by_order[order_id]
-                ):
-                    transactions_by_order[order_id].append(product)
-
-            transactions = list(transactions_by_order.values())
+            # Basket dari pasangan (order, produk) unik, produk terfilter saja
+            products = df_work[product_col]
+            transactions = EncodedTransactions.from_lines(
+                df_work[order_col],
+                products,
+                keep=products.isin(list(filtered_products)).to_numpy(),
+            )
 
-            multi_product_transactions = [t for t in transactions if len(t) >= 2]
-            single_product_count = len(transactions) - len(multi_product_transactions)
+            multi_product_count = int((transactions.basket_sizes() >= 2).sum())
+            single_product_count = len(transactions) - multi_product_count
 
             final_transactions = transactions
-            total_before = len(unique_orders)
+            total_before = df_work[order_col].nunique()
             total_combined = len(final_transactions)
 
             self.logger.info(f"Total transactions: {len(final_transactions)}")
-            self.logger.info(
-                f"Multi-product transactions: {len(multi_product_transactions)}"
-            )
+            self.logger.info(f"Multi-product transactions: {multi_product_count}")
             self.logger.info(f"Single-product transactions: {single_product_count}")
 
             return (
@@ -564,196 +2070,1809 @@ class DataProcessor:
             return None, f"Error: {str(e)}", 0, 0, 0, {}
 
 
-class EclatAlgorithm:
-    """Class untuk implementasi algoritma ECLAT"""
+def _support_count(tids, weights=None):
+    """Support count sebuah tidlist; dengan bobot jika transaksi digabung"""
+    if weights is None:
+        return len(tids)
+    return int(weights[tids].sum())
 
-    def __init__(self):
+
+class EncodedTransactions:
+    """Transaksi terenkode: kamus item (SKU <-> id int32) dan matriks CSR.
+
+    items[id] adalah SKU; id diberikan menurut urutan SKU sehingga tuple id
+    yang terurut juga terurut menurut SKU. Basket ke-t adalah
+    indices[indptr[t]:indptr[t + 1]] (item unik, urutan kemunculan pertama).
+    SKU hanya di-decode saat menyusun output. Jika weights ada, transaksi ke-t
+    mewakili weights[t] basket identik (lihat collapse).
+    """
+
+    def __init__(self, items, indptr, indices, weights=None):
+        self.items = items
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self._item_ids = None
+
+    @classmethod
+    def from_codes(cls, line_tx, line_item, items):
+        """Bangun dari kode baris (order, item) yang sudah difilter.
+
+        Basket diurutkan menurut baris pertamanya, item dalam basket menurut
+        kemunculan pertamanya; pasangan (order, item) duplikat dibuang.
+        """
+        items = np.asarray(items, dtype=object)
+        if len(line_tx) == 0:
+            return cls(items, np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int32))
+
+        pair_codes = line_tx.astype(np.int64) * len(items) + line_item
+        _, first_pair = np.unique(pair_codes, return_index=True)
+        first_pair.sort()
+        pair_tx, pair_item = line_tx[first_pair], line_item[first_pair]
+
+        # Order diurutkan menurut pasangan pertamanya
+        tx_codes, tx_first = np.unique(pair_tx, return_index=True)
+        tx_rank = np.zeros(tx_codes[-1] + 1, dtype=np.int64)
+        tx_rank[tx_codes] = tx_first
+        by_basket = np.argsort(tx_rank[pair_tx], kind="stable")
+        basket_sizes = np.bincount(pair_tx)[tx_codes[np.argsort(tx_first)]]
+        indptr = np.concatenate([[0], np.cumsum(basket_sizes)]).astype(np.int64)
+        return cls(items, indptr, pair_item[by_basket].astype(np.int32))
+
+    @classmethod
+    def from_lines(cls, orders, products, keep=None):
+        """Bangun dari kolom order dan produk per baris (keep: mask baris)"""
+        line_tx, _ = pd.factorize(orders, sort=False)
+        line_item, items = pd.factorize(products, sort=True)
+        used = (line_tx >= 0) & (line_item >= 0)
+        if keep is not None:
+            used &= np.asarray(keep, dtype=bool)
+        return cls.from_codes(line_tx[used], line_item[used], items)
+
+    @classmethod
+    def from_lists(cls, transactions):
+        """Enkode list of list SKU"""
+        sizes = [len(transaction) for transaction in transactions]
+        orders = np.repeat(np.arange(len(transactions)), sizes)
+        products = [item for transaction in transactions for item in transaction]
+        return cls.from_lines(orders, pd.Series(products, dtype=object))
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    @property
+    def total_weight(self):
+        """Jumlah transaksi asli (jumlah bobot)"""
+        if self.weights is None:
+            return len(self)
+        return int(self.weights.sum())
+
+    def collapse(self, groups=None):
+        """Gabungkan basket dengan himpunan item sama menjadi satu baris berbobot.
+
+        groups (opsional, satu kode per transaksi) membatasi penggabungan ke
+        transaksi dengan kode yang sama, mis. hari yang sama. Return
+        (EncodedTransactions berbobot, kode baris hasil untuk tiap transaksi).
+        """
+        tids = self.basket_tids()
+        canonical = self.indices[np.lexsort((self.indices, tids))]
+        bounds = self.indptr.tolist()
+        prefixes = (
+            [b""] * len(self)
+            if groups is None
+            else [int(group).to_bytes(8, "little", signed=True) for group in groups]
+        )
+        keys = [
+            prefix + canonical[start:end].tobytes()
+            for prefix, start, end in zip(prefixes, bounds[:-1], bounds[1:])
+        ]
+        codes, uniques = pd.factorize(pd.Series(keys, dtype=object), sort=False)
+
+        weights = np.bincount(
+            codes,
+            weights=None if self.weights is None else self.weights,
+            minlength=len(uniques),
+        ).astype(np.int64)
+        _, first = np.unique(codes, return_index=True)
+        keep = np.zeros(len(self), dtype=bool)
+        keep[first] = True
+        collapsed = self.subset(transaction_mask=keep)
+        collapsed.weights = weights
+        return collapsed, codes
+
+    @property
+    def item_ids(self):
+        """{SKU: id}"""
+        if self._item_ids is None:
+            self._item_ids = {item: i for i, item in enumerate(self.items.tolist())}
+        return self._item_ids
+
+    def encode(self, skus):
+        """Id untuk SKU yang dikenal (SKU lain diabaikan)"""
+        item_ids = self.item_ids
+        return [item_ids[sku] for sku in skus if sku in item_ids]
+
+    def decode(self, ids):
+        return tuple(self.items[i] for i in ids)
+
+    def basket_sizes(self):
+        return np.diff(self.indptr)
+
+    def basket_tids(self):
+        """Id transaksi untuk setiap entri indices"""
+        return np.repeat(np.arange(len(self), dtype=np.int32), self.basket_sizes())
+
+    def item_counts(self, transaction_ids=None):
+        """Jumlah transaksi yang memuat setiap item (opsional: hanya transaction_ids)"""
+        indices = self.indices
+        if transaction_ids is not None:
+            sizes = self.basket_sizes()[transaction_ids]
+            offsets = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+            indices = indices[np.repeat(self.indptr[transaction_ids], sizes) + offsets]
+        return np.bincount(indices, minlength=len(self.items))
+
+    def item_tidlists(self, item_ids=None):
+        """{id item: array tid terurut} (transpose CSR), opsional hanya item_ids"""
+        tids = self.basket_tids()
+        indices = self.indices
+        if item_ids is not None:
+            wanted = np.zeros(len(self.items), dtype=bool)
+            wanted[list(item_ids)] = True
+            selected = wanted[indices]
+            tids, indices = tids[selected], indices[selected]
+
+        by_item = np.argsort(indices, kind="stable")
+        sorted_items = indices[by_item]
+        sorted_tids = tids[by_item]
+        bounds = np.flatnonzero(np.diff(sorted_items)) + 1
+        starts = np.concatenate([[0], bounds])
+        ends = np.concatenate([bounds, [len(sorted_items)]])
+        return {
+            int(sorted_items[start]): sorted_tids[start:end]
+            for start, end in zip(starts.tolist(), ends.tolist())
+        }
+
+    def subset(self, transaction_mask=None, item_mask=None):
+        """Transaksi terpilih dengan item terpilih (basket kosong dibuang)"""
+        selected = np.ones(len(self.indices), dtype=bool)
+        if transaction_mask is not None:
+            selected &= np.repeat(transaction_mask, self.basket_sizes())
+        if item_mask is not None:
+            selected &= item_mask[self.indices]
+
+        sizes = np.bincount(self.basket_tids()[selected], minlength=len(self))
+        weights = None if self.weights is None else self.weights[sizes > 0]
+        sizes = sizes[sizes > 0]
+        indptr = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+        return EncodedTransactions(self.items, indptr, self.indices[selected], weights)
+
+    def to_lists(self):
+        """Decode semua basket ke list SKU"""
+        names = self.items[self.indices].tolist()
+        bounds = self.indptr.tolist()
+        return [names[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+class TransactionStore:
+    """Basket per order dalam bentuk terenkode, beserta tanggal tiap order.
+
+    Dibangun sekali per file dengan pembersihan yang sama seperti
+    DataProcessor.prepare_transactions. Baris order disimpan sebagai kode
+    (transaksi, item) dan basket sebagai EncodedTransactions; rentang tanggal
+    menjadi mask boolean atas transaksi, sehingga transaksi dan support untuk
+    rentang baru dihitung ulang tanpa membaca ulang file.
+    """
+
+    def __init__(self, baskets, line_tx, line_item, tx_days):
+        self.baskets = baskets
+        self.items = baskets.items
+        self.line_tx = line_tx
+        self.line_item = line_item
+        self.tx_days = tx_days
+        self._item_tidlists = None
+        self._collapsed = None
+
+    @classmethod
+    def build(
+        cls,
+        df,
+        order_col="Order ID",
+        product_col="Seller SKU",
+        sku_id_col="SKU ID",
+        date_col="Created Time",
+        date_filter=None,
+    ):
+        """Bangun store dari DataFrame (sekali per file)"""
+        orders, products, days = cls.clean_lines(
+            df, order_col, product_col, sku_id_col, date_col, date_filter
+        )
+        line_tx, order_ids = pd.factorize(orders, sort=False)
+        line_item, items = pd.factorize(products, sort=True)
+        line_tx = line_tx.astype(np.int32)
+        line_item = line_item.astype(np.int32)
+        tx_days = cls.first_days(line_tx, days, len(order_ids))
+
+        # Semua baris dipakai, jadi basket ke-t adalah order dengan kode t
+        baskets = EncodedTransactions.from_codes(line_tx, line_item, items)
+        return cls(baskets, line_tx, line_item, tx_days)
+
+    @staticmethod
+    def clean_lines(
+        df,
+        order_col="Order ID",
+        product_col="Seller SKU",
+        sku_id_col="SKU ID",
+        date_col="Created Time",
+        date_filter=None,
+    ):
+        """Baris order bersih: (order, produk, hari) seperti prepare_transactions"""
+        cols_to_use = [order_col, product_col]
+        if sku_id_col in df.columns:
+            cols_to_use.append(sku_id_col)
+        valid = df[cols_to_use].notna().all(axis=1).to_numpy()
+
+        # Tanpa kolom tanggal order tetap dipakai, hanya tanpa hari (NaT)
+        if date_col in df.columns:
+            date_filter = date_filter or DateFilter()
+            dates, _, _ = date_filter.parse_date_column(df, date_col)
+            days = dates[valid].astype("datetime64[D]")
+        else:
+            logger.warning(f"Kolom tanggal {date_col} tidak ditemukan; order tanpa tanggal")
+            days = np.full(int(valid.sum()), np.datetime64("NaT"), dtype="datetime64[D]")
+        orders = df[order_col][valid].astype(str)
+        products = df[product_col][valid].astype(str).str.strip()
+
+        # Sama dengan prepare_transactions: baris deskripsi export dilewati
+        skip = TransactionStore.description_rows(orders)
+        if skip:
+            orders, products, days = orders.iloc[skip:], products.iloc[skip:], days[skip:]
+        return orders, products, days
+
+    @staticmethod
+    def description_rows(orders):
+        """Jumlah baris awal yang merupakan baris deskripsi export ("Platform unique ...").
+
+        Dicek dari isi kolom order pada 2 baris pertama, sehingga export tanpa
+        baris deskripsi (mis. delta harian) tidak kehilangan order. XLSX sudah
+        melewatinya saat streaming (read_file), jadi di sini hasilnya 0; yang
+        masih membawa baris ini adalah CSV dan .xls.
+        """
+        leading = orders.iloc[:2].astype(str).str.startswith(XlsxStreamReader.DESCRIPTION_PREFIX)
+        hits = np.flatnonzero(leading.to_numpy())
+        return int(hits[-1]) + 1 if len(hits) else 0
+
+    @staticmethod
+    def first_days(line_tx, days, n_transactions):
+        """Tanggal order = tanggal valid pertama dari baris-barisnya"""
+        tx_days = np.full(n_transactions, np.datetime64("NaT"), dtype="datetime64[D]")
+        dated = ~np.isnat(days)
+        dated_tx, first_dated = np.unique(line_tx[dated], return_index=True)
+        tx_days[dated_tx] = days[dated][first_dated]
+        return tx_days
+
+    @staticmethod
+    def range_mask(days, start_day, end_day):
+        """Mask hari di [start_day, end_day]; tanpa rentang semua True"""
+        if start_day is None or end_day is None:
+            return np.ones(len(days), dtype=bool)
+        return (days >= np.datetime64(start_day, "D")) & (days <= np.datetime64(end_day, "D"))
+
+    def date_mask(self, start_day, end_day):
+        """Mask transaksi dengan tanggal di [start_day, end_day]"""
+        return self.range_mask(self.tx_days, start_day, end_day)
+
+    def item_tidlists(self):
+        """{id item: array tid terurut} untuk seluruh transaksi"""
+        if self._item_tidlists is None:
+            self._item_tidlists = self.baskets.item_tidlists()
+        return self._item_tidlists
+
+    def collapsed(self):
+        """Basket identik pada hari yang sama digabung menjadi satu baris berbobot.
+
+        Return (item_tidlists, hari tiap baris, bobot tiap baris); dibangun
+        sekali, dipakai ulang untuk setiap rentang tanggal.
+        """
+        if self._collapsed is None:
+            baskets, codes = self.baskets.collapse(groups=self.tx_days.astype(np.int64))
+            _, first = np.unique(codes, return_index=True)
+            self._collapsed = (baskets.item_tidlists(), self.tx_days[first], baskets.weights)
+        return self._collapsed
+
+    def mining_selection(self, start_day, end_day, collapse=True):
+        """(item_tidlists, transaction_mask, weights) untuk run_eclat pada rentang tanggal"""
+        if not collapse:
+            return self.item_tidlists(), self.date_mask(start_day, end_day), None
+        item_tidlists, row_days, weights = self.collapsed()
+        return item_tidlists, self.range_mask(row_days, start_day, end_day), weights
+
+    def select(self, transaction_mask, min_support_count=2):
+        """Transaksi dalam mask, dengan format hasil prepare_transactions.
+
+        Return (EncodedTransactions, single_product_count, total_orders,
+        filtered_products); support_count produk dihitung per baris order
+        seperti value_counts pada prepare_transactions.
+        """
+        item_counts = np.bincount(
+            self.line_item[transaction_mask[self.line_tx]], minlength=len(self.items)
+        )
+        keep = item_counts >= min_support_count
+        kept_codes = np.flatnonzero(keep)
+        kept_codes = kept_codes[np.argsort(-item_counts[kept_codes], kind="stable")]
+        filtered_products = {
+            self.items[code]: int(item_counts[code]) for code in kept_codes
+        }
+
+        transactions = self.baskets.subset(transaction_mask, keep)
+        single_product_count = int((transactions.basket_sizes() < 2).sum())
+        return (
+            transactions,
+            single_product_count,
+            int(transaction_mask.sum()),
+            filtered_products,
+        )
+
+
+class BasketStore:
+    """Basket order persisten (SQLite), ditambah per export harian.
+
+    Setiap export hanya menambahkan order yang belum ada (dedup berdasarkan
+    Order ID). Order baru mendapat tid berurutan, sehingga tidlist per item
+    (basket_lines, clustered per item) tetap terurut hanya dengan append, dan
+    jumlah order/baris per item diperbarui sebagai delta. Biaya ingest
+    sebanding dengan ukuran export, bukan dengan riwayat.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS basket_orders (
+            tid INTEGER PRIMARY KEY,
+            order_id TEXT NOT NULL UNIQUE,
+            day TEXT
+        );
+        CREATE TABLE IF NOT EXISTS basket_items (
+            item_id INTEGER PRIMARY KEY,
+            sku TEXT NOT NULL UNIQUE,
+            order_count INTEGER NOT NULL DEFAULT 0,
+            line_count INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS basket_lines (
+            item_id INTEGER NOT NULL,
+            tid INTEGER NOT NULL,
+            line_count INTEGER NOT NULL,
+            PRIMARY KEY (item_id, tid)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS basket_ingests (
+            digest TEXT PRIMARY KEY,
+            created_at REAL NOT NULL,
+            orders_added INTEGER NOT NULL
+        );
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
         self.logger = logger
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(self.SCHEMA)
 
-    def create_tidlist_1itemset(self, transactions, filtered_products):
-        """Buat TID-LIST untuk 1-itemset"""
-        tidlist_1 = defaultdict(list)
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
 
-        for tid, transaction in enumerate(transactions):
-            tid_str = f"T{tid+1}"
-            for product in set(transaction):
-                # Hanya proses produk yang sudah difilter
-                if product in filtered_products:
-                    if tid_str not in tidlist_1[product]:
-                        tidlist_1[product].append(tid_str)
+    @staticmethod
+    def _lookup(conn, table, key_col, value_col, keys):
+        """{key: value} untuk keys yang sudah ada di tabel (lewat tabel temp)"""
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS incoming (key TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM incoming")
+        conn.executemany("INSERT INTO incoming (key) VALUES (?)", ((k,) for k in keys))
+        return dict(
+            conn.execute(
+                f"SELECT t.{key_col}, t.{value_col} FROM incoming i "
+                f"JOIN {table} t ON t.{key_col} = i.key"
+            )
+        )
 
-        return dict(tidlist_1)
+    def stats(self):
+        """Jumlah order, item dan export yang sudah masuk"""
+        with closing(self._connect()) as conn:
+            return self._stats(conn)
 
-    def create_tidlist_2itemset(self, tidlist_1):
-        """Buat TID-LIST untuk 2-itemset dari 1-itemset"""
-        tidlist_2 = {}
-        items = list(tidlist_1.keys())
+    @staticmethod
+    def _stats(conn):
+        orders, items, ingests = conn.execute(
+            "SELECT (SELECT COUNT(*) FROM basket_orders), "
+            "(SELECT COUNT(*) FROM basket_items), "
+            "(SELECT COUNT(*) FROM basket_ingests)"
+        ).fetchone()
+        return {"total_orders": orders, "total_items": items, "ingests": ingests}
+
+    def append(self, orders, products, days, digest=None):
+        """Tambahkan baris order bersih; return ringkasan delta.
+
+        orders/products/days mengikuti TransactionStore.clean_lines. Export
+        dengan digest yang sudah pernah masuk dilewati.
+        """
+        line_order, order_ids = pd.factorize(orders, sort=False)
+        line_sku, skus = pd.factorize(products, sort=False)
+        summary = {
+            "orders_in_file": len(order_ids),
+            "orders_added": 0,
+            "duplicate_orders": len(order_ids),
+            "new_items": 0,
+            "lines_added": 0,
+        }
 
-        self.logger.info(f"Creating 2-itemset from {len(items)} items...")
+        with self._lock, closing(self._connect()) as conn, conn:
+            # BEGIN IMMEDIATE: cek digest, MAX(tid)/MAX(item_id) dan insert
+            # atomik antar proses (worker lain yang juga append)
+            conn.execute("BEGIN IMMEDIATE")
+            if digest is not None and conn.execute(
+                "SELECT 1 FROM basket_ingests WHERE digest = ?", (digest,)
+            ).fetchone():
+                summary.update(self._stats(conn))
+                return summary
+
+            # Hanya order yang belum ada; tid baru urut kemunculan pertama
+            existing = self._lookup(
+                conn, "basket_orders", "order_id", "tid", order_ids.tolist()
+            )
+            is_new = ~order_ids.isin(list(existing))
+            next_tid = conn.execute(
+                "SELECT COALESCE(MAX(tid) + 1, 0) FROM basket_orders"
+            ).fetchone()[0]
+            order_tids = np.full(len(order_ids), -1, dtype=np.int64)
+            order_tids[is_new] = next_tid + np.arange(int(is_new.sum()))
+
+            new_lines = is_new[line_order]
+            line_tid = order_tids[line_order[new_lines]]
+            line_sku = line_sku[new_lines]
+            order_days = TransactionStore.first_days(
+                line_order[new_lines], np.asarray(days)[new_lines], len(order_ids)
+            )[is_new]
+
+            # Id item: yang lama dipakai ulang, SKU baru mendapat id berikutnya
+            item_map = self._lookup(conn, "basket_items", "sku", "item_id", skus.tolist())
+            next_item = conn.execute(
+                "SELECT COALESCE(MAX(item_id) + 1, 0) FROM basket_items"
+            ).fetchone()[0]
+            sku_ids = np.empty(len(skus), dtype=np.int64)
+            new_skus = []
+            for code, sku in enumerate(skus.tolist()):
+                if sku not in item_map:
+                    item_map[sku] = next_item + len(new_skus)
+                    new_skus.append(sku)
+                sku_ids[code] = item_map[sku]
+
+            # Pasangan (item, tid) unik dengan jumlah barisnya
+            pair_key = sku_ids[line_sku] * (next_tid + len(order_ids)) + line_tid
+            pairs, pair_lines = np.unique(pair_key, return_counts=True)
+            pair_items = pairs // (next_tid + len(order_ids))
+            pair_tids = pairs % (next_tid + len(order_ids))
+            touched, order_counts = np.unique(pair_items, return_counts=True)
+            line_counts = np.bincount(pair_items, weights=pair_lines)[touched]
+
+            conn.executemany(
+                "INSERT INTO basket_orders (tid, order_id, day) VALUES (?, ?, ?)",
+                zip(
+                    order_tids[is_new].tolist(),
+                    order_ids[is_new].tolist(),
+                    [None if np.isnat(day) else str(day) for day in order_days],
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO basket_items (item_id, sku) VALUES (?, ?)",
+                ((item_map[sku], sku) for sku in new_skus),
+            )
+            conn.executemany(
+                "INSERT INTO basket_lines (item_id, tid, line_count) VALUES (?, ?, ?)",
+                zip(pair_items.tolist(), pair_tids.tolist(), pair_lines.tolist()),
+            )
+            conn.executemany(
+                "UPDATE basket_items SET order_count = order_count + ?, "
+                "line_count = line_count + ? WHERE item_id = ?",
+                zip(order_counts.tolist(), line_counts.astype(np.int64).tolist(), touched.tolist()),
+            )
+            if digest is not None:
+                conn.execute(
+                    "INSERT INTO basket_ingests (digest, created_at, orders_added) "
+                    "VALUES (?, ?, ?)",
+                    (digest, time.time(), int(is_new.sum())),
+                )
+            summary.update(self._stats(conn))
+
+        summary.update(
+            {
+                "orders_added": int(is_new.sum()),
+                "duplicate_orders": int((~is_new).sum()),
+                "new_items": len(new_skus),
+                "lines_added": int(new_lines.sum()),
+            }
+        )
+        self.logger.info(f"Basket store append: {summary}")
+        return summary
 
-        combo_count = 0
-        start_time = time.time()
+    def transaction_store(self, n_orders):
+        """Riwayat order dengan tid < n_orders sebagai TransactionStore.
 
-        # Generate semua kombinasi 2-itemset dari 1-itemset
-        for combo in combinations(items, 2):
-            combo_count += 1
-            if combo_count % 500 == 0:
-                elapsed = time.time() - start_time
-                rate = combo_count / elapsed if elapsed > 0 else 0
-                self.logger.info(
-                    f"Processed {combo_count:,} combinations... ({elapsed:.1f}s, {rate:.0f}/sec)"
+        n_orders (dari stats) membuat hasil tetap konsisten walau ada append
+        lain yang berjalan bersamaan.
+        """
+        with closing(self._connect()) as conn:
+            skus = [sku for (sku,) in conn.execute("SELECT sku FROM basket_items ORDER BY item_id")]
+            lines = np.array(
+                conn.execute(
+                    "SELECT tid, item_id, line_count FROM basket_lines "
+                    "WHERE tid < ? ORDER BY tid, item_id",
+                    (n_orders,),
+                ).fetchall(),
+                dtype=np.int64,
+            ).reshape(-1, 3)
+            days = [
+                day
+                for (day,) in conn.execute(
+                    "SELECT day FROM basket_orders WHERE tid < ? ORDER BY tid", (n_orders,)
                 )
+            ]
 
-            itemset = tuple(sorted(combo))
+        # Id item disusun ulang mengikuti urutan SKU (konvensi EncodedTransactions)
+        items = pd.Index(skus, dtype=object)
+        order = np.argsort(items.to_numpy(), kind="stable")
+        rank = np.empty(len(items), dtype=np.int32)
+        rank[order] = np.arange(len(items), dtype=np.int32)
+        line_tx = np.repeat(lines[:, 0], lines[:, 2]).astype(np.int32)
+        line_item = rank[np.repeat(lines[:, 1], lines[:, 2])]
 
-            # Hitung intersection dari TID lists
-            tid_sets = [set(tidlist_1[item]) for item in itemset]
-            tid_intersection = list(set.intersection(*tid_sets))
+        baskets = EncodedTransactions.from_codes(line_tx, line_item, items[order])
+        tx_days = np.array(days, dtype="datetime64[D]")
+        return TransactionStore(baskets, line_tx, line_item, tx_days)
 
-            if tid_intersection:  # Hanya simpan jika ada intersection
-                tidlist_2[itemset] = tid_intersection
 
-        elapsed = time.time() - start_time
-        self.logger.info(
-            f"Total 2-itemset combinations checked: {combo_count:,} ({elapsed:.1f}s)"
-        )
-        return tidlist_2
+# Jumlah bit 1 untuk setiap nilai byte (popcount bitset lewat view uint8)
+_POPCOUNT_TABLE = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
 
-    def create_tidlist_kitemset_from_previous(self, tidlist_prev, tidlist_1, k):
-        """Buat k-itemset dari (k-1)-itemset yang sudah ada"""
-        tidlist_k = {}
-        prev_itemsets = list(tidlist_prev.keys())
 
-        self.logger.info(
-            f"Creating {k}-itemset from {len(prev_itemsets)} {k-1}-itemsets..."
+class TidArrayEngine:
+    """Tidlist ECLAT sebagai array tid terurut (int32)"""
+
+    name = "tidlist"
+
+    def __init__(self, n_transactions):
+        self.n_transactions = n_transactions
+
+    def encode(self, tids):
+        return tids
+
+    def decode(self, tidlist):
+        return tidlist
+
+    def intersect(self, tidlists):
+        return EclatAlgorithm.intersect_tidlists(tidlists)
+
+    def difference(self, tidlist, other):
+        """tid di tidlist yang tidak ada di other (diffset)"""
+        return np.setdiff1d(tidlist, other, assume_unique=True)
+
+    def is_empty(self, tidlist):
+        return len(tidlist) == 0
+
+    def support(self, tidlist, weights=None):
+        return _support_count(tidlist, weights)
+
+
+class BitsetEngine(TidArrayEngine):
+    """Tidlist ECLAT sebagai bitset terpaket (word uint64).
+
+    Irisan dua bitset adalah AND per word dan support dihitung dengan
+    popcount. Item yang sangat jarang tetap disimpan sebagai array tid
+    (lebih kecil dan lebih cepat diiris), irisan array dengan bitset cukup
+    menguji bit tid array tersebut.
+    """
+
+    name = "bitset"
+
+    # Item dengan kepadatan di bawah ini disimpan sebagai array tid
+    # (array int32 lebih kecil dari bitset di bawah 1 tid per 32 transaksi)
+    SPARSE_DENSITY = 1 / 32
+
+    def __init__(self, n_transactions):
+        super().__init__(n_transactions)
+        self.n_words = (n_transactions + 63) // 64
+
+    @staticmethod
+    def is_bitset(tidlist):
+        return tidlist.dtype.kind == "u"
+
+    def encode(self, tids):
+        if len(tids) < self.SPARSE_DENSITY * self.n_transactions:
+            return tids
+        return self.pack(tids)
+
+    def pack(self, tids):
+        bits = np.zeros(self.n_words * 64, dtype=bool)
+        bits[tids] = True
+        return np.packbits(bits, bitorder="little").view("<u8")
+
+    def decode(self, tidlist):
+        if not self.is_bitset(tidlist):
+            return tidlist
+        words = np.flatnonzero(tidlist)
+        if len(words) * 4 >= len(tidlist):
+            bits = np.unpackbits(tidlist.view(np.uint8), bitorder="little")
+            return np.flatnonzero(bits).astype(np.int32)
+
+        # Bitset jarang (mis. diffset): hanya word berisi bit 1 yang di-unpack
+        bits = np.unpackbits(tidlist[words].view(np.uint8), bitorder="little")
+        rows, offsets = np.nonzero(bits.reshape(-1, 64))
+        return (words[rows] * 64 + offsets).astype(np.int32)
+
+    @staticmethod
+    def test_bits(bitset, tids):
+        """tid dari array yang bitnya menyala di bitset"""
+        shifts = (tids & 63).astype(np.uint64)
+        return tids[(bitset[tids >> 6] >> shifts) & np.uint64(1) == 1]
+
+    def intersect(self, tidlists):
+        # Array (item jarang) diiris lebih dulu; hasilnya tetap array
+        arrays = [tids for tids in tidlists if not self.is_bitset(tids)]
+        bitsets = [bits for bits in tidlists if self.is_bitset(bits)]
+        if arrays:
+            result = EclatAlgorithm.intersect_tidlists(arrays)
+            for bits in bitsets:
+                if len(result) == 0:
+                    break
+                result = self.test_bits(bits, result)
+            return result
+
+        result = bitsets[0]
+        for bits in bitsets[1:]:
+            result = result & bits
+        return result
+
+    def difference(self, tidlist, other):
+        if not self.is_bitset(tidlist):
+            if self.is_bitset(other):
+                return np.setdiff1d(tidlist, self.test_bits(other, tidlist), assume_unique=True)
+            return np.setdiff1d(tidlist, other, assume_unique=True)
+        if not self.is_bitset(other):
+            other = self.pack(other)
+        return tidlist & ~other
+
+    def is_empty(self, tidlist):
+        if self.is_bitset(tidlist):
+            return not tidlist.any()
+        return len(tidlist) == 0
+
+    def support(self, tidlist, weights=None):
+        if not self.is_bitset(tidlist):
+            return _support_count(tidlist, weights)
+        if weights is None:
+            return int(_POPCOUNT_TABLE[tidlist.view(np.uint8)].sum())
+        return _support_count(self.decode(tidlist), weights)
+
+
+ECLAT_ENGINES = {engine.name: engine for engine in (TidArrayEngine, BitsetEngine)}
+
+
+class TopKSupport:
+    """Support k itemset (>= 2 item) terbesar dalam min-heap.
+
+    Selama heap belum penuh threshold adalah batas bawah (floor); setelah
+    penuh threshold naik ke support terkecil di heap, sehingga mining bisa
+    memangkas kandidat yang tidak mungkin masuk top-k.
+    """
+
+    def __init__(self, k):
+        self.k = k
+        self.heap = []
+
+    def push(self, support):
+        if len(self.heap) < self.k:
+            heapq.heappush(self.heap, support)
+        elif support > self.heap[0]:
+            heapq.heapreplace(self.heap, support)
+
+    def threshold(self, floor):
+        if len(self.heap) < self.k:
+            return floor
+        return max(floor, self.heap[0])
+
+
+class PairSupportTable(Mapping):
+    """Support 2-itemset {(a, b): support} di atas array kode pasangan terurut.
+
+    Kode pasangan a * stride + b (a < b) dicari dengan searchsorted, jadi
+    array-nya bisa diletakkan di shared memory dan dibaca worker tanpa
+    membangun ulang dict per proses.
+    """
+
+    def __init__(self, codes, supports, stride):
+        self.codes = codes
+        self.supports = supports
+        self.stride = stride
+
+    @staticmethod
+    def pack(pair_supports):
+        """(codes, supports, stride) terurut dari dict {(a, b): support}"""
+        stride = max((b for _, b in pair_supports), default=0) + 1
+        codes = np.fromiter(
+            (a * stride + b for a, b in pair_supports), dtype=np.int64, count=len(pair_supports)
         )
+        supports = np.fromiter(pair_supports.values(), dtype=np.int64, count=len(pair_supports))
+        order = np.argsort(codes)
+        return codes[order], supports[order], stride
 
-        if not prev_itemsets:
-            self.logger.info(
-                f"No {k-1}-itemsets found, skipping {k}-itemset generation"
+    def _position(self, key):
+        a, b = key
+        code = a * self.stride + b
+        position = int(np.searchsorted(self.codes, code))
+        if position < len(self.codes) and self.codes[position] == code:
+            return position
+        return -1
+
+    def __getitem__(self, key):
+        position = self._position(key)
+        if position < 0:
+            raise KeyError(key)
+        return int(self.supports[position])
+
+    def __contains__(self, key):
+        return self._position(key) >= 0
+
+    def __iter__(self):
+        for code in self.codes.tolist():
+            yield divmod(code, self.stride)
+
+    def __len__(self):
+        return len(self.codes)
+
+
+class ClosedItemsets:
+    """Kumpulan closed itemset {frozenset: support} dengan indeks (support, item).
+
+    Dipakai CHARM untuk cek subsumption: itemset X tercakup jika ada closed
+    itemset lain yang memuat X dengan support sama.
+    """
+
+    def __init__(self):
+        self.supports = {}
+        self.index = defaultdict(list)
+
+    def subsumes(self, itemset, support):
+        candidates = min(
+            (self.index.get((support, item), ()) for item in itemset), key=len
+        )
+        return any(itemset <= closed for closed in candidates)
+
+    def add(self, itemset, support):
+        self.supports[itemset] = support
+        for item in itemset:
+            self.index[(support, item)].append(itemset)
+
+    def maximal(self):
+        """Closed itemset yang tidak punya superset frekuen (maximal itemset)"""
+        by_item = defaultdict(list)
+        for itemset in self.supports:
+            for item in itemset:
+                by_item[item].append(itemset)
+        return {
+            itemset: support
+            for itemset, support in self.supports.items()
+            if not any(
+                itemset < other
+                for other in min((by_item[item] for item in itemset), key=len)
             )
-            return tidlist_k
+        }
 
-        combo_count = 0
-        start_time = time.time()
 
-        # Generate candidate k-itemset dari (k-1)-itemset
-        for i, itemset1 in enumerate(prev_itemsets):
-            for j, itemset2 in enumerate(prev_itemsets[i + 1 :], i + 1):
-                combo_count += 1
+class EclatAlgorithm:
+    """Class untuk implementasi algoritma ECLAT"""
 
-                if combo_count % 1000 == 0:
-                    elapsed = time.time() - start_time
-                    rate = combo_count / elapsed if elapsed > 0 else 0
-                    self.logger.info(
-                        f"Processed {combo_count:,} combinations... ({elapsed:.1f}s, {rate:.0f}/sec)"
-                    )
+    def __init__(self):
+        self.logger = logger
 
-                # Check apakah kedua itemset bisa digabung
-                set1 = set(itemset1)
-                set2 = set(itemset2)
+    @staticmethod
+    def intersect_tidlists(tidlists):
+        """Irisan beberapa tidlist (array tid terurut dan unik)"""
+        result = tidlists[0]
+        for tids in tidlists[1:]:
+            result = np.intersect1d(result, tids, assume_unique=True)
+            if len(result) == 0:
+                break
+        return result
 
-                # Untuk itemset bisa digabung, harus berbeda tepat 1 item
-                diff = set1.symmetric_difference(set2)
+    def create_tidlist_1itemset(self, transactions, filtered_items):
+        """Buat TID-LIST untuk 1-itemset (key: id item, value: array tid)"""
+        return transactions.item_tidlists(filtered_items)
 
-                if len(diff) == 2:  # Berbeda tepat 1 item di masing-masing itemset
-                    # Gabungkan menjadi k-itemset
-                    new_itemset = tuple(sorted(set1.union(set2)))
+    @staticmethod
+    def count_pair_supports(tidlist_1, weights, min_support_count, n_transactions):
+        """Support semua 2-itemset sekaligus dari matriks co-occurrence.
+
+        Matriks insiden transaksi x item A dibentuk dari tidlist 1-itemset;
+        co-occurrence = A^T W A (W: bobot transaksi). Return {(a, b): support}
+        hanya untuk pasangan dengan support >= min_support_count. Memakai
+        scipy.sparse jika tersedia, jika tidak kode pasangan per basket dengan
+        numpy.
+        """
+        items = np.array(sorted(tidlist_1), dtype=np.int64)
+        if len(items) < 2:
+            return {}
+        sizes = [len(tidlist_1[item]) for item in items.tolist()]
+        tids = np.concatenate([tidlist_1[item] for item in items.tolist()]).astype(np.int64)
+        cols = np.repeat(np.arange(len(items)), sizes)
+
+        if scipy_sparse is not None:
+            values = np.ones(len(tids), dtype=np.int64) if weights is None else weights[tids]
+            incidence = scipy_sparse.csr_matrix(
+                (values, (tids, cols)), shape=(n_transactions, len(items))
+            )
+            binary = scipy_sparse.csr_matrix(
+                (np.ones(len(tids), dtype=np.int64), (tids, cols)),
+                shape=(n_transactions, len(items)),
+            )
+            cooccurrence = scipy_sparse.triu(binary.T.tocsr() @ incidence, k=1).tocoo()
+            left, right, counts = cooccurrence.row, cooccurrence.col, cooccurrence.data
+        else:
+            # Semua pasangan (kolom kiri < kanan) di setiap basket
+            by_basket = np.lexsort((cols, tids))
+            tids, cols = tids[by_basket], cols[by_basket]
+            starts = np.flatnonzero(np.r_[True, tids[1:] != tids[:-1]])
+            basket_sizes = np.diff(np.r_[starts, len(tids)])
+            later = np.repeat(starts + basket_sizes, basket_sizes) - np.arange(len(tids)) - 1
+            first = np.repeat(np.arange(len(tids)), later)
+            offsets = np.arange(len(first)) - np.repeat(np.cumsum(later) - later, later)
+            second = first + 1 + offsets
+            pair_codes = cols[first] * len(items) + cols[second]
+            codes, inverse = np.unique(pair_codes, return_inverse=True)
+            counts = np.bincount(
+                inverse, weights=None if weights is None else weights[tids[first]]
+            ).astype(np.int64)
+            left, right = codes // len(items), codes % len(items)
+
+        frequent = counts >= max(min_support_count, 1)
+        return dict(
+            zip(
+                zip(items[left[frequent]].tolist(), items[right[frequent]].tolist()),
+                counts[frequent].tolist(),
+            )
+        )
 
-                    if len(new_itemset) == k and new_itemset not in tidlist_k:
-                        # Hitung intersection dari TID lists menggunakan 1-itemset
-                        tid_sets = [set(tidlist_1[item]) for item in new_itemset]
-                        tid_intersection = list(set.intersection(*tid_sets))
+    @staticmethod
+    def pair_partners(members, pair_supports):
+        """{posisi member: [posisi member sesudahnya yang berpasangan frekuen]}"""
+        rank = {member[0]: position for position, member in enumerate(members)}
+        partner_ranks = defaultdict(list)
+        for a, b in pair_supports:
+            first, second = sorted((rank[a], rank[b]))
+            partner_ranks[first].append(second)
+        return {first: sorted(seconds) for first, seconds in partner_ranks.items()}
+
+    def mine_pair_class(
+        self,
+        member,
+        partners,
+        pair_supports,
+        engine,
+        weights,
+        min_support_count,
+        max_len,
+        levels,
+        diffset_support=None,
+        prune_root=True,
+        top_k=None,
+    ):
+        """2-itemset satu class 1-item (support dari co-occurrence), lalu DFS.
 
-                        if tid_intersection:  # Hanya simpan jika ada intersection
-                            tidlist_k[new_itemset] = tid_intersection
+        Tidlist (atau diffset) 2-itemset hanya dibentuk jika class masih punya
+        >= 2 anggota frekuen dan perlu ditambang lebih dalam; selain itu
+        2-itemset disimpan dengan tidlist None (support sudah diketahui).
+        """
+        level = levels.setdefault(2, {})
+        item_i, tids_i, support_i = member
+        child_diff = diffset_support is not None and support_i >= diffset_support
+        deeper = len(partners) > 1 and max_len > 2
+        parent_key = (item_i,) if child_diff and deeper else None
+
+        children = []
+        for item_j, tids_j, _ in partners:
+            key = tuple(sorted((item_i, item_j)))
+            tids = None
+            if deeper:
+                if child_diff:
+                    tids = engine.difference(tids_i, tids_j)
+                else:
+                    tids = engine.intersect([tids_i, tids_j])
+            level[key] = (tids, pair_supports[key], parent_key)
+            children.append((item_j, tids, pair_supports[key]))
+
+        if deeper:
+            self.mine_prefix_class(
+                (item_i,),
+                children,
+                engine,
+                weights,
+                min_support_count,
+                max_len,
+                levels,
+                diffset_support,
+                child_diff,
+                prune_root,
+                top_k,
+            )
 
-        elapsed = time.time() - start_time
-        self.logger.info(
-            f"Total {k}-itemset combinations checked: {combo_count:,} ({elapsed:.1f}s)"
+    def mine_pair_classes(
+        self,
+        members,
+        pair_supports,
+        engine,
+        weights,
+        min_support_count,
+        max_len,
+        levels,
+        diffset_support=None,
+        top_k=None,
+    ):
+        """Level 2 dari support co-occurrence, lalu DFS per class 1-item.
+
+        Class diproses dari item dengan support terbesar; dengan top_k,
+        class berhenti diproses begitu support item di bawah threshold.
+        """
+        partner_ranks = self.pair_partners(members, pair_supports)
+        for i in range(len(members) - 1, -1, -1):
+            if top_k is not None and members[i][2] < top_k.threshold(min_support_count):
+                break
+            self.mine_pair_class(
+                members[i],
+                [members[j] for j in partner_ranks.get(i, [])],
+                pair_supports,
+                engine,
+                weights,
+                min_support_count,
+                max_len,
+                levels,
+                diffset_support,
+                top_k=top_k,
+            )
+
+    def mine_pair_classes_parallel(
+        self,
+        members,
+        raw_tidlists,
+        pair_supports,
+        engine,
+        weights,
+        min_support_count,
+        max_len,
+        levels,
+        diffset_support,
+        workers,
+    ):
+        """Seperti mine_pair_classes, class 1-item ditambang di process pool.
+
+        Tidlist 1-itemset, bobot dan support 2-itemset (PairSupportTable)
+        dibagikan lewat shared memory sekali per run, bukan di-pickle per
+        worker atau per task. Class dikirim dari yang terbesar
+        agar beban worker seimbang; hasil parsial digabung per key, sehingga
+        lattice akhir sama persis dengan mode satu proses. Pruning subset
+        lintas class (subset tanpa item pertama) hanya dipakai di level 2,
+        karena class lain ditambang di proses lain.
+        """
+        partner_ranks = self.pair_partners(members, pair_supports)
+        tasks = []
+        for i in range(len(members) - 1, -1, -1):
+            partners = partner_ranks.get(i, [])
+            if len(partners) > 1 and max_len > 2:
+                tasks.append((i, partners))
+            else:
+                # Class tanpa level lebih dalam cukup dicatat di sini
+                self.mine_pair_class(
+                    members[i],
+                    [members[j] for j in partners],
+                    pair_supports,
+                    engine,
+                    weights,
+                    min_support_count,
+                    max_len,
+                    levels,
+                    diffset_support,
+                )
+        if not tasks:
+            return
+        tasks.sort(key=lambda task: -len(task[1]))
+
+        arrays = {
+            "items": np.array([member[0] for member in members], dtype=np.int64),
+            "supports": np.array([member[2] for member in members], dtype=np.int64),
+            "offsets": np.concatenate(
+                [[0], np.cumsum([len(raw_tidlists[member[0]]) for member in members])]
+            ).astype(np.int64),
+            "tids": np.concatenate(
+                [raw_tidlists[member[0]] for member in members] + [np.zeros(0, np.int32)]
+            ).astype(np.int32),
+        }
+        if weights is not None:
+            arrays["weights"] = np.asarray(weights, dtype=np.int64)
+        arrays["pair_codes"], arrays["pair_supports"], pair_stride = PairSupportTable.pack(
+            pair_supports
         )
-        return tidlist_k
 
-    def run_eclat(self, transactions, filtered_products, min_support=0.01):
-        """Implementasi algoritma ECLAT yang diperbaiki"""
-        total_transactions = len(transactions)
+        segments = []
+        try:
+            shared = {}
+            for name, array in arrays.items():
+                segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                segments.append(segment)
+                np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[:] = array
+                shared[name] = (segment.name, array.dtype.str, len(array))
+
+            settings = {
+                "engine": engine.name,
+                "n_transactions": engine.n_transactions,
+                "min_support_count": min_support_count,
+                "max_len": max_len,
+                "diffset_support": diffset_support,
+                "pair_stride": pair_stride,
+            }
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(tasks)),
+                initializer=_init_eclat_worker,
+                initargs=(shared, settings),
+            ) as pool:
+                partial_levels = pool.map(
+                    _mine_eclat_class, *zip(*tasks), chunksize=1
+                )
+                for partial in partial_levels:
+                    for k, level in partial.items():
+                        levels.setdefault(k, {}).update(level)
+        finally:
+            for segment in segments:
+                segment.close()
+                segment.unlink()
+
+    def mine_prefix_class(
+        self,
+        prefix,
+        members,
+        engine,
+        weights,
+        min_support_count,
+        max_len,
+        levels,
+        diffset_support=None,
+        diff_mode=False,
+        prune_root=True,
+        top_k=None,
+    ):
+        """DFS satu equivalence class (prefix sama), Eclat depth-first.
+
+        members adalah [(item, tidlist, support)] urut support menaik. Tidlist
+        kandidat adalah irisan tidlist kedua parent-nya. Class diproses dari
+        member terakhir, sehingga semua (k-1)-subset kandidat selain kedua
+        parent sudah pernah ditemukan; kandidat dengan subset tidak frekuen
+        dilewati tanpa irisan. Itemset frekuen disimpan di levels[k] (key: id
+        terurut) sebagai (tidlist, support, None).
+
+        Mode dEclat: jika support prefix >= diffset_support, class anak
+        memakai diffset d(PXY) = t(PX) - t(PY), turunannya d(PXYZ) =
+        d(PXZ) - d(PXY), dan support(PXY) = support(PX) - |d(PXY)|. Itemset
+        tersebut disimpan sebagai (diffset, support, key parent PX).
+
+        prune_root=False jika class lain tidak ditambang di proses ini:
+        subset tanpa item pertama prefix hanya diperiksa di level 2.
+
+        top_k (TopKSupport) menaikkan min_support_count secara dinamis:
+        setiap itemset yang ditemukan masuk heap top-k.
+        """
+        k = len(prefix) + 2
+        level = levels.setdefault(k, {})
+        for i in range(len(members) - 1, -1, -1):
+            item_i, tids_i, support_i = members[i]
+            class_prefix = prefix + (item_i,)
+            child_diff = diff_mode or (
+                diffset_support is not None and support_i >= diffset_support
+            )
+            parent_key = tuple(sorted(class_prefix)) if child_diff else None
+            children = []
+            for item_j, tids_j, _ in members[i + 1 :]:
+                candidate = class_prefix + (item_j,)
+                if any(
+                    tuple(sorted(item for item in candidate if item != dropped))
+                    not in levels[k - 1]
+                    for dropped in (prefix if prune_root or k == 3 else prefix[1:])
+                ):
+                    continue
+
+                if diff_mode:
+                    tids = engine.difference(tids_j, tids_i)
+                    support = support_i - engine.support(tids, weights)
+                elif child_diff:
+                    tids = engine.difference(tids_i, tids_j)
+                    support = support_i - engine.support(tids, weights)
+                else:
+                    tids = engine.intersect([tids_i, tids_j])
+                    support = engine.support(tids, weights)
+                if support <= 0 or support < min_support_count:
+                    continue
+                if top_k is not None:
+                    if support < top_k.threshold(min_support_count):
+                        continue
+                    top_k.push(support)
+
+                level[tuple(sorted(candidate))] = (tids, support, parent_key)
+                children.append((item_j, tids, support))
+
+            if len(children) > 1 and k < max_len:
+                self.mine_prefix_class(
+                    class_prefix,
+                    children,
+                    engine,
+                    weights,
+                    min_support_count,
+                    max_len,
+                    levels,
+                    diffset_support,
+                    child_diff,
+                    prune_root,
+                    top_k,
+                )
+
+    @staticmethod
+    def subset_supports(all_tidlists, itemset, max_items=20):
+        """Support semua subset tak kosong itemset dari tidlist 1-itemset.
+
+        Setiap transaksi dipetakan ke bitmask item itemset yang dimuatnya;
+        support subset S = jumlah bobot transaksi dengan mask yang memuat S
+        (superset-sum, O(m 2^m)). Return (bits, counts): support subset S
+        adalah counts[sum(bits[item] for item in S)]. Itemset > max_items
+        mengembalikan None.
+        """
+        size = len(itemset)
+        if size > max_items:
+            return None
+        tidlist_1 = all_tidlists["tidlist_1"]
+        weights = all_tidlists.get("weights")
+        tidlists = [tidlist_1[item] for item in itemset]
+        n_tids = max(int(tids[-1]) for tids in tidlists) + 1
+        n_entries = sum(len(tids) for tids in tidlists)
+        if n_entries * 16 < n_tids:
+            # Tidlist jarang: mask per tid dari tid yang muncul saja
+            tids = np.concatenate(tidlists)
+            bits = np.repeat(1 << np.arange(size, dtype=np.int64), [len(t) for t in tidlists])
+            order = np.argsort(tids, kind="stable")
+            tids, bits = tids[order], bits[order]
+            starts = np.flatnonzero(np.r_[True, tids[1:] != tids[:-1]])
+            masks = np.add.reduceat(bits, starts)
+            row_tids = tids[starts]
+        else:
+            masks = np.zeros(n_tids, dtype=np.int64)
+            for bit, tids in enumerate(tidlists):
+                masks[tids] |= 1 << bit
+            row_tids = slice(0, n_tids)
+        counts = np.bincount(
+            masks,
+            weights=None if weights is None else weights[row_tids],
+            minlength=1 << size,
+        ).astype(np.int64)
+        for bit in range(size):
+            step = counts.reshape(-1, 2, 1 << bit)
+            step[:, 0, :] += step[:, 1, :]
+        return {item: 1 << bit for bit, item in enumerate(itemset)}, counts.tolist()
+
+    def mine_closed_class(
+        self,
+        members,
+        engine,
+        weights,
+        min_support_count,
+        closed,
+        pair_supports=None,
+    ):
+        """CHARM: closed itemset dari satu equivalence class.
+
+        members adalah [(itemset frozenset, tidlist, support)] urut support
+        menaik. Untuk Xi dan Xj, support(Xi u Xj) menentukan hubungan tidlist:
+        sama dengan keduanya -> t(Xi) = t(Xj) (Xj digabung ke Xi lalu
+        dibuang), sama dengan support Xi -> t(Xi) < t(Xj) (Xj digabung ke
+        Xi), sama dengan support Xj -> t(Xi) > t(Xj) (Xj dibuang, Xi u Xj
+        jadi anak), selain itu Xi u Xj jadi anak. Xi yang sudah diperluas
+        disimpan di closed jika tidak tercakup closed itemset lain dengan
+        support sama. pair_supports (level teratas, member satu item) dipakai
+        agar support pasangan tidak perlu diiris dulu.
+        """
+        removed = set()
+        for i in range(len(members)):
+            if i in removed:
+                continue
+            itemset_i, tids_i, support_i = members[i]
+            merged = set(itemset_i)
+            children = []
+            for j in range(i + 1, len(members)):
+                if j in removed:
+                    continue
+                itemset_j, tids_j, support_j = members[j]
+                tids = None
+                if pair_supports is not None:
+                    pair = tuple(sorted(itemset_i | itemset_j))
+                    support = pair_supports.get(pair, 0)
+                else:
+                    tids = engine.intersect([tids_i, tids_j])
+                    support = engine.support(tids, weights)
+                if support <= 0 or support < min_support_count:
+                    continue
+
+                if support == support_i:
+                    merged |= itemset_j
+                    if support == support_j:
+                        removed.add(j)
+                    continue
+                if support == support_j:
+                    removed.add(j)
+                if tids is None:
+                    tids = engine.intersect([tids_i, tids_j])
+                children.append((itemset_j, tids, support))
+
+            itemset = frozenset(merged)
+            if children:
+                # Item yang digabung berlaku untuk semua anak (tidlist sama)
+                children = sorted(
+                    ((itemset | itemset_j, tids, support) for itemset_j, tids, support in children),
+                    key=lambda child: child[2],
+                )
+                self.mine_closed_class(children, engine, weights, min_support_count, closed)
+
+            if not closed.subsumes(itemset, support_i):
+                closed.add(itemset, support_i)
+
+    @staticmethod
+    def itemset_tidlist(all_tidlists, itemset):
+        """Tidlist lengkap sebuah itemset dari hasil run_eclat.
+
+        Itemset hasil dEclat disimpan sebagai diffset terhadap parent-nya
+        (all_tidlists["diffsets"]); tidlist-nya t(parent) - diffset. 2-itemset
+        yang tidak ditambang lebih dalam disimpan tanpa tidlist (None) dan
+        dibentuk dari irisan tidlist item-itemnya.
+        """
+        size = len(itemset) if isinstance(itemset, tuple) else 1
+        tids = all_tidlists[f"tidlist_{size}"][itemset]
+        if tids is None:
+            return EclatAlgorithm.intersect_tidlists(
+                [all_tidlists["tidlist_1"][item] for item in itemset]
+            )
+        parent = all_tidlists.get("diffsets", {}).get(itemset)
+        if parent is None:
+            return tids
+        parent_tids = EclatAlgorithm.itemset_tidlist(all_tidlists, parent)
+        return np.setdiff1d(parent_tids, tids, assume_unique=True)
+
+    def restrict_tidlists(self, item_tidlists, filtered_items, transaction_mask=None):
+        """TID-LIST 1-itemset dari tidlist tersimpan, dibatasi ke transaksi dalam mask"""
+        tidlist_1 = {}
+        for item in sorted(filtered_items):
+            tids = item_tidlists.get(item)
+            if tids is None:
+                continue
+            if transaction_mask is not None:
+                tids = tids[transaction_mask[tids]]
+            if len(tids):
+                tidlist_1[item] = tids
+        return tidlist_1
+
+    def run_eclat(
+        self,
+        transactions,
+        filtered_products,
+        min_support=0.01,
+        item_tidlists=None,
+        transaction_mask=None,
+        weights=None,
+        engine=None,
+        max_len=10,
+        diffset_density=None,
+        workers=None,
+        top_k=None,
+        itemset_mode=None,
+    ):
+        """Implementasi algoritma ECLAT depth-first (equivalence class prefix).
+
+        transactions adalah EncodedTransactions; itemset disimpan sebagai id
+        item dan tidlist sebagai array tid. Kamus item ikut disimpan di key
+        "items" untuk decode. Jika item_tidlists (dari TransactionStore)
+        diberikan, TID-LIST 1-itemset diambil dari sana dan dibatasi oleh
+        transaction_mask alih-alih dibangun ulang dari transactions.
+
+        Untuk transaksi berbobot (hasil collapse), support dihitung sebagai
+        jumlah bobot; bobot disimpan di key "weights". weights hanya perlu
+        diberikan bila item_tidlists berasal dari transaksi lain yang
+        berbobot (mis. basket TransactionStore yang sudah digabung).
+
+        engine memilih representasi tidlist selama mining ("tidlist" atau
+        "bitset", default ECLAT_ENGINE); hasil selalu dikembalikan sebagai
+        array tid. max_len membatasi ukuran itemset terbesar.
+
+        Class dengan support prefix >= diffset_density x total transaksi
+        (default ECLAT_DIFFSET_DENSITY) ditambang dengan diffset (dEclat);
+        itemset tersebut disimpan sebagai diffset dengan key parent di
+        "diffsets" (lihat itemset_tidlist). Support setiap itemset ada di
+        "supports".
+
+        workers > 1 (default ECLAT_WORKERS) menambang class 1-item di process
+        pool jika ruang pencariannya cukup besar (ECLAT_PARALLEL_MIN_WORK);
+        hasilnya identik dengan mode satu proses.
+
+        Mode top-k (top_k=k): hasil berisi k itemset (>= 2 item) dengan
+        support terbesar (plus yang seri di batas) beserta subset-nya;
+        min_support hanya menjadi batas bawah. Threshold awal adalah support
+        2-itemset ke-k dari co-occurrence, lalu naik selama DFS (TopKSupport).
+        Mode ini selalu berjalan dalam satu proses.
+
+        itemset_mode (default ECLAT_ITEMSET_MODE): "all" menyimpan semua
+        itemset frekuen; "closed" hanya closed itemset (CHARM, lossless:
+        support subset mana pun bisa dihitung ulang dari tidlist 1-itemset);
+        "maximal" hanya maximal itemset. Pada kedua mode ringkas itemset >= 2
+        disimpan dengan tidlist None, "itemset_mode" ikut disimpan agar
+        RuleGenerator membentuk rule dari itemset ringkas saja, dan max_len
+        tidak berlaku.
+        """
+        total_transactions = transactions.total_weight
+        if item_tidlists is None:
+            weights = transactions.weights
         min_support_count = min_support * total_transactions
+        top_support = None if top_k is None else TopKSupport(top_k)
+        itemset_mode = itemset_mode or app.config["ECLAT_ITEMSET_MODE"]
+        if itemset_mode not in ("all", "closed", "maximal"):
+            raise ValueError(f"Mode itemset ECLAT tidak dikenal: {itemset_mode}")
+        if top_k is not None and itemset_mode != "all":
+            raise ValueError("Mode top-k hanya untuk itemset_mode 'all'")
+
+        engine_name = engine or app.config["ECLAT_ENGINE"]
+        if engine_name not in ECLAT_ENGINES:
+            raise ValueError(f"Engine ECLAT tidak dikenal: {engine_name}")
+        n_tids = len(transactions) if transaction_mask is None else len(transaction_mask)
+        engine = ECLAT_ENGINES[engine_name](n_tids)
 
-        self.logger.info(f"Starting ECLAT with {total_transactions} transactions")
         self.logger.info(
-            f"Min support: {min_support}, Min support count: {min_support_count}"
+            f"Starting ECLAT with {total_transactions} transactions ({len(transactions)} unique rows)"
+        )
+        self.logger.info(
+            f"Min support: {min_support}, Min support count: {min_support_count}, engine: {engine.name}"
         )
 
         # LANGKAH 1: Buat TID-LIST untuk 1-itemset
         self.logger.info("=== Creating 1-itemset TID-LIST ===")
-        tidlist_1 = self.create_tidlist_1itemset(transactions, filtered_products)
+        filtered_items = transactions.encode(filtered_products)
+        if item_tidlists is None:
+            tidlist_1 = self.create_tidlist_1itemset(transactions, filtered_items)
+        else:
+            tidlist_1 = self.restrict_tidlists(
+                item_tidlists, filtered_items, transaction_mask
+            )
 
         # Filter 1-itemset berdasarkan min_support
         filtered_tidlist_1 = {}
         for itemset, tid_list in tidlist_1.items():
-            if len(tid_list) >= min_support_count:
-                filtered_tidlist_1[itemset] = tid_list
+            if _support_count(tid_list, weights) >= min_support_count:
+                filtered_tidlist_1[itemset] = engine.encode(tid_list)
 
         self.logger.info(
             f"Found {len(tidlist_1)} initial 1-itemsets, {len(filtered_tidlist_1)} after support filtering"
         )
 
-        # LANGKAH 2: Buat TID-LIST untuk 2-itemset
-        self.logger.info("=== Creating 2-itemset TID-LIST ===")
+        # LANGKAH 2: DFS per equivalence class, item urut support menaik
+        self.logger.info(f"=== Mining itemsets depth-first (max_len={max_len}) ===")
         start_time = time.time()
-        tidlist_2 = self.create_tidlist_2itemset(filtered_tidlist_1)
+        if diffset_density is None:
+            diffset_density = app.config["ECLAT_DIFFSET_DENSITY"]
+        members = sorted(
+            (
+                (item, tids, engine.support(tids, weights))
+                for item, tids in filtered_tidlist_1.items()
+            ),
+            key=lambda member: (member[2], member[0]),
+        )
+        levels = {1: {(item,): (tids, support, None) for item, tids, support in members}}
+        if itemset_mode != "all":
+            self.logger.info(f"=== Mining {itemset_mode} itemsets (CHARM) ===")
+            pair_supports = self.count_pair_supports(
+                {item: tidlist_1[item] for item in filtered_tidlist_1},
+                weights,
+                min_support_count,
+                n_tids,
+            )
+            closed = ClosedItemsets()
+            self.mine_closed_class(
+                [(frozenset((item,)), tids, support) for item, tids, support in members],
+                engine,
+                weights,
+                min_support_count,
+                closed,
+                pair_supports,
+            )
+            self.logger.info(f"Found {len(closed.supports)} closed itemsets")
+            condensed = closed.maximal() if itemset_mode == "maximal" else closed.supports
+            for itemset, support in condensed.items():
+                if len(itemset) > 1:
+                    levels.setdefault(len(itemset), {})[tuple(sorted(itemset))] = (
+                        None,
+                        support,
+                        None,
+                    )
+        elif max_len >= 2:
+            pair_supports = self.count_pair_supports(
+                {item: tidlist_1[item] for item in filtered_tidlist_1},
+                weights,
+                min_support_count,
+                n_tids,
+            )
+            self.logger.info(
+                f"Found {len(pair_supports)} frequent 2-itemsets from co-occurrence "
+                f"({'scipy.sparse' if scipy_sparse is not None else 'numpy'})"
+            )
+            if top_support is not None:
+                # Threshold awal: support 2-itemset ke-k
+                for support in pair_supports.values():
+                    top_support.push(support)
+                threshold = top_support.threshold(min_support_count)
+                pair_supports = {
+                    pair: support
+                    for pair, support in pair_supports.items()
+                    if support >= threshold
+                }
+                members = [member for member in members if member[2] >= threshold]
+                workers = 1
+                self.logger.info(f"Top-{top_k} mode, initial support threshold {threshold}")
+            workers = app.config["ECLAT_WORKERS"] if workers is None else workers
+            partner_ranks = self.pair_partners(members, pair_supports)
+            work = sum(len(ranks) * (len(ranks) - 1) // 2 for ranks in partner_ranks.values())
+            if (
+                workers > 1
+                and max_len > 2
+                and work > 0
+                and work >= app.config["ECLAT_PARALLEL_MIN_WORK"]
+            ):
+                self.logger.info(
+                    f"Mining {len(partner_ranks)} classes in {workers} processes "
+                    f"({work} candidate 3-itemsets)"
+                )
+                self.mine_pair_classes_parallel(
+                    members,
+                    tidlist_1,
+                    pair_supports,
+                    engine,
+                    weights,
+                    min_support_count,
+                    max_len,
+                    levels,
+                    diffset_density * total_transactions,
+                    workers,
+                )
+            else:
+                self.mine_pair_classes(
+                    members,
+                    pair_supports,
+                    engine,
+                    weights,
+                    min_support_count,
+                    max_len,
+                    levels,
+                    diffset_support=diffset_density * total_transactions,
+                    top_k=top_support,
+                )
 
-        # Filter 2-itemset berdasarkan min_support
-        filtered_tidlist_2 = {}
-        for itemset, tid_list in tidlist_2.items():
-            if len(tid_list) >= min_support_count:
-                filtered_tidlist_2[itemset] = tid_list
+        if top_support is not None:
+            # Buang itemset yang ditemukan sebelum threshold akhir tercapai
+            threshold = top_support.threshold(min_support_count)
+            levels = {
+                k: {key: entry for key, entry in level.items() if entry[1] >= threshold}
+                for k, level in levels.items()
+            }
+            self.logger.info(f"Top-{top_k} mode, final support threshold {threshold}")
+
+        # Key 1-itemset di hasil berupa id item (bukan tuple)
+        def lattice_key(itemset):
+            return itemset[0] if len(itemset) == 1 else itemset
+
+        all_tidlists = {
+            "items": transactions.items,
+            "weights": weights,
+            "supports": {},
+            "diffsets": {},
+            "itemset_mode": itemset_mode,
+        }
+        for k in range(1, max(levels) + 1):
+            # Urutan itemset per level deterministik (urut id)
+            level = levels.get(k, {})
+            if level or k <= 2:
+                all_tidlists[f"tidlist_{k}"] = {}
+            for itemset in sorted(level):
+                tids, support, parent = level[itemset]
+                key = lattice_key(itemset)
+                all_tidlists[f"tidlist_{k}"][key] = None if tids is None else engine.decode(tids)
+                all_tidlists["supports"][key] = support
+                if parent is not None:
+                    all_tidlists["diffsets"][key] = lattice_key(parent)
+            if k > 1:
+                self.logger.info(f"Found {len(level)} frequent {k}-itemsets")
+        if all_tidlists["diffsets"]:
+            self.logger.info(
+                f"{len(all_tidlists['diffsets'])} itemsets stored as diffsets (dEclat)"
+            )
 
+        max_k = max([2] + [k for k, level in levels.items() if level])
         elapsed = time.time() - start_time
         self.logger.info(
-            f"Found {len(tidlist_2)} initial 2-itemsets, {len(filtered_tidlist_2)} after support filtering in {elapsed:.1f}s"
+            f"Itemset generation completed up to {max_k}-itemset in {elapsed:.1f}s"
         )
 
-        # LANGKAH 3: Level-wise generation untuk k >= 3
-        all_tidlists = {
-            "tidlist_1": filtered_tidlist_1,
-            "tidlist_2": filtered_tidlist_2,
-        }
+        return all_tidlists, max_k
 
-        k = 3
-        tidlist_prev = filtered_tidlist_2
 
-        while len(tidlist_prev) > 0 and k <= 10:  # Maksimal sampai 10-itemset
-            self.logger.info(f"=== Creating {k}-itemset TID-LIST ===")
-            start_time = time.time()
-            tidlist_k = self.create_tidlist_kitemset_from_previous(
-                tidlist_prev, filtered_tidlist_1, k
-            )
+class FPTree:
+    """FP-tree berbasis list: node i = (items[i], counts[i], parents[i]).
 
-            # Filter k-itemset berdasarkan min_support
-            filtered_tidlist_k = {}
-            for itemset, tid_list in tidlist_k.items():
-                if len(tid_list) >= min_support_count:
-                    filtered_tidlist_k[itemset] = tid_list
+    Node 0 adalah root. header menyimpan node per item (node-link) untuk
+    membentuk conditional pattern base.
+    """
 
-            elapsed = time.time() - start_time
-            self.logger.info(
-                f"Found {len(tidlist_k)} initial {k}-itemsets, {len(filtered_tidlist_k)} after support filtering in {elapsed:.1f}s"
+    def __init__(self):
+        self.items = [-1]
+        self.counts = [0]
+        self.parents = [-1]
+        self.children = [{}]
+        self.header = defaultdict(list)
+
+    def insert(self, path, count):
+        """Tambah satu transaksi (item urut frekuensi menurun) dengan bobot count"""
+        node = 0
+        for item in path:
+            child = self.children[node].get(item)
+            if child is None:
+                child = len(self.items)
+                self.items.append(item)
+                self.counts.append(0)
+                self.parents.append(node)
+                self.children.append({})
+                self.children[node][item] = child
+                self.header[item].append(child)
+            self.counts[child] += count
+            node = child
+
+    def support(self, item):
+        return sum(self.counts[node] for node in self.header[item])
+
+    def prefix_paths(self, item):
+        """Conditional pattern base item: [(path dari root, count)]"""
+        paths = []
+        for node in self.header[item]:
+            path = []
+            parent = self.parents[node]
+            while parent > 0:
+                path.append(self.items[parent])
+                parent = self.parents[parent]
+            if path:
+                paths.append((path[::-1], self.counts[node]))
+        return paths
+
+    def single_path(self):
+        """[(item, count)] dari root ke daun jika tree hanya satu cabang, selain itu None"""
+        path = []
+        node = 0
+        while self.children[node]:
+            if len(self.children[node]) > 1:
+                return None
+            node = next(iter(self.children[node].values()))
+            path.append((self.items[node], self.counts[node]))
+        return path
+
+
+class FPGrowthAlgorithm(EclatAlgorithm):
+    """Mining itemset frekuen dengan FP-Growth (FP-tree + conditional pattern base).
+
+    Cocok untuk basket panjang dengan min_support rendah, di mana tidlist
+    vertikal ECLAT membengkak. Antarmuka dan bentuk hasil sama dengan
+    EclatAlgorithm.run_eclat.
+    """
+
+    def build_tree(self, tidlist_1, weights, ranks):
+        """FP-tree dari tidlist 1-itemset: basket identik digabung dulu per urutan item"""
+        order = sorted(ranks, key=ranks.get)
+        sizes = [len(tidlist_1[item]) for item in order]
+        tids = np.concatenate([tidlist_1[item] for item in order])
+        item_ranks = np.repeat(np.arange(len(order)), sizes)
+        by_basket = np.lexsort((item_ranks, tids))
+        tids, item_ranks = tids[by_basket], item_ranks[by_basket].tolist()
+        starts = np.flatnonzero(np.r_[True, tids[1:] != tids[:-1]])
+        basket_weights = (
+            [1] * len(starts) if weights is None else weights[tids[starts]].tolist()
+        )
+        bounds = starts.tolist() + [len(item_ranks)]
+
+        baskets = defaultdict(int)
+        for i, weight in enumerate(basket_weights):
+            baskets[tuple(item_ranks[bounds[i] : bounds[i + 1]])] += weight
+
+        tree = FPTree()
+        for path, count in baskets.items():
+            tree.insert(path, count)
+        return tree
+
+    def mine_tree(self, tree, suffix, min_support_count, max_len, levels, top_k=None):
+        """FP-Growth rekursif: itemset = suffix + item, lalu conditional FP-tree.
+
+        Dengan top_k (TopKSupport, sudah berisi support semua 2-itemset),
+        itemset >= 3 item masuk heap dan threshold naik secara dinamis.
+        """
+
+        def accept(itemset, support):
+            if top_k is None:
+                return True
+            if support < top_k.threshold(min_support_count):
+                return False
+            if len(itemset) > 2:
+                top_k.push(support)
+            return True
+
+        path = tree.single_path()
+        if path is not None:
+            # Satu cabang: semua kombinasi node frekuen, support = node terdalam
+            for size in range(1, min(len(path), max_len - len(suffix)) + 1):
+                for combo in combinations(path, size):
+                    itemset = suffix + tuple(item for item, _ in combo)
+                    if accept(itemset, combo[-1][1]):
+                        levels[len(itemset)][itemset] = combo[-1][1]
+            return
+
+        # Item paling sering dulu agar threshold top-k cepat naik
+        for item in sorted(tree.header):
+            itemset = suffix + (item,)
+            if not accept(itemset, tree.support(item)):
+                continue
+            levels[len(itemset)][itemset] = tree.support(item)
+            if len(itemset) >= max_len:
+                continue
+            if top_k is not None:
+                min_count = top_k.threshold(min_support_count)
+            else:
+                min_count = min_support_count
+
+            base = tree.prefix_paths(item)
+            counts = defaultdict(int)
+            for prefix, count in base:
+                for prefix_item in prefix:
+                    counts[prefix_item] += count
+            frequent = {
+                prefix_item for prefix_item, count in counts.items() if count >= min_count
+            }
+            if not frequent:
+                continue
+
+            # Path yang sama setelah item tidak frekuen dibuang digabung dulu
+            paths = defaultdict(int)
+            for prefix, count in base:
+                kept = tuple(prefix_item for prefix_item in prefix if prefix_item in frequent)
+                if kept:
+                    paths[kept] += count
+            conditional = FPTree()
+            for kept, count in paths.items():
+                conditional.insert(kept, count)
+            self.mine_tree(conditional, itemset, min_support_count, max_len, levels, top_k)
+
+    def run_eclat(
+        self,
+        transactions,
+        filtered_products,
+        min_support=0.01,
+        item_tidlists=None,
+        transaction_mask=None,
+        weights=None,
+        max_len=10,
+        top_k=None,
+        **eclat_options,
+    ):
+        """FP-Growth dengan antarmuka EclatAlgorithm.run_eclat.
+
+        Hasil berupa varian support-count dari lattice ECLAT: "tidlist_1"
+        tetap berisi array tid, itemset >= 2 disimpan dengan tidlist None
+        (lihat itemset_tidlist) dan supportnya di "supports". Mode top_k
+        sama dengan EclatAlgorithm.run_eclat. Opsi khusus ECLAT (engine,
+        diffset_density, workers, itemset_mode) diabaikan.
+        """
+        total_transactions = transactions.total_weight
+        if item_tidlists is None:
+            weights = transactions.weights
+        min_support_count = max(min_support * total_transactions, 1)
+
+        self.logger.info(
+            f"Starting FP-Growth with {total_transactions} transactions ({len(transactions)} unique rows)"
+        )
+        self.logger.info(f"Min support: {min_support}, Min support count: {min_support_count}")
+
+        filtered_items = transactions.encode(filtered_products)
+        if item_tidlists is None:
+            tidlist_1 = self.create_tidlist_1itemset(transactions, filtered_items)
+        else:
+            tidlist_1 = self.restrict_tidlists(
+                item_tidlists, filtered_items, transaction_mask
+            )
+        supports_1 = {
+            item: _support_count(tids, weights) for item, tids in tidlist_1.items()
+        }
+        frequent_items = sorted(
+            (item for item, support in supports_1.items() if support >= min_support_count),
+            key=lambda item: (-supports_1[item], item),
+        )
+        self.logger.info(
+            f"Found {len(tidlist_1)} initial 1-itemsets, {len(frequent_items)} after support filtering"
+        )
+
+        start_time = time.time()
+        top_support = None
+        if top_k is not None:
+            # Threshold awal: support 2-itemset ke-k dari co-occurrence
+            top_support = TopKSupport(top_k)
+            n_tids = len(transactions) if transaction_mask is None else len(transaction_mask)
+            pair_supports = self.count_pair_supports(
+                {item: tidlist_1[item] for item in frequent_items},
+                weights,
+                min_support_count,
+                n_tids,
+            )
+            for support in pair_supports.values():
+                top_support.push(support)
+            threshold = top_support.threshold(min_support_count)
+            frequent_items = [item for item in frequent_items if supports_1[item] >= threshold]
+            self.logger.info(f"Top-{top_k} mode, initial support threshold {threshold}")
+
+        # Item di FP-tree berupa rank (0 = paling sering)
+        levels = defaultdict(dict)
+        if frequent_items:
+            ranks = {item: rank for rank, item in enumerate(frequent_items)}
+            tree = self.build_tree(
+                {item: tidlist_1[item] for item in frequent_items}, weights, ranks
             )
+            self.logger.info(f"FP-tree built with {len(tree.items) - 1} nodes")
+            self.mine_tree(tree, (), min_support_count, max_len, levels, top_support)
+
+        if top_support is not None:
+            # Buang itemset yang ditemukan sebelum threshold akhir tercapai
+            threshold = top_support.threshold(min_support_count)
+            levels = {
+                k: {key: support for key, support in level.items() if support >= threshold}
+                for k, level in levels.items()
+            }
+            self.logger.info(f"Top-{top_k} mode, final support threshold {threshold}")
 
-            if len(filtered_tidlist_k) == 0:
-                self.logger.info(
-                    f"No more {k}-itemsets found after support filtering. Stopping generation."
-                )
-                break
+        all_tidlists = {
+            "items": transactions.items,
+            "weights": weights,
+            "supports": {},
+            "diffsets": {},
+        }
+        for k in range(1, max([2] + [k for k, level in levels.items() if level]) + 1):
+            level = {
+                tuple(sorted(frequent_items[rank] for rank in itemset)): support
+                for itemset, support in levels.get(k, {}).items()
+            }
+            all_tidlists[f"tidlist_{k}"] = {}
+            for itemset in sorted(level):
+                key = itemset[0] if k == 1 else itemset
+                all_tidlists[f"tidlist_{k}"][key] = tidlist_1[key] if k == 1 else None
+                all_tidlists["supports"][key] = level[itemset]
+            if k > 1:
+                self.logger.info(f"Found {len(level)} frequent {k}-itemsets")
+
+        max_k = max([2] + [k for k, level in levels.items() if level])
+        elapsed = time.time() - start_time
+        self.logger.info(
+            f"FP-Growth completed up to {max_k}-itemset in {elapsed:.1f}s"
+        )
+        return all_tidlists, max_k
 
-            all_tidlists[f"tidlist_{k}"] = filtered_tidlist_k
-            tidlist_prev = filtered_tidlist_k
-            k += 1
 
-        self.logger.info(f"Itemset generation completed up to {k-1}-itemset")
+# Algoritma mining itemset yang bisa dipilih per analisis (/configure)
+MINING_ALGORITHMS = {"eclat": EclatAlgorithm, "fpgrowth": FPGrowthAlgorithm}
 
-        return all_tidlists, k - 1
+# Sumber transaksi analisis: file utama yang diupload atau riwayat basket store
+TRANSACTION_SOURCES = ("file", "basket_store")
 
 
 class RuleGenerator:
@@ -763,8 +3882,29 @@ class RuleGenerator:
         self.logger = logger
 
     def calculate_confidence_and_lift(self, all_tidlists, total_transactions):
-        """Menghitung confidence dan lift untuk setiap association rule"""
+        """Menghitung confidence dan lift untuk setiap association rule.
+
+        Itemset dalam all_tidlists berupa id item; SKU di-decode lewat
+        all_tidlists["items"] hanya saat menyusun rule. Support diambil dari
+        all_tidlists["supports"] jika ada (hasil dEclat bisa berupa diffset).
+
+        Untuk lattice ringkas (itemset_mode "closed"/"maximal") rule hanya
+        dibentuk dari itemset ringkas tersebut; support antecedent/consequent
+        yang tidak tersimpan dihitung dari tidlist 1-itemset
+        (EclatAlgorithm.subset_supports, paling banyak sekali per itemset
+        ringkas).
+        """
         self.logger.info("Calculating confidence and lift for association rules...")
+        items = all_tidlists.get("items")
+        weights = all_tidlists.get("weights")
+        supports = all_tidlists.get("supports")
+        condensed = all_tidlists.get("itemset_mode", "all") != "all"
+        subset_counts = {}
+
+        def names(item_ids):
+            if items is None:
+                return tuple(item_ids)
+            return tuple(items[item] for item in item_ids)
 
         # Gabungkan semua tidlists
         all_itemsets = {}
@@ -777,12 +3917,34 @@ class RuleGenerator:
 
         self.logger.info(f"Processing itemsets from 1 to {max_k}-itemset")
 
+        def support_count(itemset, condensed_itemset=None):
+            if supports is not None and itemset in supports:
+                return supports[itemset]
+            if itemset in all_itemsets:
+                return _support_count(all_itemsets[itemset], weights)
+            # Subset itemset ringkas yang tidak tersimpan
+            if condensed_itemset not in subset_counts:
+                subset_counts.clear()
+                subset_counts[condensed_itemset] = EclatAlgorithm.subset_supports(
+                    all_tidlists, condensed_itemset
+                )
+            table = subset_counts[condensed_itemset]
+            if table is not None:
+                bits, counts = table
+                return counts[sum(bits[item] for item in itemset)]
+            return _support_count(
+                EclatAlgorithm.intersect_tidlists(
+                    [all_tidlists["tidlist_1"][item] for item in itemset]
+                ),
+                weights,
+            )
+
         association_rules = []
 
         # Untuk setiap itemset dengan size >= 2, buat association rules
         for itemset, tid_list in all_itemsets.items():
             if isinstance(itemset, tuple) and len(itemset) >= 2:
-                itemset_support_count = len(tid_list)
+                itemset_support_count = support_count(itemset)
                 itemset_support = itemset_support_count / total_transactions
                 itemset_size = len(itemset)
 
@@ -799,8 +3961,10 @@ class RuleGenerator:
                         else:
                             antecedent_key = tuple(sorted(antecedent_items))
 
-                        if antecedent_key in all_itemsets:
-                            antecedent_support_count = len(all_itemsets[antecedent_key])
+                        if condensed or antecedent_key in all_itemsets:
+                            antecedent_support_count = support_count(
+                                antecedent_key, itemset
+                            )
                             antecedent_support = (
                                 antecedent_support_count / total_transactions
                             )
@@ -811,9 +3975,9 @@ class RuleGenerator:
                             else:
                                 consequent_key = tuple(sorted(consequent_items))
 
-                            if consequent_key in all_itemsets:
-                                consequent_support_count = len(
-                                    all_itemsets[consequent_key]
+                            if condensed or consequent_key in all_itemsets:
+                                consequent_support_count = support_count(
+                                    consequent_key, itemset
                                 )
                                 consequent_support = (
                                     consequent_support_count / total_transactions
@@ -840,22 +4004,17 @@ class RuleGenerator:
                                 if lift > 100:
                                     continue
 
-                                # Format antecedent dan consequent
-                                if isinstance(antecedent_key, tuple):
-                                    antecedent_str = " + ".join(antecedent_key)
-                                else:
-                                    antecedent_str = str(antecedent_key)
-
-                                if isinstance(consequent_key, tuple):
-                                    consequent_str = " + ".join(consequent_key)
-                                else:
-                                    consequent_str = str(consequent_key)
+                                # Format antecedent dan consequent (decode SKU)
+                                antecedent_names = names(sorted(antecedent_items))
+                                consequent_names = names(sorted(consequent_items))
+                                antecedent_str = " + ".join(map(str, antecedent_names))
+                                consequent_str = " + ".join(map(str, consequent_names))
 
                                 # TAMBAHAN: Buat itemset identifier untuk deduplikasi
                                 full_itemset = sorted(
                                     list(antecedent_items) + list(consequent_items)
                                 )
-                                itemset_id = tuple(full_itemset)
+                                itemset_id = names(full_itemset)
 
                                 association_rules.append(
                                     {
@@ -878,12 +4037,8 @@ class RuleGenerator:
                                         "Expected_Support": round(expected_support, 6),
                                         # TAMBAHAN: Field untuk deduplikasi
                                         "Itemset_ID": itemset_id,
-                                        "Antecedent_Items": tuple(
-                                            sorted(antecedent_items)
-                                        ),
-                                        "Consequent_Items": tuple(
-                                            sorted(consequent_items)
-                                        ),
+                                        "Antecedent_Items": antecedent_names,
+                                        "Consequent_Items": consequent_names,
                                     }
                                 )
 
@@ -994,60 +4149,58 @@ class RuleGenerator:
             percentage = (count / len(lifts)) * 100
             self.logger.info(f"{range_name}: {count} rules ({percentage:.1f}%)")
 
-    # Di dalam class RuleGenerator, method generate_association_rules
-
-
-# CARI BAGIAN INI (di bagian akhir method):
-
-
-def generate_association_rules(
-    self,
-    all_tidlists,
-    total_transactions,
-    min_confidence=0.2,
-    min_lift=1.0,
-    min_support=0.01,
-    deduplicate=True,
-):
-    """Generate association rules yang diperbaiki dengan filtering dan deduplikasi"""
-    # ... kode lainnya ...
-
-    # Filter berdasarkan min_support, min_confidence dan min_lift
-    filtered_rules = []
-    for rule in association_rules:
-        if (
-            rule["Itemset_Support"] >= min_support
-            and rule["Confidence"] >= min_confidence
-            and rule["Lift"] >= min_lift
-        ):
-            filtered_rules.append(rule)
-
-    # GANTI SORTING INI:
-    # filtered_rules.sort(key=lambda x: x["Lift"], reverse=True)
+    def generate_association_rules(
+        self,
+        all_tidlists,
+        total_transactions,
+        min_confidence=0.2,
+        min_lift=1.0,
+        min_support=0.01,
+        deduplicate=True,
+    ):
+        """Generate association rules yang diperbaiki dengan filtering dan deduplikasi"""
+        association_rules = self.calculate_confidence_and_lift(
+            all_tidlists, total_transactions
+        )
+        if deduplicate:
+            association_rules = self.deduplicate_rules(association_rules)
 
-    # DENGAN SORTING YANG LEBIH ROBUST:
-    filtered_rules.sort(
-        key=lambda x: (
-            x["Lift"],  # Primary: Lift tertinggi
-            x["Confidence"],  # Secondary: Confidence tertinggi
-            x["Itemset_Support"],  # Tertiary: Support tertinggi
-        ),
-        reverse=True,
-    )
+        # Filter berdasarkan min_support, min_confidence dan min_lift
+        filtered_rules = []
+        for rule in association_rules:
+            if (
+                rule["Itemset_Support"] >= min_support
+                and rule["Confidence"] >= min_confidence
+                and rule["Lift"] >= min_lift
+            ):
+                filtered_rules.append(rule)
+
+        # GANTI SORTING INI:
+        # filtered_rules.sort(key=lambda x: x["Lift"], reverse=True)
+
+        # DENGAN SORTING YANG LEBIH ROBUST:
+        filtered_rules.sort(
+            key=lambda x: (
+                x["Lift"],  # Primary: Lift tertinggi
+                x["Confidence"],  # Secondary: Confidence tertinggi
+                x["Itemset_Support"],  # Tertiary: Support tertinggi
+            ),
+            reverse=True,
+        )
 
-    self.logger.info(
-        f"After filtering: {len(filtered_rules)} rules passed the thresholds"
-    )
+        self.logger.info(
+            f"After filtering: {len(filtered_rules)} rules passed the thresholds"
+        )
 
-    # TAMBAHAN: Log top 5 rules untuk debugging
-    if filtered_rules:
-        self.logger.info("Top 5 rules by lift:")
-        for i, rule in enumerate(filtered_rules[:5]):
-            self.logger.info(
-                f"  {i+1}. {rule['Rule']} (Lift: {rule['Lift']}, Conf: {rule['Confidence']})"
-            )
+        # TAMBAHAN: Log top 5 rules untuk debugging
+        if filtered_rules:
+            self.logger.info("Top 5 rules by lift:")
+            for i, rule in enumerate(filtered_rules[:5]):
+                self.logger.info(
+                    f"  {i+1}. {rule['Rule']} (Lift: {rule['Lift']}, Conf: {rule['Confidence']})"
+                )
 
-    return filtered_rules
+        return filtered_rules
 
 
 class EnhancedRuleValidator:
@@ -1158,50 +4311,42 @@ class EnhancedRuleValidator:
             # Group historical data by Order ID untuk analisis transaksi
             order_col = df_historical.columns[0]  # Biasanya Order ID di kolom pertama
 
-            # Buat struktur transaksi dari data historis
-            historical_transactions = {}
-            for _, row in df_historical.iterrows():
-                order_id = str(row[order_col])
-                product_sku = str(row[seller_sku_col]).strip()
-
-                if (
-                    order_id
-                    and product_sku
-                    and product_sku.lower() not in ["nan", "none", ""]
-                ):
-                    if order_id not in historical_transactions:
-                        historical_transactions[order_id] = set()
-                    historical_transactions[order_id].add(product_sku)
-
-            # Convert ke list of sets untuk analisis
-            historical_transaction_sets = list(historical_transactions.values())
+            # Transaksi historis terenkode; kolom SKU kosong/"nan"/"none" diabaikan
+            orders = df_historical[order_col].astype(str)
+            products = df_historical[seller_sku_col].astype(str).str.strip()
+            keep = (
+                (orders != "")
+                & (products != "")
+                & ~products.str.lower().isin(["nan", "none"])
+            ).to_numpy()
+            historical = EncodedTransactions.from_lines(orders, products, keep=keep)
+            total_historical_transactions = len(historical)
+            historical_ids = historical.item_ids
+            historical_tidlists = historical.item_tidlists()
+
+            unsold_ids = [historical_ids.get(product) for product in unsold_products]
 
             # Validasi setiap rule 2 produk dengan unsold products
             enhanced_rules = []
 
             for rule in rules_2_product:
-                # Extract produk dari rule 2 produk
-                rule_products = set()
-
-                # Parse antecedent dan consequent
-                antecedent_products = rule["Antecedent"].split(" + ")
-                consequent_products = rule["Consequent"].split(" + ")
+                # Transaksi historis yang memuat kedua produk rule
+                rule_ids = [historical_ids.get(product) for product in rule["Itemset_ID"]]
+                if None in rule_ids:
+                    continue
+                rule_tids = EclatAlgorithm.intersect_tidlists(
+                    [historical_tidlists[item] for item in rule_ids]
+                )
+                if len(rule_tids) == 0:
+                    continue
 
-                rule_products.update(antecedent_products)
-                rule_products.update(consequent_products)
+                # Jumlah kemunculan setiap produk dalam transaksi tersebut sekaligus
+                co_counts = historical.item_counts(rule_tids)
 
                 # Untuk setiap produk tidak terjual, cek kombinasi 3 produk
-                for unsold_product in unsold_products:
-                    # Kombinasi 3 produk: 2 dari rule + 1 unsold
-                    combination_3_products = rule_products.union({unsold_product})
-
+                for unsold_product, unsold_id in zip(unsold_products, unsold_ids):
                     # Hitung berapa kali kombinasi ini muncul dalam data historis
-                    occurrence_count = 0
-
-                    for transaction_set in historical_transaction_sets:
-                        # Cek apakah semua 3 produk ada dalam transaksi ini
-                        if combination_3_products.issubset(transaction_set):
-                            occurrence_count += 1
+                    occurrence_count = 0 if unsold_id is None else int(co_counts[unsold_id])
 
                     # Jika kombinasi pernah muncul, buat enhanced rule
                     if occurrence_count > 0:
@@ -1221,135 +4366,713 @@ class EnhancedRuleValidator:
                         enhanced_rule["Enhanced_Products_Count"] = 3
 
                         # Estimasi metrics untuk enhanced rule
-                        total_historical_transactions = len(historical_transaction_sets)
                         enhanced_support = (
                             occurrence_count / total_historical_transactions
                         )
 
-                        enhanced_rule["Enhanced_Support"] = enhanced_support
-                        enhanced_rule["Enhanced_Support_Count"] = occurrence_count
-                        enhanced_rule["Historical_Total_Transactions"] = (
-                            total_historical_transactions
-                        )
+                        enhanced_rule["Enhanced_Support"] = enhanced_support
+                        enhanced_rule["Enhanced_Support_Count"] = occurrence_count
+                        enhanced_rule["Historical_Total_Transactions"] = (
+                            total_historical_transactions
+                        )
+
+                        enhanced_rules.append(enhanced_rule)
+
+            # TAMBAHAN: Deduplikasi enhanced rules
+            enhanced_rules = self.deduplicate_enhanced_rules(enhanced_rules)
+
+            # Sort enhanced rules berdasarkan historical occurrence count
+            enhanced_rules.sort(
+                key=lambda x: x["Historical_Occurrence_Count"], reverse=True
+            )
+
+            self.logger.info(
+                f"Enhanced rules with historical validation: {len(enhanced_rules)}"
+            )
+
+            return enhanced_rules
+
+        except Exception as e:
+            import traceback
+
+            self.logger.error(f"Error in historical validation: {str(e)}")
+            self.logger.error(traceback.format_exc())
+            return []
+
+    def generate_enhanced_association_rules(
+        self,
+        all_tidlists,
+        total_transactions,
+        unsold_products,
+        historical_filepath,
+        min_confidence=0.2,
+        min_lift=1.0,
+        min_support=0.01,
+    ):
+        """
+        Generate enhanced association rules dengan alur yang benar:
+        1. Generate 2-product rules dari data potongan (dengan deduplikasi)
+        2. Tambahkan 1 unsold product
+        3. Validasi kombinasi dengan data pesanan maret (dengan deduplikasi)
+        """
+        self.logger.info("=== GENERATING ENHANCED ASSOCIATION RULES ===")
+
+        # Step 1: Generate rules dasar dari data potongan (dengan deduplikasi)
+        rule_generator = RuleGenerator()
+        base_rules = rule_generator.calculate_confidence_and_lift(
+            all_tidlists, total_transactions
+        )
+
+        # Deduplikasi base rules
+        base_rules = rule_generator.deduplicate_rules(base_rules)
+
+        # Filter hanya rules 2 produk dan yang memenuhi kriteria
+        two_product_rules = []
+        for rule in base_rules:
+            # Hitung total produk dalam rule
+            antecedent_products = rule["Antecedent"].split(" + ")
+            consequent_products = rule["Consequent"].split(" + ")
+            total_products = len(antecedent_products) + len(consequent_products)
+
+            if (
+                total_products == 2
+                and rule["Itemset_Support"] >= min_support
+                and rule["Confidence"] >= min_confidence
+                and rule["Lift"] >= min_lift
+            ):
+                two_product_rules.append(rule)
+
+        self.logger.info(
+            f"Found {len(two_product_rules)} unique rules with exactly 2 products from data potongan"
+        )
+
+        if not two_product_rules:
+            self.logger.warning(
+                "No 2-product rules found. Cannot create enhanced rules."
+            )
+            return {"original_rules": [], "enhanced_rules": [], "total_enhanced": 0}
+
+        if not unsold_products:
+            self.logger.warning(
+                "No unsold products available. Returning 2-product rules without enhancement."
+            )
+            return {
+                "original_rules": two_product_rules,
+                "enhanced_rules": two_product_rules,
+                "total_enhanced": len(two_product_rules),
+            }
+
+        # Step 2: Validasi dengan data historis (dengan deduplikasi enhanced)
+        enhanced_rules = self.validate_enhanced_rules_with_historical_data(
+            two_product_rules, unsold_products, historical_filepath
+        )
+
+        return {
+            "original_rules": two_product_rules,
+            "enhanced_rules": enhanced_rules,
+            "total_enhanced": len(enhanced_rules),
+            "historical_validation": True,
+        }
+
+
+# State worker process pool ECLAT per class (diisi sekali oleh initializer)
+_eclat_worker_state = {}
+
+
+def _init_eclat_worker(shared, settings):
+    """Initializer worker: attach array shared memory dan bangun member 1-item"""
+    segments, arrays = [], {}
+    for name, (segment_name, dtype, length) in shared.items():
+        segment = shared_memory.SharedMemory(name=segment_name)
+        segments.append(segment)
+        arrays[name] = np.ndarray((length,), dtype=np.dtype(dtype), buffer=segment.buf)
+
+    engine = ECLAT_ENGINES[settings["engine"]](settings["n_transactions"])
+    tids, offsets = arrays["tids"], arrays["offsets"]
+    members = [
+        (int(item), engine.encode(tids[offsets[i] : offsets[i + 1]]), int(support))
+        for i, (item, support) in enumerate(zip(arrays["items"], arrays["supports"]))
+    ]
+    _eclat_worker_state.update(
+        segments=segments,
+        members=members,
+        weights=arrays.get("weights"),
+        pair_supports=PairSupportTable(
+            arrays["pair_codes"], arrays["pair_supports"], settings["pair_stride"]
+        ),
+        engine=engine,
+        settings=settings,
+    )
+
+
+def _mine_eclat_class(rank, partner_ranks):
+    """Worker: DFS satu class 1-item, return level parsial {k: {itemset: entry}}"""
+    state = _eclat_worker_state
+    settings = state["settings"]
+    members = state["members"]
+    # Level 2 dilapis di atas semua pasangan frekuen agar pruning 3-itemset
+    # tetap lengkap; yang dikembalikan hanya entry class ini
+    levels = {2: ChainMap({}, state["pair_supports"])}
+    EclatAlgorithm().mine_pair_class(
+        members[rank],
+        [members[j] for j in partner_ranks],
+        state["pair_supports"],
+        state["engine"],
+        state["weights"],
+        settings["min_support_count"],
+        settings["max_len"],
+        levels,
+        settings["diffset_support"],
+        prune_root=False,
+    )
+    levels[2] = levels[2].maps[0]
+    return levels
+
+
+# State worker process pool analisis tren (diisi sekali oleh initializer)
+_trend_worker_state = {}
+
+
+def _init_trend_worker(store, collapse=True):
+    """Initializer worker: simpan TransactionStore sekali per proses"""
+    _trend_worker_state["store"] = store
+    _trend_worker_state["collapse"] = collapse
+
+
+def _mine_trend_window(
+    start_day, end_day, min_support, min_confidence, min_lift, min_support_count
+):
+    """Worker: mining satu window tanggal.
+
+    Return (jumlah transaksi, {itemset: metrik rule terbaik}) untuk rules yang
+    lolos threshold.
+    """
+    store = _trend_worker_state["store"]
+    window_mask = store.date_mask(start_day, end_day)
+    window_transactions, _, _, filtered_products = store.select(
+        window_mask, min_support_count
+    )
+    if not window_transactions:
+        return 0, {}
+
+    item_tidlists, row_mask, weights = store.mining_selection(
+        start_day, end_day, _trend_worker_state["collapse"]
+    )
+    all_tidlists, _ = EclatAlgorithm().run_eclat(
+        window_transactions,
+        filtered_products,
+        min_support,
+        item_tidlists=item_tidlists,
+        transaction_mask=row_mask,
+        weights=weights,
+        # Paralelisme sudah per window; jangan membuat pool di dalam worker
+        workers=1,
+    )
+    rule_generator = RuleGenerator()
+    rules = rule_generator.deduplicate_rules(
+        rule_generator.calculate_confidence_and_lift(
+            all_tidlists, len(window_transactions)
+        )
+    )
+
+    window_rules = {}
+    for rule in rules:
+        if (
+            rule["Itemset_Support"] >= min_support
+            and rule["Confidence"] >= min_confidence
+            and rule["Lift"] >= min_lift
+        ):
+            window_rules[rule["Itemset_ID"]] = {
+                "rule": rule["Rule"],
+                "support": rule["Itemset_Support"],
+                "confidence": rule["Confidence"],
+                "lift": rule["Lift"],
+            }
+    return len(window_transactions), window_rules
+
+
+class BundlingRecommendationSystem:
+    """Main class untuk sistem rekomendasi bundling"""
+
+    def __init__(self, cache_max_bytes=None):
+        self.file_handler = FileHandler()
+        self.date_filter = DateFilter()
+        self.product_analyzer = ProductAnalyzer()
+        self.data_processor = DataProcessor()
+        self.eclat_algorithm = EclatAlgorithm()
+        self.mining_algorithms = {
+            name: algorithm() for name, algorithm in MINING_ALGORITHMS.items()
+        }
+        self.rule_generator = RuleGenerator()
+        self.enhanced_validator = EnhancedRuleValidator()
+        self.logger = logger
+
+        # Cache frame, transaksi dan lattice antar request (key: hash file + parameter)
+        if cache_max_bytes is None:
+            cache_max_bytes = app.config["ANALYSIS_CACHE_MAX_BYTES"]
+        self.cache = MemoryLRUCache(cache_max_bytes)
+        self.catalog = CatalogStore(app.config["CATALOG_DB_PATH"])
+
+    def load_frame(self, filepath, usecols=None):
+        """Baca file lewat cache in-process.
+
+        Yang dikembalikan adalah salinan frame di cache, jadi pemanggil boleh
+        mengubahnya tanpa merusak cache yang dipakai bersama request lain.
+        Kolom teks berupa Categorical, jadi yang tersalin hanya array kodenya;
+        daftar kategori tetap dipakai bersama.
+        """
+        try:
+            digest = ingest_cache.file_digest(filepath)
+        except OSError as e:
+            self.logger.error(f"Error reading file {filepath}: {str(e)}")
+            return None
+
+        key = ("frame", digest, tuple(sorted(set(usecols), key=str)) if usecols else None)
+        df = self.cache.get_or_compute(
+            key, lambda: self.file_handler.read_file(filepath, usecols=usecols)
+        )
+        return None if df is None else df.copy()
+
+    def analyze_products(self, transaction_filepath, product_filepath):
+        """Analisis produk terjual/tidak terjual lewat katalog persisten.
+
+        Master hanya diparse jika digest isinya berbeda dari master aktif di
+        katalog, lalu diterapkan sebagai diff. SKU transaksi hanya dihitung
+        sekali per file transaksi.
+        """
+        try:
+            self.logger.info("=== STARTING PRODUCT ANALYSIS ===")
+            analyzer = self.product_analyzer
+
+            product_col = analyzer.transaction_product_col
+            source = f"{ingest_cache.file_digest(transaction_filepath)}:{product_col}"
+            if not self.catalog.has_sales(source):
+                df_transaction = self.load_frame(transaction_filepath, usecols=[product_col])
+                if df_transaction is None:
+                    return None, "Error reading main file"
+                self.catalog.record_sales(
+                    source, analyzer.count_transaction_skus(df_transaction)
+                )
+
+            parsed = {}
+
+            def load_master():
+                if "master" not in parsed:
+                    df_product = self.load_frame(product_filepath)
+                    parsed["master"] = (
+                        (None, None)
+                        if df_product is None
+                        else analyzer.normalize_master(df_product)
+                    )
+                return parsed["master"]
+
+            # Parse master di luar lock; snapshot hanya memanggil ulang
+            # load_master (memo) jika master aktif berubah di antaranya
+            master_digest = ingest_cache.file_digest(product_filepath)
+            state = self.catalog.master_state()
+            if state is None or state["master_digest"] != master_digest:
+                product_mapping, _ = load_master()
+                if product_mapping is None:
+                    return None, "Error reading product file"
+                if not product_mapping:
+                    return (
+                        None,
+                        "Tidak ada data produk yang valid ditemukan dalam file master data.",
+                    )
+
+            snapshot = self.catalog.snapshot(master_digest, source, load_master)
+            if snapshot is None:
+                return None, "Error reading product file"
+            catalog, sku_col, sales = snapshot
+            return analyzer.build_sales_result(catalog, sales, sku_col)
+
+        except Exception as e:
+            import traceback
+
+            error_msg = f"Error in product analysis: {str(e)}"
+            self.logger.error(error_msg)
+            self.logger.error(traceback.format_exc())
+            return None, error_msg
+
+    def summarize_trend(self, windows, window_results):
+        """Susun time series support/lift dan stabilitas rule dari hasil per window"""
+        window_info = []
+        series = {}
+        previous = None
+
+        for position, ((start, end), (transaction_count, rules)) in enumerate(
+            zip(windows, window_results)
+        ):
+            current = set(rules)
+            union = current | previous if previous is not None else set()
+            window_info.append(
+                {
+                    "start": str(start),
+                    "end": str(end),
+                    "transactions": transaction_count,
+                    "rules_count": len(rules),
+                    # Kemiripan set rule dengan window sebelumnya
+                    "jaccard_with_previous": (
+                        round(len(current & previous) / len(union), 4) if union else None
+                    ),
+                }
+            )
+            for itemset, metrics in rules.items():
+                series.setdefault(itemset, [None] * len(windows))[position] = metrics
+            previous = current
+
+        trends = []
+        for itemset, points in series.items():
+            present = [point for point in points if point is not None]
+            trends.append(
+                {
+                    "itemset": " + ".join(itemset),
+                    "rule": present[-1]["rule"],
+                    "windows_present": len(present),
+                    "stability": round(len(present) / len(windows), 4),
+                    "mean_lift": round(float(np.mean([p["lift"] for p in present])), 4),
+                    "support": [p["support"] if p else None for p in points],
+                    "confidence": [p["confidence"] if p else None for p in points],
+                    "lift": [p["lift"] if p else None for p in points],
+                }
+            )
+        trends.sort(key=lambda t: (t["stability"], t["mean_lift"]), reverse=True)
+
+        return {"windows": window_info, "trends": trends}
+
+    def run_trend_analysis(
+        self,
+        main_filepath,
+        window_days=7,
+        step_days=1,
+        order_col="Order ID",
+        product_col="Seller SKU",
+        sku_id_col="SKU ID",
+        date_col="Created Time",
+        min_support=0.01,
+        min_confidence=0.2,
+        min_lift=1.0,
+        min_support_count=2,
+        workers=None,
+    ):
+        """
+        Analisis tren: mining setiap rolling window tanggal secara paralel
+        """
+        try:
+            self.logger.info("=== STARTING TREND ANALYSIS ===")
+            if window_days < 1 or step_days < 1:
+                return None, "Ukuran window dan step minimal 1 hari"
 
-                        enhanced_rules.append(enhanced_rule)
+            date_index = self.get_date_index(main_filepath, date_col, order_col)
+            if date_index is None or len(date_index.days) == 0:
+                return None, "Tidak ada tanggal valid dalam data"
 
-            # TAMBAHAN: Deduplikasi enhanced rules
-            enhanced_rules = self.deduplicate_enhanced_rules(enhanced_rules)
+            df_main = self.load_frame(
+                main_filepath, usecols=[order_col, product_col, sku_id_col, date_col]
+            )
+            if df_main is None:
+                return None, "Error reading main file"
 
-            # Sort enhanced rules berdasarkan historical occurrence count
-            enhanced_rules.sort(
-                key=lambda x: x["Historical_Occurrence_Count"], reverse=True
+            # Basket bertanggal dibangun sekali per file, dipakai semua window
+            store = self.get_transaction_store(
+                df_main, order_col, product_col, sku_id_col, date_col
             )
 
+            window = np.timedelta64(window_days - 1, "D")
+            step = np.timedelta64(step_days, "D")
+            first_day, last_day = date_index.days[0], date_index.days[-1]
+            windows = []
+            start = first_day
+            while start + window <= last_day:
+                if date_index.count_range(start, start + window)[0] > 0:
+                    windows.append((start, start + window))
+                start += step
+            if not windows:
+                windows = [(first_day, last_day)]
+
             self.logger.info(
-                f"Enhanced rules with historical validation: {len(enhanced_rules)}"
+                f"Mining {len(windows)} windows ({window_days} hari, step {step_days} hari)"
             )
+            start_time = time.time()
+            window_args = [
+                (start, end, min_support, min_confidence, min_lift, min_support_count)
+                for start, end in windows
+            ]
+            collapse = app.config["COLLAPSE_DUPLICATE_BASKETS"]
+            # Bangun tidlist sekali di sini agar ikut terkirim ke worker
+            store.mining_selection(first_day, last_day, collapse)
+            workers = workers or app.config["MINING_WORKERS"]
+            if workers > 1 and len(windows) > 1:
+                with ProcessPoolExecutor(
+                    max_workers=min(workers, len(windows)),
+                    initializer=_init_trend_worker,
+                    initargs=(store, collapse),
+                ) as pool:
+                    window_results = list(pool.map(_mine_trend_window, *zip(*window_args)))
+            else:
+                _init_trend_worker(store, collapse)
+                window_results = [_mine_trend_window(*args) for args in window_args]
 
-            return enhanced_rules
+            result = self.summarize_trend(windows, window_results)
+            result["window_days"] = window_days
+            result["step_days"] = step_days
+            result["process_time"] = time.time() - start_time
+            return result, None
 
         except Exception as e:
             import traceback
 
-            self.logger.error(f"Error in historical validation: {str(e)}")
+            error_msg = f"Error in trend analysis: {str(e)}"
+            self.logger.error(error_msg)
             self.logger.error(traceback.format_exc())
-            return []
+            return None, error_msg
 
-    def generate_enhanced_association_rules(
-        self,
-        all_tidlists,
-        total_transactions,
-        unsold_products,
-        historical_filepath,
-        min_confidence=0.2,
-        min_lift=1.0,
-        min_support=0.01,
-    ):
-        """
-        Generate enhanced association rules dengan alur yang benar:
-        1. Generate 2-product rules dari data potongan (dengan deduplikasi)
-        2. Tambahkan 1 unsold product
-        3. Validasi kombinasi dengan data pesanan maret (dengan deduplikasi)
-        """
-        self.logger.info("=== GENERATING ENHANCED ASSOCIATION RULES ===")
+    def get_date_index(self, filepath, date_col, order_col="Order ID"):
+        """Indeks tanggal per file: dari memori, dari disk, atau dibangun sekali"""
+        try:
+            digest = ingest_cache.file_digest(filepath)
+        except OSError as e:
+            self.logger.error(f"Error reading file {filepath}: {str(e)}")
+            return None
 
-        # Step 1: Generate rules dasar dari data potongan (dengan deduplikasi)
-        rule_generator = RuleGenerator()
-        base_rules = rule_generator.calculate_confidence_and_lift(
-            all_tidlists, total_transactions
-        )
+        key = ("date_index", digest, date_col, order_col)
+        date_index = self.cache.get(key)
+        if date_index is not None:
+            return date_index
 
-        # Deduplikasi base rules
-        base_rules = rule_generator.deduplicate_rules(base_rules)
+        index_path = ingest_cache.artifact_path(digest, f"date_index:{date_col}:{order_col}")
+        if os.path.exists(index_path):
+            try:
+                date_index = DateIndex.load(index_path)
+            except Exception as e:
+                self.logger.warning(f"Date index {index_path} tidak bisa dibaca: {str(e)}")
 
-        # Filter hanya rules 2 produk dan yang memenuhi kriteria
-        two_product_rules = []
-        for rule in base_rules:
-            # Hitung total produk dalam rule
-            antecedent_products = rule["Antecedent"].split(" + ")
-            consequent_products = rule["Consequent"].split(" + ")
-            total_products = len(antecedent_products) + len(consequent_products)
+        if date_index is None:
+            df = self.load_frame(
+                filepath, usecols=DataProcessor.TRANSACTION_COLUMNS + [date_col]
+            )
+            if df is None or date_col not in df.columns:
+                return None
+            date_index = DateIndex.build(df, date_col, order_col, self.date_filter)
+            date_index.save(index_path)
 
-            if (
-                total_products == 2
-                and rule["Itemset_Support"] >= min_support
-                and rule["Confidence"] >= min_confidence
-                and rule["Lift"] >= min_lift
-            ):
-                two_product_rules.append(rule)
+        self.cache.put(key, date_index)
+        return date_index
 
-        self.logger.info(
-            f"Found {len(two_product_rules)} unique rules with exactly 2 products from data potongan"
+    def get_transaction_store(
+        self, df_main, order_col, product_col, sku_id_col, date_col
+    ):
+        """TransactionStore per file lewat cache (dibangun sekali per kolom)"""
+
+        def compute():
+            return TransactionStore.build(
+                df_main, order_col, product_col, sku_id_col, date_col, self.date_filter
+            )
+
+        digest = df_main.attrs.get("content_hash")
+        if digest is None:
+            return compute()
+        key = ("transaction_store", digest, order_col, product_col, sku_id_col, date_col)
+        return self.cache.get_or_compute(key, compute)
+
+    def get_basket_transaction_store(self):
+        """TransactionStore riwayat basket store lewat cache.
+
+        Return (key, store); key memuat jumlah order tersimpan sehingga append
+        baru otomatis menghasilkan key baru. store None jika basket store
+        masih kosong.
+        """
+        basket_store = self.data_processor.basket_store
+        n_orders = basket_store.stats()["total_orders"]
+        key = ("basket_store", basket_store.db_path, n_orders)
+        if n_orders == 0:
+            return key, None
+        return key, self.cache.get_or_compute(
+            key, lambda: basket_store.transaction_store(n_orders)
         )
 
-        if not two_product_rules:
-            self.logger.warning(
-                "No 2-product rules found. Cannot create enhanced rules."
+    def load_transactions(
+        self,
+        df_main,
+        order_col,
+        product_col,
+        sku_id_col,
+        date_col,
+        start_date,
+        end_date,
+        min_support_count,
+        source="file",
+    ):
+        """Siapkan transaksi (dengan filter tanggal jika ada) lewat cache.
+
+        Return (cache_key, hasil prepare_transactions, selection); cache_key
+        None jika frame tidak berasal dari file yang dikenal. Untuk rentang
+        tanggal pada file yang dikenal, transaksi diambil dari TransactionStore
+        dan selection berisi (item_tidlists, transaction_mask, weights) untuk
+        ECLAT. Dengan source="basket_store", transaksi diambil dari seluruh
+        riwayat basket store (hasil /ingest_orders), bukan dari df_main.
+        """
+        if source not in TRANSACTION_SOURCES:
+            raise ValueError(f"Sumber transaksi tidak dikenal: {source}")
+        digest = df_main.attrs.get("content_hash")
+        date_range = bool(start_date and end_date and date_col)
+        from_store = source == "basket_store"
+
+        if from_store or (date_range and digest is not None and date_col in df_main.columns):
+            start_dt = end_dt = None
+            if date_range:
+                start_dt = self.date_filter.parse_date_string(start_date)
+                end_dt = self.date_filter.parse_date_string(end_date)
+                if start_dt is None or end_dt is None:
+                    return None, (None, "Format tanggal tidak valid", 0, 0, 0, {}), None
+
+            if from_store:
+                store_key, store = self.get_basket_transaction_store()
+                if store is None:
+                    return None, (None, "Basket store masih kosong", 0, 0, 0, {}), None
+            else:
+                store_key = (digest, order_col, product_col, sku_id_col, date_col)
+                store = self.get_transaction_store(
+                    df_main, order_col, product_col, sku_id_col, date_col
+                )
+            transaction_mask = store.date_mask(start_dt, end_dt)
+            if not transaction_mask.any():
+                return (
+                    None,
+                    (None, "Tidak ada data dalam rentang tanggal yang dipilih", 0, 0, 0, {}),
+                    None,
+                )
+
+            key = ("transactions",) + store_key + (
+                start_dt and start_dt.date(),
+                end_dt and end_dt.date(),
+                min_support_count,
             )
-            return {"original_rules": [], "enhanced_rules": [], "total_enhanced": 0}
 
-        if not unsold_products:
-            self.logger.warning(
-                "No unsold products available. Returning 2-product rules without enhancement."
+            def select():
+                transactions, single_count, total_orders, filtered_products = (
+                    store.select(transaction_mask, min_support_count)
+                )
+                self.logger.info(
+                    f"Transactions ({source}) {start_date or '-'} - {end_date or '-'}: {total_orders} orders, "
+                    f"{len(transactions)} transactions"
+                )
+                return (
+                    transactions,
+                    None,
+                    single_count,
+                    total_orders,
+                    len(transactions),
+                    filtered_products,
+                )
+
+            prepared = self.cache.get_or_compute(key, select)
+            selection = store.mining_selection(
+                start_dt, end_dt, app.config["COLLAPSE_DUPLICATE_BASKETS"]
             )
-            return {
-                "original_rules": two_product_rules,
-                "enhanced_rules": two_product_rules,
-                "total_enhanced": len(two_product_rules),
-            }
+            return key, prepared, selection
 
-        # Step 2: Validasi dengan data historis (dengan deduplikasi enhanced)
-        enhanced_rules = self.validate_enhanced_rules_with_historical_data(
-            two_product_rules, unsold_products, historical_filepath
-        )
+        def compute():
+            if date_range:
+                return self.data_processor.prepare_transactions_with_date_filter(
+                    df_main,
+                    order_col,
+                    product_col,
+                    sku_id_col,
+                    date_col,
+                    start_date,
+                    end_date,
+                    min_support_count,
+                )
+            return self.data_processor.prepare_transactions(
+                df_main, order_col, product_col, sku_id_col, min_support_count
+            )
 
-        return {
-            "original_rules": two_product_rules,
-            "enhanced_rules": enhanced_rules,
-            "total_enhanced": len(enhanced_rules),
-            "historical_validation": True,
-        }
+        if digest is None:
+            return None, compute(), None
+
+        if not date_range:
+            start_date = end_date = None
+        key = (
+            "transactions",
+            digest,
+            order_col,
+            product_col,
+            sku_id_col,
+            date_col,
+            start_date,
+            end_date,
+            min_support_count,
+        )
+        prepared = self.cache.get_or_compute(
+            key, compute, cache_if=lambda result: result[1] is None
+        )
+        return key, prepared, None
 
+    def mine_itemsets(
+        self,
+        transactions_key,
+        transactions,
+        filtered_products,
+        min_support,
+        selection=None,
+        algorithm=None,
+        top_k=None,
+    ):
+        """Jalankan mining itemset lewat cache (key: key transaksi + min_support).
 
-class BundlingRecommendationSystem:
-    """Main class untuk sistem rekomendasi bundling"""
+        algorithm memilih MINING_ALGORITHMS ("eclat" atau "fpgrowth", default
+        MINING_ALGORITHM). Dengan top_k, yang ditambang adalah top_k itemset
+        paling sering (min_support menjadi batas bawah). Dengan
+        COLLAPSE_DUPLICATE_BASKETS, basket identik digabung menjadi satu baris
+        berbobot sebelum mining; hasil support tetap sama.
+        """
+        collapse = app.config["COLLAPSE_DUPLICATE_BASKETS"]
+        algorithm = algorithm or app.config["MINING_ALGORITHM"]
+        # Lattice ringkas (closed/maximal) tidak berlaku untuk mode top-k
+        itemset_mode = "all" if top_k else app.config["ECLAT_ITEMSET_MODE"]
+        if algorithm not in self.mining_algorithms:
+            raise ValueError(f"Algoritma mining tidak dikenal: {algorithm}")
+        miner = self.mining_algorithms[algorithm]
+
+        def compute():
+            if selection is not None:
+                item_tidlists, transaction_mask, weights = selection
+                return miner.run_eclat(
+                    transactions,
+                    filtered_products,
+                    min_support,
+                    item_tidlists=item_tidlists,
+                    transaction_mask=transaction_mask,
+                    weights=weights,
+                    top_k=top_k,
+                    itemset_mode=itemset_mode,
+                )
+            mined = transactions.collapse()[0] if collapse else transactions
+            return miner.run_eclat(
+                mined, filtered_products, min_support, top_k=top_k, itemset_mode=itemset_mode
+            )
 
-    def __init__(self):
-        self.file_handler = FileHandler()
-        self.date_filter = DateFilter()
-        self.product_analyzer = ProductAnalyzer()
-        self.data_processor = DataProcessor()
-        self.eclat_algorithm = EclatAlgorithm()
-        self.rule_generator = RuleGenerator()
-        self.enhanced_validator = EnhancedRuleValidator()
-        self.logger = logger
+        if transactions_key is None:
+            return compute()
+        key = ("lattice",) + transactions_key[1:] + (
+            min_support,
+            collapse,
+            algorithm,
+            top_k,
+            itemset_mode,
+        )
+        return self.cache.get_or_compute(key, compute)
 
     def get_top_products(self, transactions, top_n=10):
         """Mendapatkan top N produk berdasarkan frekuensi"""
-        # Flatten list of transactions
-        all_products = [item for sublist in transactions for item in sublist]
-        # Count frequency
-        product_counts = pd.Series(all_products).value_counts()
+        # Hitung per id item, urut kemunculan pertama (sama seperti value_counts)
+        counts = transactions.item_counts()
+        _, first_seen = np.unique(transactions.indices, return_index=True)
+        seen_items = transactions.indices[np.sort(first_seen)]
+        product_counts = pd.Series(
+            counts[seen_items], index=transactions.items[seen_items]
+        ).sort_values(ascending=False)
         # Get top N
         top_products = product_counts.head(top_n)
         return top_products
@@ -1385,15 +5108,25 @@ class BundlingRecommendationSystem:
         min_confidence=0.2,
         min_lift=1.0,
         min_support_count=2,
+        algorithm=None,
+        top_k=None,
+        transaction_source="file",
     ):
         """
         Menjalankan analisis lengkap sistem rekomendasi bundling
+
+        Dengan top_k, min_support diabaikan: yang ditambang adalah top_k
+        itemset (>= 2 produk) paling sering. transaction_source="basket_store"
+        menambang seluruh riwayat order di basket store alih-alih file utama.
         """
         try:
             self.logger.info("=== STARTING COMPLETE BUNDLING ANALYSIS ===")
 
             # Step 1: Baca file utama
-            df_main = self.file_handler.read_file(main_filepath)
+            main_columns = [order_col, product_col, sku_id_col]
+            if date_col:
+                main_columns.append(date_col)
+            df_main = self.load_frame(main_filepath, usecols=main_columns)
             if df_main is None:
                 return None, "Error reading main file"
 
@@ -1402,54 +5135,50 @@ class BundlingRecommendationSystem:
             unsold_products = []
 
             if product_filepath:
-                df_product = self.file_handler.read_file(product_filepath)
-                if df_product is not None:
-                    product_analysis, error = (
-                        self.product_analyzer.analyze_product_sales(df_main, df_product)
+                product_analysis, error = self.analyze_products(
+                    main_filepath, product_filepath
+                )
+                if product_analysis:
+                    unsold_products = self.prepare_unsold_products_list(
+                        product_analysis
                     )
-                    if product_analysis:
-                        unsold_products = self.prepare_unsold_products_list(
-                            product_analysis
-                        )
 
             # Step 3: Preprocess data transaksi
-            if start_date and end_date and date_col:
-                (
-                    transactions,
-                    error,
-                    filtered_count,
-                    total_count,
-                    total_combined,
-                    filtered_products,
-                ) = self.data_processor.prepare_transactions_with_date_filter(
-                    df_main,
-                    order_col,
-                    product_col,
-                    sku_id_col,
-                    date_col,
-                    start_date,
-                    end_date,
-                    min_support_count,
-                )
-            else:
-                (
-                    transactions,
-                    error,
-                    filtered_count,
-                    total_count,
-                    total_combined,
-                    filtered_products,
-                ) = self.data_processor.prepare_transactions(
-                    df_main, order_col, product_col, sku_id_col, min_support_count
-                )
+            transactions_key, prepared, selection = self.load_transactions(
+                df_main,
+                order_col,
+                product_col,
+                sku_id_col,
+                date_col,
+                start_date,
+                end_date,
+                min_support_count,
+                transaction_source,
+            )
+            (
+                transactions,
+                error,
+                filtered_count,
+                total_count,
+                total_combined,
+                filtered_products,
+            ) = prepared
 
             if error:
                 return None, error
 
-            # Step 4: Jalankan ECLAT
+            # Step 4: Jalankan mining itemset (ECLAT / FP-Growth)
+            if top_k:
+                min_support = 0
             start_time = time.time()
-            all_tidlists, max_itemset_level = self.eclat_algorithm.run_eclat(
-                transactions, filtered_products, min_support
+            all_tidlists, max_itemset_level = self.mine_itemsets(
+                transactions_key,
+                transactions,
+                filtered_products,
+                min_support,
+                selection,
+                algorithm,
+                top_k,
             )
 
             if not all_tidlists:
@@ -1621,19 +5350,13 @@ def upload_triple_files():
                     session["transaction_filepath"] = main_filepath
                     session["transaction_filename"] = main_filename
 
-                    # Validasi struktur file utama
-                    df_main = bundling_system.file_handler.read_file(main_filepath)
+                    # Validasi struktur file utama (streaming, tanpa memuat seluruh file)
+                    main_info = bundling_system.file_handler.inspect_file(main_filepath)
 
-                    if df_main is None:
+                    if main_info is None:
                         error_occurred = True
                         flash("Error reading main analysis file", "danger")
                     else:
-                        # Skip header dan description jika ada
-                        if len(df_main) > 2 and str(df_main.iloc[1, 0]).startswith(
-                            "Platform unique"
-                        ):
-                            df_main = df_main.iloc[2:].reset_index(drop=True)
-
                         # Validasi kolom yang diperlukan
                         required_columns = [
                             "Order ID",
@@ -1644,7 +5367,7 @@ def upload_triple_files():
                         missing_columns = [
                             col
                             for col in required_columns
-                            if col not in df_main.columns
+                            if col not in main_info["columns"]
                         ]
 
                         if missing_columns:
@@ -1654,12 +5377,12 @@ def upload_triple_files():
                                 "danger",
                             )
                         else:
-                            session["transaction_columns"] = df_main.columns.tolist()
-                            session["transaction_df_preview"] = df_main.head(5).to_json(
-                                orient="records"
-                            )
+                            session["transaction_columns"] = main_info["columns"]
+                            session["transaction_df_preview"] = main_info[
+                                "preview"
+                            ].to_json(orient="records")
                             upload_results.append(
-                                f"✅ Data Analisis Utama: {main_filename} ({len(df_main)} records)"
+                                f"✅ Data Analisis Utama: {main_filename} ({main_info['row_count']} records)"
                             )
 
             except Exception as e:
@@ -1687,17 +5410,17 @@ def upload_triple_files():
                     session["product_filename"] = product_filename
 
                     # Validasi file produk
-                    df_product = bundling_system.file_handler.read_file(
+                    product_info = bundling_system.file_handler.inspect_file(
                         product_filepath
                     )
 
-                    if df_product is not None:
-                        session["product_columns"] = df_product.columns.tolist()
-                        session["product_df_preview"] = df_product.head(5).to_json(
-                            orient="records"
-                        )
+                    if product_info is not None:
+                        session["product_columns"] = product_info["columns"]
+                        session["product_df_preview"] = product_info[
+                            "preview"
+                        ].to_json(orient="records")
                         upload_results.append(
-                            f"✅ Data Master Produk: {product_filename} ({len(df_product)} products)"
+                            f"✅ Data Master Produk: {product_filename} ({product_info['row_count']} products)"
                         )
 
             except Exception as e:
@@ -1713,11 +5436,8 @@ def upload_triple_files():
             and bundling_system.file_handler.allowed_file(historical_file.filename)
         ):
             try:
-                # Save dengan nama yang konsisten untuk easy detection
                 historical_filepath, _ = bundling_system.file_handler.save_file(
-                    historical_file,
-                    app.config["UPLOAD_FOLDER"],
-                    "data_pesanan_maret.xlsx",
+                    historical_file, app.config["UPLOAD_FOLDER"]
                 )
 
                 if historical_filepath:
@@ -1725,21 +5445,13 @@ def upload_triple_files():
                     session["historical_filename"] = historical_file.filename
 
                     # Validasi file historis
-                    df_historical = bundling_system.file_handler.read_file(
+                    historical_info = bundling_system.file_handler.inspect_file(
                         historical_filepath
                     )
 
-                    if df_historical is not None:
-                        # Skip header jika ada
-                        if len(df_historical) > 2 and str(
-                            df_historical.iloc[1, 0]
-                        ).startswith("Platform unique"):
-                            df_historical = df_historical.iloc[2:].reset_index(
-                                drop=True
-                            )
-
+                    if historical_info is not None:
                         upload_results.append(
-                            f"✅ Data Historis Validasi: {historical_file.filename} ({len(df_historical)} records)"
+                            f"✅ Data Historis Validasi: {historical_file.filename} ({historical_info['row_count']} records)"
                         )
 
             except Exception as e:
@@ -1802,20 +5514,9 @@ def product_analysis():
     try:
         logger.info("=== STARTING PRODUCT ANALYSIS ROUTE ===")
 
-        # Baca file transaksi dan produk menggunakan FileHandler
-        transaction_filepath = session["transaction_filepath"]
-        df_transaction = bundling_system.file_handler.read_file(transaction_filepath)
-
-        product_filepath = session["product_filepath"]
-        df_product = bundling_system.file_handler.read_file(product_filepath)
-
-        if df_transaction is None or df_product is None:
-            flash("Error reading files", "danger")
-            return redirect(url_for("index"))
-
-        # Analisis menggunakan ProductAnalyzer
-        analysis_result, error = bundling_system.product_analyzer.analyze_product_sales(
-            df_transaction, df_product
+        # Analisis lewat katalog produk persisten (master & penjualan per SKU)
+        analysis_result, error = bundling_system.analyze_products(
+            session["transaction_filepath"], session["product_filepath"]
         )
 
         if error:
@@ -1827,12 +5528,15 @@ def product_analysis():
             flash("Gagal melakukan analisis produk", "danger")
             return redirect(url_for("index"))
 
-        # Simpan hasil analisis di session
-        try:
-            session["product_analysis"] = json.dumps(analysis_result, default=str)
-            logger.info("Analysis result saved to session")
-        except Exception as se:
-            logger.warning(f"Failed to save to session: {se}")
+        # Hasil lengkap ada di katalog; session cukup menyimpan ringkasannya
+        session["product_analysis"] = {
+            key: analysis_result[key]
+            for key in (
+                "total_products",
+                "sold_products_count",
+                "unsold_products_count",
+            )
+        }
 
         # Flash message untuk memberitahu hasil
         flash(
@@ -1905,6 +5609,9 @@ def configure():
     min_support = session.get("min_support", 0.01)
     min_confidence = session.get("min_confidence", 0.2)
     min_lift = session.get("min_lift", 1.0)
+    mining_algorithm = session.get("mining_algorithm", app.config["MINING_ALGORITHM"])
+    top_k = session.get("top_k")
+    transaction_source = session.get("transaction_source", "file")
 
     # Check status upload
     has_product_analysis = "product_filepath" in session
@@ -1918,6 +5625,10 @@ def configure():
         min_support=min_support,
         min_confidence=min_confidence,
         min_lift=min_lift,
+        mining_algorithm=mining_algorithm,
+        top_k=top_k,
+        transaction_source=transaction_source,
+        basket_stats=bundling_system.data_processor.basket_store.stats(),
         algorithm="Enhanced ECLAT",
         has_product_analysis=has_product_analysis,
         has_historical_data=has_historical_data,
@@ -1930,7 +5641,7 @@ def configure():
 
 @app.route("/get_unique_dates", methods=["POST"])
 def get_unique_dates():
-    """API endpoint untuk mendapatkan tanggal unik menggunakan DateFilter class"""
+    """API endpoint untuk mendapatkan tanggal unik dari indeks tanggal per file"""
     try:
         if "transaction_filepath" not in session:
             return {"success": False, "error": "File tidak ditemukan dalam session"}
@@ -1941,22 +5652,19 @@ def get_unique_dates():
         if not column_name:
             return {"success": False, "error": "Nama kolom tidak valid"}
 
-        # Baca file
+        # Indeks tanggal dibangun sekali per file, lalu dipakai ulang
         filepath = session["transaction_filepath"]
-        df = bundling_system.file_handler.read_file(filepath)
+        date_index = bundling_system.get_date_index(filepath, column_name)
 
-        if df is None:
-            return {"success": False, "error": "Error reading file"}
-
-        if column_name not in df.columns:
+        if date_index is None:
             return {"success": False, "error": f"Kolom {column_name} tidak ditemukan"}
 
-        # Dapatkan tanggal unik menggunakan DateFilter
-        unique_dates = bundling_system.date_filter.get_unique_dates_from_column(
-            df, column_name
-        )
-
-        return {"success": True, "dates": unique_dates, "total_records": len(df)}
+        return {
+            "success": True,
+            "dates": date_index.unique_dates(),
+            "histogram": date_index.histogram(),
+            "total_records": date_index.total_rows,
+        }
 
     except Exception as e:
         logger.error(f"Error getting unique dates: {str(e)}")
@@ -1965,7 +5673,7 @@ def get_unique_dates():
 
 @app.route("/preview_date_filter", methods=["POST"])
 def preview_date_filter():
-    """API endpoint untuk preview hasil filtering tanggal menggunakan DateFilter class"""
+    """API endpoint untuk preview jumlah data dalam rentang tanggal (dari indeks tanggal)"""
     try:
         if "transaction_filepath" not in session:
             return {"success": False, "error": "File tidak ditemukan dalam session"}
@@ -1978,25 +5686,24 @@ def preview_date_filter():
         if not all([column_name, start_date, end_date]):
             return {"success": False, "error": "Parameter tidak lengkap"}
 
-        # Baca file
-        filepath = session["transaction_filepath"]
-        df = bundling_system.file_handler.read_file(filepath)
+        start_dt = DateFilter.parse_date_string(start_date)
+        end_dt = DateFilter.parse_date_string(end_date)
+        if start_dt is None or end_dt is None:
+            return {"success": False, "error": "Format tanggal tidak valid"}
 
-        if df is None:
-            return {"success": False, "error": "Error reading file"}
+        filepath = session["transaction_filepath"]
+        date_index = bundling_system.get_date_index(filepath, column_name)
 
-        # Filter DataFrame menggunakan DateFilter
-        filtered_df, error = bundling_system.date_filter.filter_dataframe_by_date_range(
-            df, column_name, start_date, end_date
-        )
+        if date_index is None:
+            return {"success": False, "error": "Kolom tanggal tidak ditemukan"}
 
-        if error:
-            return {"success": False, "error": error}
+        filtered_count, filtered_orders = date_index.count_range(start_dt, end_dt)
 
         return {
             "success": True,
-            "filtered_count": len(filtered_df),
-            "total_count": len(df),
+            "filtered_count": filtered_count,
+            "filtered_orders": filtered_orders,
+            "total_count": date_index.total_rows,
         }
 
     except Exception as e:
@@ -2025,9 +5732,25 @@ def analyze():
             min_support = float(request.form.get("min_support", "0.01"))
             min_confidence = float(request.form.get("min_confidence", "0.2"))
             min_lift = float(request.form.get("min_lift", "1.0"))
+            top_k = int(request.form.get("top_k") or 0) or None
         except ValueError as e:
             flash(f"Error parsing parameters: {str(e)}", "danger")
             return redirect(url_for("configure"))
+        if top_k is not None and top_k < 1:
+            flash("Top-k harus bilangan bulat positif", "danger")
+            return redirect(url_for("configure"))
+
+        mining_algorithm = request.form.get(
+            "mining_algorithm", app.config["MINING_ALGORITHM"]
+        )
+        if mining_algorithm not in MINING_ALGORITHMS:
+            flash(f"Algoritma mining tidak dikenal: {mining_algorithm}", "danger")
+            return redirect(url_for("configure"))
+
+        transaction_source = request.form.get("transaction_source", "file")
+        if transaction_source not in TRANSACTION_SOURCES:
+            flash(f"Sumber transaksi tidak dikenal: {transaction_source}", "danger")
+            return redirect(url_for("configure"))
 
         start_date = request.form.get("start_date", None)
         end_date = request.form.get("end_date", None)
@@ -2037,6 +5760,9 @@ def analyze():
         session["min_support"] = min_support
         session["min_confidence"] = min_confidence
         session["min_lift"] = min_lift
+        session["mining_algorithm"] = mining_algorithm
+        session["top_k"] = top_k
+        session["transaction_source"] = transaction_source
 
         # Get file paths
         main_filepath = session["transaction_filepath"]
@@ -2058,6 +5784,9 @@ def analyze():
             min_confidence=min_confidence,
             min_lift=min_lift,
             min_support_count=min_support_count,
+            algorithm=mining_algorithm,
+            top_k=top_k,
+            transaction_source=transaction_source,
         )
 
         if error:
@@ -2092,7 +5821,11 @@ def analyze():
             unique_product_count=result["unique_product_count"],
             filtered_count=0,
             total_count=result["total_transactions"],
-            algorithm="Enhanced ECLAT (Class-based)",
+            algorithm=(
+                "Enhanced FP-Growth"
+                if mining_algorithm == "fpgrowth"
+                else "Enhanced ECLAT (Class-based)"
+            ),
             order_column=order_column,
             product_column=product_column,
             sku_id_column=sku_id_column,
@@ -2118,6 +5851,84 @@ def analyze():
         return redirect(url_for("configure"))
 
 
+@app.route("/trend_analysis", methods=["POST"])
+def trend_analysis():
+    """API endpoint analisis tren bundling per rolling window tanggal"""
+    if "transaction_filepath" not in session:
+        return {"success": False, "error": "File tidak ditemukan dalam session"}
+
+    try:
+        data = request.get_json(silent=True) or request.form
+        try:
+            window_days = int(data.get("window_days", 7))
+            step_days = int(data.get("step_days", 1))
+            min_support = float(data.get("min_support", session.get("min_support", 0.01)))
+            min_confidence = float(
+                data.get("min_confidence", session.get("min_confidence", 0.2))
+            )
+            min_lift = float(data.get("min_lift", session.get("min_lift", 1.0)))
+        except (TypeError, ValueError) as e:
+            return {"success": False, "error": f"Error parsing parameters: {str(e)}"}
+
+        result, error = bundling_system.run_trend_analysis(
+            session["transaction_filepath"],
+            window_days=window_days,
+            step_days=step_days,
+            min_support=min_support,
+            min_confidence=min_confidence,
+            min_lift=min_lift,
+        )
+        if error:
+            return {"success": False, "error": error}
+
+        return {"success": True, **result}
+
+    except Exception as e:
+        logger.error(f"Error dalam trend_analysis: {str(e)}")
+        return {"success": False, "error": str(e)}
+
+
+@app.route("/ingest_orders", methods=["POST"])
+def ingest_orders():
+    """API endpoint: tambahkan export pesanan harian ke basket store"""
+    orders_file = request.files.get("orders_file")
+    if orders_file is None or orders_file.filename == "":
+        return {"success": False, "error": "File export pesanan wajib dipilih"}
+    if not bundling_system.file_handler.allowed_file(orders_file.filename):
+        return {"success": False, "error": "Format file tidak didukung"}
+
+    try:
+        filepath, _ = bundling_system.file_handler.save_file(
+            orders_file, app.config["UPLOAD_FOLDER"]
+        )
+        if not filepath:
+            return {"success": False, "error": "Gagal menyimpan file"}
+
+        FileHandler.validate_archive(filepath)
+        df = bundling_system.load_frame(filepath, usecols=DataProcessor.TRANSACTION_COLUMNS)
+        if df is None:
+            return {"success": False, "error": "Error reading orders file"}
+
+        summary, error = bundling_system.data_processor.append_orders(df)
+        if error:
+            return {"success": False, "error": error}
+
+        return {"success": True, **summary}
+
+    except Exception as e:
+        logger.error(f"Error dalam ingest_orders: {str(e)}")
+        return {"success": False, "error": str(e)}
+
+
+@app.route("/cache_stats")
+def cache_stats():
+    """API endpoint untuk statistik cache analisis in-process"""
+    try:
+        return {"success": True, "analysis_cache": bundling_system.cache.stats()}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
 @app.route("/export_rules")
 def export_rules():
     """Export rules ke CSV"""
@@ -0,0 +1,69 @@
+"""Benchmark algoritma mining itemset (ECLAT vs FP-Growth).
+
+Membandingkan EclatAlgorithm dan FPGrowthAlgorithm pada basket panjang
+sintetis (kasus di mana tidlist vertikal ECLAT membengkak), sekaligus
+memastikan support semua itemset sama.
+
+    python benchmarks/mining_algorithms.py [--basket 20 60] [--orders 20000] [--min-support 0.05 0.03]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import EclatAlgorithm, EncodedTransactions, FPGrowthAlgorithm  # noqa: E402
+
+logging.disable(logging.INFO)
+
+
+def make_transactions(orders, basket, n_skus=300, seed=3):
+    """Basket panjang (ukuran basket[0]..basket[1]), popularitas SKU condong"""
+    rng = np.random.default_rng(seed)
+    sizes = rng.integers(basket[0], basket[1], size=orders)
+    order_codes = np.repeat(np.arange(orders), sizes).astype(np.int32)
+    item_codes = ((rng.pareto(1.0, size=len(order_codes)) * 5).astype(int) % n_skus).astype(np.int32)
+    items = np.array([f"SKU-{n:04d}" for n in range(n_skus)], dtype=object)
+    transactions = EncodedTransactions.from_codes(order_codes, item_codes, items)
+    return transactions, {sku: 2 for sku in items}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=20000)
+    parser.add_argument("--basket", type=int, nargs=2, default=[20, 60])
+    parser.add_argument("--min-support", type=float, nargs="+", default=[0.05, 0.03])
+    args = parser.parse_args()
+
+    transactions, filtered_products = make_transactions(args.orders, args.basket)
+    print(f"{'support':>8} {'itemsets':>9} {'eclat (s)':>10} {'MB':>6} {'fpgrowth (s)':>13} {'MB':>6}  same")
+    for min_support in args.min_support:
+        timings, peaks, supports = {}, {}, {}
+        for name, algorithm in (("eclat", EclatAlgorithm), ("fpgrowth", FPGrowthAlgorithm)):
+            tracemalloc.start()
+            start = time.perf_counter()
+            all_tidlists, _ = algorithm().run_eclat(
+                transactions, filtered_products, min_support
+            )
+            timings[name] = time.perf_counter() - start
+            peaks[name] = tracemalloc.get_traced_memory()[1] / 1024**2
+            tracemalloc.stop()
+            supports[name] = all_tidlists["supports"]
+            del all_tidlists
+
+        print(
+            f"{min_support:>8} {len(supports['eclat']):>9} "
+            f"{timings['eclat']:>10.2f} {peaks['eclat']:>6.0f} "
+            f"{timings['fpgrowth']:>13.2f} {peaks['fpgrowth']:>6.0f}  "
+            f"{supports['eclat'] == supports['fpgrowth']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark DataProcessor.prepare_transactions.
+
+Membandingkan pembentukan basket berbasis groupby saat ini dengan loop lama
+berbasis iterrows() pada export sintetis, sekaligus memastikan transactions
+dan filtered_products sama persis.
+
+    python benchmarks/prepare_transactions.py [--lines 1000000 200000]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import DataProcessor  # noqa: E402
+
+logging.disable(logging.INFO)
+
+
+def legacy_prepare_transactions(df, order_col="Order ID", product_col="Seller SKU", min_support_count=2):
+    """Pembentukan basket lama (iterrows + list scan) sebagai pembanding"""
+    df_clean = df[[order_col, product_col]].dropna()
+    df_clean[order_col] = df_clean[order_col].astype(str)
+    df_clean[product_col] = df_clean[product_col].astype(str).str.strip()
+    df_work = df_clean.iloc[2:].copy() if len(df_clean) > 2 else df_clean.copy()
+
+    unique_orders = df_work[order_col].unique()
+    order_mapping = {order_id: f"T{i+1}" for i, order_id in enumerate(unique_orders)}
+    df_work["TID"] = df_work[order_col].map(order_mapping)
+    product_counts = df_work[product_col].value_counts().to_dict()
+    filtered_products = {
+        product: count for product, count in product_counts.items() if count >= min_support_count
+    }
+
+    transactions_by_order = defaultdict(list)
+    for _, row in df_work.iterrows():
+        order_id = row["TID"]
+        product = row[product_col]
+        if product in filtered_products and product not in transactions_by_order[order_id]:
+            transactions_by_order[order_id].append(product)
+    return list(transactions_by_order.values()), filtered_products
+
+
+def make_export(lines, seed=0):
+    """Export sintetis: baris order berurutan, SKU Zipf (banyak SKU langka)"""
+    rng = np.random.default_rng(seed)
+    basket_sizes = rng.integers(1, 6, size=lines)
+    order_numbers = np.repeat(np.arange(len(basket_sizes)), basket_sizes)[:lines]
+    skus = np.minimum(rng.zipf(1.2, size=lines), 50000)
+    return pd.DataFrame(
+        {
+            "Order ID": [f"ORD{n:08d}" for n in order_numbers],
+            "Seller SKU": [f"SKU-{n:05d}" for n in skus],
+            "SKU ID": skus,
+        }
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, nargs="+", default=[200000, 1000000])
+    args = parser.parse_args()
+
+    processor = DataProcessor()
+    print(f"{'lines':>9} {'legacy (s)':>11} {'groupby (s)':>12} {'speedup':>8}  same")
+    for lines in args.lines:
+        df = make_export(lines)
+
+        start = time.perf_counter()
+        legacy_transactions, legacy_filtered = legacy_prepare_transactions(df)
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        transactions, error, _, _, _, filtered_products = processor.prepare_transactions(df)
+        current_time = time.perf_counter() - start
+        if error:
+            raise SystemExit(error)
+
+        same = transactions == legacy_transactions and filtered_products == legacy_filtered
+        print(
+            f"{lines:>9} {legacy_time:>11.2f} {current_time:>12.2f} "
+            f"{legacy_time / current_time:>7.1f}x  {same}"
+        )
+
+
+if __name__ == "__main__":
+    main()
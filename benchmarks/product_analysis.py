@@ -0,0 +1,147 @@
+"""Benchmark ProductAnalyzer.analyze_product_sales.
+
+Membandingkan implementasi vektor saat ini dengan implementasi lama berbasis
+iterrows() pada beberapa ukuran katalog, sekaligus memastikan hasilnya sama.
+
+    python benchmarks/product_analysis.py [--sizes 1000 5000 20000] [--lines 300000]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import ProductAnalyzer, app  # noqa: E402
+
+logging.disable(logging.INFO)
+
+# Implementasi lama tidak mengenal pencocokan fuzzy
+app.config["SKU_FUZZY_MATCHING"] = False
+
+NULL_TOKENS = ["nan", "none", "", "null"]
+
+
+def legacy_analyze_product_sales(transaction_df, product_df, transaction_col="Seller SKU"):
+    """Implementasi lama (iterrows) sebagai pembanding"""
+    product_sku_col, product_code_col = product_df.columns[0], product_df.columns[1]
+
+    master_products = set()
+    product_mapping = {}
+    for idx, row in product_df.iterrows():
+        product_sku = row[product_sku_col]
+        product_code = row[product_code_col]
+        if pd.isna(product_sku):
+            continue
+        sku_clean = str(product_sku).strip()
+        code_clean = str(product_code).strip() if pd.notna(product_code) else f"P{idx+1}"
+        if not sku_clean or sku_clean.lower() in NULL_TOKENS:
+            continue
+        master_products.add(sku_clean)
+        product_mapping[sku_clean] = {"name": sku_clean, "code": code_clean}
+
+    transaction_products = set()
+    transaction_counts = defaultdict(int)
+    for _, row in transaction_df.iterrows():
+        product_code = row[transaction_col]
+        if pd.isna(product_code):
+            continue
+        code_clean = str(product_code).strip()
+        if not code_clean or code_clean.lower() in NULL_TOKENS:
+            continue
+        transaction_products.add(code_clean)
+        transaction_counts[code_clean] += 1
+
+    sold_products = master_products.intersection(transaction_products)
+    unsold_products = master_products - sold_products
+    sold_stats = sorted(
+        ((product, transaction_counts.get(product, 0)) for product in sold_products),
+        key=lambda x: (-x[1], x[0]),
+    )
+    return {
+        "total_products": len(master_products),
+        "sold_products": [
+            {"code": product_mapping[code]["code"], "name": code, "sales_count": count}
+            for code, count in sold_stats
+        ],
+        "unsold_products": sorted(unsold_products),
+        "top_selling": sold_stats[:10],
+        "product_mapping": {k: v["name"] for k, v in product_mapping.items()},
+    }
+
+
+def make_data(catalog_size, lines, seed=0):
+    """Katalog sintetis dengan spasi, token null, SKU duplikat dan kode kosong"""
+    rng = np.random.default_rng(seed)
+    skus = np.array([f"SKU-{i:06d}" for i in range(catalog_size)], dtype=object)
+
+    master_skus = skus.copy()
+    master_skus[rng.random(catalog_size) < 0.02] = "null"
+    padded = rng.random(catalog_size) < 0.05
+    master_skus[padded] = [f"  {sku} " for sku in master_skus[padded]]
+    codes = np.array([f"KP{i}" for i in range(catalog_size)], dtype=object)
+    codes[rng.random(catalog_size) < 0.02] = None
+    duplicates = rng.choice(catalog_size, size=catalog_size // 50, replace=False)
+    product_df = pd.DataFrame(
+        {
+            "SKU Penjual": np.concatenate([master_skus, skus[duplicates]]),
+            "Kode Produk": np.concatenate([codes, [f"DUP{i}" for i in duplicates]]),
+        }
+    )
+
+    # Hanya ~70% katalog yang terjual, dengan distribusi condong (Zipf)
+    sold_pool = skus[: int(catalog_size * 0.7)]
+    picks = np.minimum(rng.zipf(1.3, size=lines) - 1, len(sold_pool) - 1)
+    line_skus = sold_pool[picks].copy()
+    line_skus[rng.random(lines) < 0.01] = None
+    line_skus[rng.random(lines) < 0.01] = " NaN "
+    transaction_df = pd.DataFrame({"Seller SKU": line_skus})
+    return transaction_df, product_df
+
+
+def comparable(result):
+    return {
+        "total_products": result["total_products"],
+        "sold_products": result["sold_products"],
+        "unsold_products": sorted(p["name"] if isinstance(p, dict) else p for p in result["unsold_products"]),
+        "top_selling": result["top_selling"],
+        "product_mapping": result["product_mapping"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--lines", type=int, default=300000)
+    args = parser.parse_args()
+
+    analyzer = ProductAnalyzer()
+    print(f"{'catalog':>8} {'lines':>8} {'legacy (s)':>11} {'vector (s)':>11} {'speedup':>8}  same")
+    for catalog_size in args.sizes:
+        transaction_df, product_df = make_data(catalog_size, args.lines)
+
+        start = time.perf_counter()
+        legacy = legacy_analyze_product_sales(transaction_df, product_df)
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        current, error = analyzer.analyze_product_sales(transaction_df, product_df)
+        current_time = time.perf_counter() - start
+        if error:
+            raise SystemExit(error)
+
+        same = comparable(legacy) == comparable(current)
+        print(
+            f"{catalog_size:>8} {args.lines:>8} {legacy_time:>11.3f} {current_time:>11.3f} "
+            f"{legacy_time / current_time:>7.1f}x  {same}"
+        )
+
+
+if __name__ == "__main__":
+    main()
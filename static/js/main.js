@@ -50,14 +50,14 @@ function initIndexPage() {
     const form = document.querySelector('form');
     
     function validateFile(input, required = false) {
-        const allowedExtensions = /(\.csv|\.xlsx|\.xls)$/i;
+        const allowedExtensions = /(\.csv|\.xlsx|\.xls|\.csv\.gz|\.csv\.zst|\.zip)$/i;
         
         if (!input.files[0] && required) {
             return 'File wajib dipilih';
         }
         
         if (input.files[0] && !allowedExtensions.exec(input.files[0].name)) {
-            return 'Format file tidak didukung. Gunakan CSV, XLSX, atau XLS';
+            return 'Format file tidak didukung. Gunakan CSV, XLSX, XLS, CSV.GZ, CSV.ZST, atau ZIP';
         }
         
         if (input.files[0] && input.files[0].size > 50 * 1024 * 1024) { // 50MB
@@ -0,0 +1,7 @@
+import os
+import sys
+import tempfile
+
+# app membuat folder upload/cache saat diimport; arahkan ke folder sementara
+os.environ.setdefault("UPLOAD_FOLDER", tempfile.mkdtemp(prefix="bundling-tests-"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
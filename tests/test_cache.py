@@ -0,0 +1,97 @@
+"""Cache LRU in-process (MemoryLRUCache) dan endpoint /cache_stats."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app import BundlingRecommendationSystem, MemoryLRUCache, app
+
+
+def test_byte_budget_evicts_least_recently_used():
+    cache = MemoryLRUCache(max_bytes=100)
+    cache.put(("a",), "A", size=40)
+    cache.put(("b",), "B", size=40)
+    assert cache.get(("a",)) == "A"  # a jadi yang terbaru dipakai
+
+    cache.put(("c",), "C", size=40)
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",)) == "A"
+    assert cache.get(("c",)) == "C"
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["current_bytes"] == 80
+    assert stats["evictions"] == 1
+
+
+def test_put_replaces_entry_and_skips_oversized():
+    cache = MemoryLRUCache(max_bytes=100)
+    cache.put(("a",), "A", size=40)
+    cache.put(("a",), "A2", size=60)
+    assert cache.get(("a",)) == "A2"
+    assert cache.stats()["current_bytes"] == 60
+
+    cache.put(("big",), "X", size=101)
+    assert cache.get(("big",)) is None
+    assert cache.stats()["current_bytes"] == 60
+    assert cache.stats()["evictions"] == 0
+
+
+def test_hit_miss_counters():
+    cache = MemoryLRUCache(max_bytes=1024)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return "value"
+
+    assert cache.get_or_compute(("k",), compute) == "value"
+    assert cache.get_or_compute(("k",), compute) == "value"
+    assert cache.get(("missing",)) is None
+    # Hasil yang ditolak cache_if tidak disimpan
+    cache.get_or_compute(("error",), lambda: "error", cache_if=lambda value: False)
+    cache.get_or_compute(("error",), lambda: "error", cache_if=lambda value: False)
+
+    stats = cache.stats()
+    assert len(calls) == 1
+    assert (stats["hits"], stats["misses"]) == (1, 4)
+    assert stats["hit_rate"] == pytest.approx(0.2)
+
+    cache.clear()
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["current_bytes"] == 0
+
+
+def test_estimate_size():
+    frame = pd.DataFrame({"a": np.arange(1000, dtype=np.int64)})
+    assert MemoryLRUCache.estimate_size(frame) >= 8000
+    assert MemoryLRUCache.estimate_size(np.zeros(100, dtype=np.int32)) == 400
+    assert MemoryLRUCache.estimate_size({i: np.zeros(10) for i in range(1000)}) >= 80000
+
+
+def test_load_frame_returns_copies(tmp_path):
+    path = tmp_path / "orders.csv"
+    pd.DataFrame(
+        {"Order ID": ["1", "2", "3"], "Seller SKU": ["A", "B", "C"]}
+    ).to_csv(path, index=False)
+    system = BundlingRecommendationSystem()
+
+    first = system.load_frame(str(path))
+    first.loc[0, "Seller SKU"] = "C"
+    first["extra"] = 1
+    first.drop(index=1, inplace=True)
+
+    second = system.load_frame(str(path))
+    assert second["Seller SKU"].tolist() == ["A", "B", "C"]
+    assert "extra" not in second.columns
+    assert second.attrs.get("content_hash") == first.attrs.get("content_hash")
+    assert system.cache.stats()["hits"] == 1
+
+
+def test_cache_stats_endpoint():
+    response = app.test_client().get("/cache_stats")
+    data = response.get_json()
+    assert data["success"] is True
+    assert {"entries", "current_bytes", "max_bytes", "hits", "misses", "evictions"} <= set(
+        data["analysis_cache"]
+    )
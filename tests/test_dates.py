@@ -0,0 +1,182 @@
+"""Filter tanggal vektor dan DateIndex dibandingkan dengan implementasi per baris."""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app import DateFilter, DateIndex
+
+CREATED_TIMES = [
+    "01/03/2025 10:00:00",
+    "1/3/2025 11:15:00",
+    "2025-03-05 08:00",
+    "2025-3-9",
+    "07-03-2025 23:59:59",
+    "31/02/2025 10:00:00",
+    "12/03/2025",
+    "20250301",
+    "Order",
+    "abc",
+    "",
+    None,
+    np.nan,
+    " 15/03/2025 09:00 ",
+    "01/03/2025 18:30:00",
+]
+
+
+def per_row_mask(values, start_date, end_date):
+    """Filter lama: extract_date_from_datetime + strptime untuk setiap baris"""
+    start_dt = DateFilter.parse_date_string(start_date)
+    end_dt = DateFilter.parse_date_string(end_date)
+    mask = []
+    for value in values:
+        label = DateFilter.extract_date_from_datetime(value)
+        date_obj = DateFilter.parse_date_string(label) if label is not None else None
+        mask.append(date_obj is not None and start_dt <= date_obj <= end_dt)
+    return np.array(mask)
+
+
+def test_extract_dates_matches_per_row():
+    labels, dates = DateFilter().extract_dates(CREATED_TIMES)
+    for value, label, date in zip(CREATED_TIMES, labels, dates):
+        expected = DateFilter.extract_date_from_datetime(value)
+        if expected is None:
+            assert label is None or pd.isna(label)
+            assert np.isnat(date)
+            continue
+        assert label == expected
+        parsed = DateFilter.parse_date_string(expected)
+        if parsed is None:
+            assert np.isnat(date)
+        else:
+            assert date == np.datetime64(parsed)
+
+
+@pytest.mark.parametrize(
+    "start_date, end_date",
+    [
+        ("01/03/2025", "05/03/2025"),
+        ("2025-03-06", "2025-03-12"),
+        ("01-03-2025", "31-03-2025"),
+        ("10/03/2025", "01/03/2025"),
+    ],
+)
+def test_filter_by_date_range_matches_per_row(start_date, end_date):
+    df = pd.DataFrame({"Created Time": CREATED_TIMES, "Order ID": range(len(CREATED_TIMES))})
+    filtered, error = DateFilter().filter_dataframe_by_date_range(
+        df, "Created Time", start_date, end_date
+    )
+    assert error is None
+    expected = df[per_row_mask(CREATED_TIMES, start_date, end_date)]
+    assert filtered["Order ID"].tolist() == expected["Order ID"].tolist()
+
+
+def test_filter_by_date_range_errors():
+    df = pd.DataFrame({"Created Time": CREATED_TIMES})
+    date_filter = DateFilter()
+    assert date_filter.filter_dataframe_by_date_range(df, "Tanggal", "01/03/2025", "02/03/2025")[1]
+    assert date_filter.filter_dataframe_by_date_range(df, "Created Time", "kemarin", "02/03/2025")[1]
+
+
+def test_parsed_column_is_cached_per_file():
+    df = pd.DataFrame({"Created Time": CREATED_TIMES})
+    df.attrs["content_hash"] = "dates-cache-test"
+    date_filter = DateFilter()
+    first = date_filter.parse_date_column(df, "Created Time")
+    assert date_filter.parse_date_column(df, "Created Time")[0] is first[0]
+
+    # Frame hasil filter (index berbeda) diparse ulang, bukan memakai cache
+    subset = df.iloc[:5]
+    subset.attrs["content_hash"] = "dates-cache-test"
+    dates, _, _ = date_filter.parse_date_column(subset, "Created Time")
+    np.testing.assert_array_equal(dates, first[0][:5])
+
+
+def test_unique_dates_sorted_by_date():
+    df = pd.DataFrame({"Created Time": CREATED_TIMES})
+    unique_dates = DateFilter().get_unique_dates_from_column(df, "Created Time")
+
+    expected = {
+        label
+        for label in map(DateFilter.extract_date_from_datetime, CREATED_TIMES)
+        if label is not None and len(label) > 5
+    }
+    assert set(unique_dates) == expected
+    parsed = [DateFilter.parse_date_string(label) or datetime(1900, 1, 1) for label in unique_dates]
+    assert parsed == sorted(parsed)
+
+
+def random_orders(n_orders=300, seed=0):
+    """Export acak: tiap order 1-4 baris pada satu hari, format tanggal campuran"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for order in range(n_orders):
+        day = pd.Timestamp("2025-02-20") + pd.Timedelta(days=int(rng.integers(0, 30)))
+        text = rng.choice(
+            [day.strftime("%d/%m/%Y %H:%M:%S"), day.strftime("%Y-%m-%d"), "", "Order"],
+            p=[0.6, 0.3, 0.05, 0.05],
+        )
+        for _ in range(int(rng.integers(1, 5))):
+            rows.append({"Order ID": f"O{order}", "Created Time": text or None})
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture(scope="module")
+def orders_frame():
+    return random_orders()
+
+
+@pytest.fixture(scope="module")
+def date_index(orders_frame):
+    return DateIndex.build(orders_frame, "Created Time", "Order ID", DateFilter())
+
+
+def test_date_index_range_counts_match_mask(orders_frame, date_index):
+    dates, _, _ = DateFilter().parse_date_column(orders_frame, "Created Time")
+    days = dates.astype("datetime64[D]")
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        start, end = sorted(
+            np.datetime64("2025-02-15") + rng.integers(0, 40, size=2).astype("timedelta64[D]")
+        )
+        mask = (days >= start) & (days <= end)
+        expected = (int(mask.sum()), orders_frame["Order ID"][mask].nunique())
+        assert date_index.count_range(start.astype(datetime), end.astype(datetime)) == expected
+
+    assert date_index.count_range(datetime(2025, 3, 10), datetime(2025, 3, 1)) == (0, 0)
+    assert date_index.total_rows == len(orders_frame)
+
+
+def test_date_index_unique_dates_and_histogram(orders_frame, date_index):
+    date_filter = DateFilter()
+    # Satu label per hari (format campuran dalam satu hari digabung), urut tanggal
+    index_days = [date_filter.parse_date_string(label) for label in date_index.unique_dates()]
+    column_days = {
+        date_filter.parse_date_string(label)
+        for label in date_filter.get_unique_dates_from_column(orders_frame, "Created Time")
+    }
+    assert index_days == sorted(column_days)
+
+    dates, _, _ = date_filter.parse_date_column(orders_frame, "Created Time")
+    days = dates.astype("datetime64[D]")
+    histogram = date_index.histogram()
+    for entry, day in zip(histogram, date_index.days):
+        mask = days == day
+        assert entry["rows"] == int(mask.sum())
+        assert entry["orders"] == orders_frame["Order ID"][mask].nunique()
+    assert sum(entry["rows"] for entry in histogram) == int((~np.isnat(dates)).sum())
+
+
+def test_date_index_save_load_roundtrip(tmp_path, date_index):
+    path = str(tmp_path / "dates.npz")
+    date_index.save(path)
+    loaded = DateIndex.load(path)
+    np.testing.assert_array_equal(loaded.days, date_index.days)
+    assert loaded.labels.tolist() == date_index.labels.tolist()
+    assert loaded.total_rows == date_index.total_rows
+    assert loaded.count_range(datetime(2025, 3, 1), datetime(2025, 3, 7)) == date_index.count_range(
+        datetime(2025, 3, 1), datetime(2025, 3, 7)
+    )
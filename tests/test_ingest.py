@@ -0,0 +1,290 @@
+"""Pembacaan file upload: cache kolumnar, CSV per-chunk, XLSX streaming, arsip."""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app import ChunkedCsvReader, ColumnarCache, FileHandler, app, xlsx_stream_reader
+
+
+def test_cached_frame_is_writable_copy_on_write(tmp_path):
+    cache = ColumnarCache(str(tmp_path / "cache"), max_bytes=1024**2)
+    frame = pd.DataFrame({"Order ID": ["A1", "A2", "A3"], "Qty": np.array([1, 2, 3])})
+    assert cache.store("abc", frame)
+
+    cached = cache.load("abc")
+    assert cached.attrs["content_hash"] == "abc"
+    pd.testing.assert_frame_equal(cached, frame, check_categorical=False, check_dtype=False)
+
+    # Memory-map copy-on-write: perubahan tidak error dan tidak masuk ke file cache
+    cached.loc[1, "Qty"] = 9
+    cached.loc[0, "Order ID"] = "A3"
+    again = cache.load("abc")
+    assert again["Qty"].tolist() == [1, 2, 3]
+    assert again["Order ID"].tolist() == ["A1", "A2", "A3"]
+
+
+def test_csv_dtype_does_not_depend_on_cache_state(tmp_path):
+    columns = ["Order ID", "Seller SKU"]
+    results = []
+    for first in ("full", "projected"):
+        path = tmp_path / f"orders_{first}.csv"
+        # Isi berbeda per file agar masing-masing mulai tanpa entri cache
+        path.write_text(f"Order ID,Seller SKU,Note\n12345,SKU-1,{first}\n,SKU-2,x\n67890,,y\n")
+        reads = [None, columns] if first == "full" else [columns, None]
+        for usecols in reads:
+            frame = FileHandler.read_file(str(path), usecols=usecols)
+            results.append(frame[columns].astype(object).where(frame[columns].notna(), None))
+
+    for frame in results:
+        assert frame["Order ID"].tolist() == ["12345", None, "67890"]
+        assert frame["Seller SKU"].tolist() == ["SKU-1", "SKU-2", None]
+
+
+def small_chunk_reader(monkeypatch, workers=1):
+    """ChunkedCsvReader dengan chunk puluhan byte agar batas chunk teruji"""
+    monkeypatch.setattr(ChunkedCsvReader, "MIN_CHUNK_BYTES", 40)
+    monkeypatch.setattr(ChunkedCsvReader, "SCAN_BLOCK_BYTES", 16)
+    return ChunkedCsvReader(memory_budget=0, workers=workers)
+
+
+def quoted_csv(n_rows=40):
+    """CSV dengan newline, koma dan tanda kutip di dalam field ber-quote"""
+    lines = ['Order ID,"Seller\nSKU",Note']
+    for i in range(n_rows):
+        note = f'"baris {i}\nlanjut, ""kutip"""' if i % 3 == 0 else f"n{i}"
+        lines.append(f"{1000 + i},SKU-{i % 7},{note}")
+    return "\n".join(lines) + "\n"
+
+
+def test_chunked_ranges_split_on_row_boundaries(tmp_path, monkeypatch):
+    path = tmp_path / "orders.csv"
+    path.write_text(quoted_csv())
+    reader = small_chunk_reader(monkeypatch)
+
+    data = path.read_bytes()
+    ranges = reader.split_ranges(str(path), reader._header_end(str(path)))
+    assert len(ranges) > 5
+    assert data[: ranges[0][0]] == b'Order ID,"Seller\nSKU",Note\n'
+    assert ranges[-1][1] == len(data)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+    # Setiap rentang berisi baris utuh (tanda kutip seimbang)
+    for start, end in ranges:
+        assert data[start:end].endswith(b"\n")
+        assert data[start:end].count(b'"') % 2 == 0
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_chunked_read_matches_pandas(tmp_path, monkeypatch, workers):
+    path = tmp_path / "orders.csv"
+    path.write_text(quoted_csv())
+    reader = small_chunk_reader(monkeypatch, workers)
+    columns = ["Order ID", "Note"]
+
+    frame = reader.read(str(path), columns + ["Missing"])
+    expected = pd.read_csv(path, dtype=str)[columns]
+    assert frame.columns.tolist() == columns
+    assert isinstance(frame["Note"].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(frame.astype(object), expected.astype(object))
+
+
+def test_iter_blocks_keeps_quoted_rows_whole(monkeypatch):
+    import io
+
+    reader = small_chunk_reader(monkeypatch)
+    text = quoted_csv().encode()
+    blocks = list(reader.iter_blocks(io.BytesIO(text)))
+    assert len(blocks) > 5
+    assert b"".join(blocks) == text[text.index(b"Note\n") + len(b"Note\n") :]
+    assert all(block.count(b'"') % 2 == 0 for block in blocks)
+
+
+def write_xlsx(path, rows):
+    from openpyxl import Workbook
+
+    workbook = Workbook()
+    sheet = workbook.active
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+    return str(path)
+
+
+EXPORT_ROWS = [
+    ["Order ID", "Seller SKU", "SKU ID", "Created Time", "Product Name"],
+    ["Platform unique order ID.", "Seller SKU desc", "SKU ID desc", "Order", "desc"],
+    ["5001", "SKU-1", 101, "01/03/2025 10:00:00", "Satu"],
+    ["5001", "SKU-2", 102, "01/03/2025 10:00:00", "Dua"],
+    ["5002", "SKU-1", 101, "02/03/2025 11:00:00", "Satu"],
+]
+
+
+def test_xlsx_stream_skips_description_and_projects(tmp_path):
+    path = write_xlsx(tmp_path / "orders.xlsx", EXPORT_ROWS)
+
+    projected = FileHandler.read_file(path, usecols=["Order ID", "Seller SKU"])
+    assert projected.columns.tolist() == ["Order ID", "Seller SKU"]
+    assert projected["Order ID"].astype(str).tolist() == ["5001", "5001", "5002"]
+    assert projected["Seller SKU"].tolist() == ["SKU-1", "SKU-2", "SKU-1"]
+
+    full = FileHandler.read_file(path)
+    assert full.columns.tolist() == EXPORT_ROWS[0]
+    assert len(full) == 3
+    assert full["SKU ID"].tolist() == [101, 102, 101]
+
+
+def test_xlsx_stream_matches_read_excel_on_selected_sheet(tmp_path):
+    from openpyxl import Workbook
+
+    workbook = Workbook()
+    workbook.active.append(["Lain"])
+    sheet = workbook.create_sheet("Orders")
+    for row in [
+        ["Order ID", "Qty", "Price", "Seller SKU"],
+        ["5001", 2, 1.5, "SKU-1"],
+        [],
+        ["5002", 3.0, None, "SKU-2"],
+        ["5003", None, 2.25],
+        [],
+        [],
+    ]:
+        sheet.append(row)
+    path = str(tmp_path / "orders.xlsx")
+    workbook.save(path)
+
+    expected = pd.read_excel(path, sheet_name="Orders")
+    streamed = xlsx_stream_reader.read(path, sheet_name="Orders")
+    pd.testing.assert_frame_equal(streamed, expected)
+
+    projected = xlsx_stream_reader.read(path, usecols=["Seller SKU", "Qty"], sheet_name="Orders")
+    pd.testing.assert_frame_equal(projected, expected[["Qty", "Seller SKU"]])
+
+
+def test_xlsx_inspect_without_full_frame(tmp_path):
+    path = write_xlsx(tmp_path / "orders.xlsx", EXPORT_ROWS)
+    info = FileHandler.inspect_file(path, preview_rows=2)
+    assert info["columns"] == EXPORT_ROWS[0]
+    assert info["row_count"] == 3
+    assert info["preview"]["Seller SKU"].tolist() == ["SKU-1", "SKU-2"]
+
+
+def write_zip(path, members):
+    import zipfile
+
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, text in members.items():
+            archive.writestr(name, text)
+    return str(path)
+
+
+def test_zip_with_one_csv_is_read(tmp_path):
+    path = write_zip(tmp_path / "orders.zip", {"orders.csv": "Order ID,Seller SKU\n1,A\n2,B\n"})
+    assert FileHandler.read_file(path)["Seller SKU"].tolist() == ["A", "B"]
+    assert FileHandler.inspect_file(path)["row_count"] == 2
+
+
+def test_zip_with_several_csv_members_is_rejected(tmp_path):
+    path = write_zip(
+        tmp_path / "orders.zip",
+        {"march.csv": "Order ID\n1\n", "april.csv": "Order ID\n2\n"},
+    )
+    with pytest.raises(ValueError, match="2 file CSV"):
+        FileHandler.inspect_file(path)
+    assert FileHandler.read_file(path) is None
+
+    with open(path, "rb") as upload:
+        response = app.test_client().post(
+            "/ingest_orders",
+            data={"orders_file": (upload, "orders.zip")},
+            content_type="multipart/form-data",
+        )
+    assert response.get_json()["success"] is False
+    assert "satu file CSV" in response.get_json()["error"]
+
+
+def upload(data, filename):
+    import io
+
+    from werkzeug.datastructures import FileStorage
+
+    return FileStorage(stream=io.BytesIO(data), filename=filename)
+
+
+def test_save_file_is_content_addressed(tmp_path, monkeypatch):
+    import hashlib
+
+    data = b"Order ID,Seller SKU\n1,A\n2,B\n"
+    first, name = FileHandler.save_file(upload(data, "maret.csv"), str(tmp_path))
+    assert name == "maret.csv"
+    assert os.path.basename(first) == hashlib.sha256(data).hexdigest() + ".csv"
+    assert FileHandler.stored_digest(first) == hashlib.sha256(data).hexdigest()
+
+    # Upload ulang (nama lain) tidak menulis ulang file
+    monkeypatch.setattr(os, "replace", lambda *args: pytest.fail("file ditulis ulang"))
+    again, name = FileHandler.save_file(upload(data, "salinan.csv"), str(tmp_path))
+    assert again == first
+    assert name == "salinan.csv"
+    assert [entry for entry in os.listdir(os.path.dirname(first))] == [os.path.basename(first)]
+
+
+def test_save_file_uses_real_extension(tmp_path):
+    # CSV yang diberi nama .xlsx disimpan (dan dibaca) sebagai CSV
+    data = b"Order ID,Seller SKU\n1,A\n"
+    path, _ = FileHandler.save_file(upload(data, "data_pesanan_maret.xlsx"), str(tmp_path))
+    assert path.endswith(".csv")
+    assert FileHandler.read_file(path)["Seller SKU"].tolist() == ["A"]
+
+    xlsx = write_xlsx(tmp_path / "orders.xlsx", EXPORT_ROWS)
+    with open(xlsx, "rb") as f:
+        path, _ = FileHandler.save_file(upload(f.read(), "orders.csv"), str(tmp_path))
+    assert path.endswith(".xlsx")
+
+    zipped = write_zip(tmp_path / "orders.zip", {"orders.csv": "Order ID\n1\n"})
+    with open(zipped, "rb") as f:
+        path, _ = FileHandler.save_file(upload(f.read(), "orders.zip"), str(tmp_path))
+    assert path.endswith(".zip")
+
+
+def compress(path, extension, data):
+    import gzip
+
+    if extension == "csv.gz":
+        path.write_bytes(gzip.compress(data))
+    else:
+        zstandard = pytest.importorskip("zstandard")
+        path.write_bytes(zstandard.ZstdCompressor().compress(data))
+    return str(path)
+
+
+@pytest.mark.parametrize("extension", ["csv.gz", "csv.zst"])
+def test_compressed_csv_is_decoded_while_parsing(tmp_path, monkeypatch, extension):
+    data = quoted_csv().encode()
+    path = compress(tmp_path / f"orders.{extension}", extension, data)
+    (tmp_path / "orders.csv").write_bytes(data)
+    expected = pd.read_csv(tmp_path / "orders.csv", dtype=str)
+
+    assert FileHandler.allowed_file(f"orders.{extension}")
+    pd.testing.assert_frame_equal(FileHandler.read_file(path, use_cache=False), expected)
+    assert FileHandler.inspect_file(path)["row_count"] == len(expected)
+
+    # Jalur per-chunk memproses stream terdekompresi blok demi blok
+    reader = small_chunk_reader(monkeypatch)
+    frame = reader.read(path, ["Order ID", "Note"])
+    pd.testing.assert_frame_equal(
+        frame.astype(object), expected[["Order ID", "Note"]].astype(object)
+    )
+    # Tidak ada file hasil dekompresi yang ditulis
+    assert sorted(os.listdir(tmp_path)) == sorted(["orders.csv", f"orders.{extension}"])
+
+
+def test_zst_without_zstandard_gives_clear_error(tmp_path, monkeypatch):
+    import app as app_module
+
+    path = compress(tmp_path / "orders.csv.zst", "csv.zst", b"Order ID\n1\n")
+    monkeypatch.setattr(app_module, "zstandard", None)
+    with pytest.raises(ValueError, match="zstandard"):
+        FileHandler.open_csv_stream(path)
+    assert FileHandler.read_file(path, use_cache=False) is None
@@ -0,0 +1,438 @@
+"""Mining itemset dibandingkan dengan miner brute-force pada basket kecil tetap."""
+
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from app import (
+    BitsetEngine,
+    EclatAlgorithm,
+    EncodedTransactions,
+    FPGrowthAlgorithm,
+    PairSupportTable,
+    RuleGenerator,
+    TidArrayEngine,
+    app,
+)
+
+MIN_SUPPORT = 0.1
+
+# 10 SKU: inti padat (A-D) agar ada class dEclat dan itemset panjang, sisanya jarang
+BASKETS = [
+    "ABCD", "ABCD", "ABCDE", "ABCF", "ABDG", "ACDH", "BCD", "ABC", "ABCDEF",
+    "ABCDGH", "ABD", "ACD", "AB", "CD", "ABCDE", "ABCDE", "EFG", "EF", "FGH",
+    "AEF", "BEF", "ABCDEFGH", "ABCI", "DJ", "ABJ", "ACDIJ", "ABCD", "BCDE",
+    "ABCDF", "AG", "ABCDEF", "ABCDH", "CDEF", "A", "B", "ABCDEFG", "ABC",
+    "ABDE", "ABCE", "ABCDEFGHIJ",
+]
+
+
+def make_transactions(baskets=BASKETS):
+    """EncodedTransactions (id item = urutan SKU) dan filtered_products"""
+    items = np.array(sorted({sku for basket in baskets for sku in basket}), dtype=object)
+    rank = {sku: i for i, sku in enumerate(items)}
+    line_tx, line_item = [], []
+    for tid, basket in enumerate(baskets):
+        for sku in basket:
+            line_tx.append(tid)
+            line_item.append(rank[sku])
+    transactions = EncodedTransactions.from_codes(
+        np.array(line_tx, dtype=np.int32), np.array(line_item, dtype=np.int32), items
+    )
+    return transactions, {sku: 2 for sku in items}
+
+
+def brute_force(baskets=BASKETS, min_support=MIN_SUPPORT):
+    """{frozenset SKU: support} untuk semua itemset dengan support >= min_support"""
+    min_count = min_support * len(baskets)
+    baskets = [frozenset(basket) for basket in baskets]
+    items = sorted(set().union(*baskets))
+    supports = {}
+    for size in range(1, len(items) + 1):
+        found = False
+        for itemset in combinations(items, size):
+            itemset = frozenset(itemset)
+            support = sum(itemset <= basket for basket in baskets)
+            if support >= min_count:
+                supports[itemset] = support
+                found = True
+        if not found:
+            break
+    return supports
+
+
+def mined_supports(lattice):
+    """Support hasil run_eclat dengan key frozenset SKU"""
+    items = lattice["items"]
+    return {
+        frozenset(items[list(key)] if isinstance(key, tuple) else [items[key]]): support
+        for key, support in lattice["supports"].items()
+    }
+
+
+def assert_tidlists(lattice, baskets=BASKETS):
+    """Tidlist setiap itemset (termasuk diffset) sama dengan basket yang memuatnya"""
+    items = lattice["items"]
+    for k in range(1, 11):
+        for key in lattice.get(f"tidlist_{k}", {}):
+            skus = set(items[list(key)] if isinstance(key, tuple) else [items[key]])
+            expected = [tid for tid, basket in enumerate(baskets) if skus <= set(basket)]
+            tids = EclatAlgorithm.itemset_tidlist(lattice, key)
+            assert np.asarray(tids).tolist() == expected
+
+
+@pytest.fixture(scope="module")
+def expected():
+    return brute_force()
+
+
+def test_brute_force_fixture_has_long_itemsets(expected):
+    # Sanity: fixture cukup padat untuk DFS lebih dari level 2
+    assert max(len(itemset) for itemset in expected) >= 5
+
+
+@pytest.mark.parametrize("engine", ["tidlist", "bitset"])
+def test_eclat_engines_match_brute_force(engine, expected):
+    transactions, filtered_products = make_transactions()
+    lattice, max_level = EclatAlgorithm().run_eclat(
+        transactions, filtered_products, MIN_SUPPORT, engine=engine, itemset_mode="all"
+    )
+    assert mined_supports(lattice) == expected
+    assert max_level == max(len(itemset) for itemset in expected)
+    assert_tidlists(lattice)
+
+
+@pytest.mark.parametrize("engine", ["tidlist", "bitset"])
+def test_eclat_collapsed_weights_match_brute_force(engine, expected):
+    transactions, filtered_products = make_transactions()
+    collapsed = transactions.collapse()[0]
+    assert len(collapsed) < len(transactions)
+    lattice, _ = EclatAlgorithm().run_eclat(
+        collapsed, filtered_products, MIN_SUPPORT, engine=engine, itemset_mode="all"
+    )
+    assert mined_supports(lattice) == expected
+
+
+def test_eclat_max_len(expected):
+    transactions, filtered_products = make_transactions()
+    lattice, max_level = EclatAlgorithm().run_eclat(
+        transactions, filtered_products, MIN_SUPPORT, max_len=3, itemset_mode="all"
+    )
+    assert max_level == 3
+    assert mined_supports(lattice) == {
+        itemset: support for itemset, support in expected.items() if len(itemset) <= 3
+    }
+
+
+def test_unknown_engine_rejected():
+    transactions, filtered_products = make_transactions()
+    with pytest.raises(ValueError):
+        EclatAlgorithm().run_eclat(transactions, filtered_products, engine="roaring")
+
+
+def random_tids(rng, n_transactions, density):
+    return np.flatnonzero(rng.random(n_transactions) < density).astype(np.int32)
+
+
+def test_bitset_engine_operations():
+    # 1000 transaksi: word terakhir hanya terisi sebagian
+    rng = np.random.default_rng(0)
+    engine = BitsetEngine(1000)
+    weights = rng.integers(1, 5, size=1000)
+    tidlists = [random_tids(rng, 1000, density) for density in (0.005, 0.02, 0.3, 0.6, 0.9)]
+    encoded = [engine.encode(tids) for tids in tidlists]
+    # Item jarang tetap array tid, item padat menjadi bitset
+    assert [engine.is_bitset(tids) for tids in encoded] == [False, False, True, True, True]
+
+    for tids, stored in zip(tidlists, encoded):
+        assert engine.decode(stored).tolist() == tids.tolist()
+        assert engine.support(stored) == len(tids)
+        assert engine.support(stored, weights) == int(weights[tids].sum())
+
+    for a, b in combinations(range(len(tidlists)), 2):
+        expected = np.intersect1d(tidlists[a], tidlists[b])
+        result = engine.intersect([encoded[a], encoded[b]])
+        assert engine.decode(result).tolist() == expected.tolist()
+        assert engine.support(result) == len(expected)
+        assert engine.is_empty(result) == (len(expected) == 0)
+
+        for x, y in ((a, b), (b, a)):
+            diff = engine.difference(encoded[x], encoded[y])
+            assert engine.decode(diff).tolist() == np.setdiff1d(tidlists[x], tidlists[y]).tolist()
+
+    everything = engine.intersect(encoded[2:])
+    assert engine.decode(everything).tolist() == np.intersect1d(
+        np.intersect1d(tidlists[2], tidlists[3]), tidlists[4]
+    ).tolist()
+    assert engine.is_empty(engine.pack(np.array([], dtype=np.int32)))
+
+
+def test_bitset_decode_sparse_words():
+    engine = BitsetEngine(10_000)
+    tids = np.array([3, 64, 65, 9_999], dtype=np.int32)
+    # Bitset dengan sedikit word terisi (mis. diffset) memakai jalur unpack per word
+    assert engine.decode(engine.pack(tids)).tolist() == tids.tolist()
+
+
+@pytest.fixture(params=["scipy", "numpy"])
+def pair_backend(request, monkeypatch):
+    """Hitung co-occurrence dengan scipy.sparse, atau fallback numpy tanpa scipy"""
+    import app as app_module
+
+    if request.param == "scipy":
+        pytest.importorskip("scipy")
+    else:
+        monkeypatch.setattr(app_module, "scipy_sparse", None)
+    return request.param
+
+
+@pytest.mark.parametrize("weighted", [False, True])
+@pytest.mark.parametrize("min_support_count", [0, 3, 12])
+def test_count_pair_supports_matches_intersections(pair_backend, weighted, min_support_count):
+    rng = np.random.default_rng(min_support_count)
+    n_transactions = 200
+    weights = rng.integers(1, 4, size=n_transactions) if weighted else None
+    # Id item tidak berurutan, seperti setelah filter item
+    tidlist_1 = {
+        item: random_tids(rng, n_transactions, density)
+        for item, density in zip([3, 7, 8, 20, 41, 42], [0.5, 0.3, 0.05, 0.2, 0.01, 0.4])
+    }
+    expected = {}
+    for a, b in combinations(sorted(tidlist_1), 2):
+        tids = np.intersect1d(tidlist_1[a], tidlist_1[b])
+        support = len(tids) if weights is None else int(weights[tids].sum())
+        if support >= max(min_support_count, 1):
+            expected[(a, b)] = support
+
+    assert expected
+    assert EclatAlgorithm.count_pair_supports(
+        tidlist_1, weights, min_support_count, n_transactions
+    ) == expected
+
+
+def test_count_pair_supports_needs_two_items(pair_backend):
+    tids = np.array([0, 1], dtype=np.int32)
+    assert EclatAlgorithm.count_pair_supports({4: tids}, None, 1, 2) == {}
+    assert EclatAlgorithm.count_pair_supports({}, None, 1, 2) == {}
+
+
+def test_eclat_pair_backends_match_brute_force(pair_backend, expected):
+    transactions, filtered_products = make_transactions()
+    lattice, _ = EclatAlgorithm().run_eclat(
+        transactions, filtered_products, MIN_SUPPORT, workers=1, itemset_mode="all"
+    )
+    assert mined_supports(lattice) == expected
+
+
+@pytest.mark.parametrize("engine", ["tidlist", "bitset"])
+@pytest.mark.parametrize("diffset_density", [0.0, 0.2, 1.1])
+def test_diffsets_match_brute_force(engine, diffset_density, expected):
+    transactions, filtered_products = make_transactions()
+    lattice, _ = EclatAlgorithm().run_eclat(
+        transactions,
+        filtered_products,
+        MIN_SUPPORT,
+        engine=engine,
+        diffset_density=diffset_density,
+        itemset_mode="all",
+    )
+    assert mined_supports(lattice) == expected
+    # 0.0: semua class lewat dEclat; > 1: tidak ada class yang cukup padat
+    assert bool(lattice["diffsets"]) == (diffset_density <= 1)
+    assert_tidlists(lattice)
+
+
+@pytest.mark.parametrize("engine", ["tidlist", "bitset"])
+@pytest.mark.parametrize("workers", [2, 3])
+def test_parallel_classes_match_brute_force(engine, workers, expected, monkeypatch):
+    monkeypatch.setitem(app.config, "ECLAT_PARALLEL_MIN_WORK", 0)
+    calls = []
+    mine_parallel = EclatAlgorithm.mine_pair_classes_parallel
+
+    def spy(self, *args, **kwargs):
+        calls.append(args)
+        return mine_parallel(self, *args, **kwargs)
+
+    monkeypatch.setattr(EclatAlgorithm, "mine_pair_classes_parallel", spy)
+    transactions, filtered_products = make_transactions()
+    lattice, _ = EclatAlgorithm().run_eclat(
+        transactions,
+        filtered_products,
+        MIN_SUPPORT,
+        engine=engine,
+        workers=workers,
+        itemset_mode="all",
+    )
+    assert calls, "process pool tidak dipakai"
+    assert mined_supports(lattice) == expected
+    assert_tidlists(lattice)
+
+    serial, _ = EclatAlgorithm().run_eclat(
+        transactions, filtered_products, MIN_SUPPORT, engine=engine, workers=1, itemset_mode="all"
+    )
+    assert lattice["supports"] == serial["supports"]
+    assert lattice["diffsets"] == serial["diffsets"]
+
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_parallel_without_deeper_classes(workers, monkeypatch):
+    # Tidak ada class dengan >= 2 partner: tidak ada task untuk process pool
+    monkeypatch.setitem(app.config, "ECLAT_PARALLEL_MIN_WORK", 0)
+    baskets = ["AB", "AB", "CD", "CD"]
+    transactions, filtered_products = make_transactions(baskets)
+    lattice, _ = EclatAlgorithm().run_eclat(
+        transactions, filtered_products, MIN_SUPPORT, workers=workers, itemset_mode="all"
+    )
+    assert mined_supports(lattice) == brute_force(baskets)
+
+
+def test_mine_pair_classes_parallel_with_no_tasks():
+    tids = np.array([0, 1], dtype=np.int32)
+    members = [(0, tids, 2), (1, tids, 2)]
+    levels = {}
+    EclatAlgorithm().mine_pair_classes_parallel(
+        members,
+        {0: tids, 1: tids},
+        {(0, 1): 2},
+        TidArrayEngine(2),
+        None,
+        1,
+        10,
+        levels,
+        None,
+        workers=2,
+    )
+    assert levels[2] == {(0, 1): (None, 2, None)}
+
+
+def test_pair_support_table():
+    pair_supports = {(0, 5): 3, (2, 3): 7, (1, 4): 1}
+    table = PairSupportTable(*PairSupportTable.pack(pair_supports))
+    assert dict(table) == pair_supports
+    assert table[(2, 3)] == 7
+    assert (0, 4) not in table
+    with pytest.raises(KeyError):
+        table[(3, 5)]
+
+
+@pytest.mark.parametrize("collapse", [False, True])
+def test_fpgrowth_matches_brute_force(collapse, expected):
+    transactions, filtered_products = make_transactions()
+    if collapse:
+        transactions = transactions.collapse()[0]
+    lattice, max_level = FPGrowthAlgorithm().run_eclat(
+        transactions, filtered_products, MIN_SUPPORT
+    )
+    assert mined_supports(lattice) == expected
+    assert max_level == max(len(itemset) for itemset in expected)
+    if not collapse:
+        assert_tidlists(lattice)
+
+
+def test_fpgrowth_max_len(expected):
+    transactions, filtered_products = make_transactions()
+    lattice, _ = FPGrowthAlgorithm().run_eclat(
+        transactions, filtered_products, MIN_SUPPORT, max_len=2
+    )
+    assert mined_supports(lattice) == {
+        itemset: support for itemset, support in expected.items() if len(itemset) <= 2
+    }
+
+
+def top_k_expected(expected, k):
+    """Itemset >= 2 dengan support >= support ke-k (yang seri di batas ikut)"""
+    multi = sorted((s for itemset, s in expected.items() if len(itemset) >= 2), reverse=True)
+    threshold = multi[min(k, len(multi)) - 1]
+    return {
+        itemset: support
+        for itemset, support in expected.items()
+        if len(itemset) >= 2 and support >= threshold
+    }
+
+
+@pytest.mark.parametrize("miner", [EclatAlgorithm, FPGrowthAlgorithm])
+def test_top_k_matches_brute_force(miner, expected):
+    transactions, filtered_products = make_transactions()
+    multi = sorted((s for itemset, s in expected.items() if len(itemset) >= 2), reverse=True)
+    # Fixture harus punya support seri di batas top-k
+    assert any(multi[k - 1] == multi[k] for k in range(1, len(multi)))
+
+    for k in range(1, len(multi) + 3):
+        lattice, _ = miner().run_eclat(
+            transactions, filtered_products, MIN_SUPPORT, top_k=k, itemset_mode="all"
+        )
+        mined = mined_supports(lattice)
+        top = {itemset: s for itemset, s in mined.items() if len(itemset) >= 2}
+        assert top == top_k_expected(expected, k), k
+        assert len(top) >= min(k, len(multi))
+        # Subset yang ikut disimpan (1-itemset) supportnya tetap benar
+        assert all(expected[itemset] == s for itemset, s in mined.items())
+
+
+def test_top_k_rejects_condensed_modes():
+    transactions, filtered_products = make_transactions()
+    with pytest.raises(ValueError):
+        EclatAlgorithm().run_eclat(
+            transactions, filtered_products, MIN_SUPPORT, top_k=5, itemset_mode="closed"
+        )
+
+
+def condensed_expected(expected, mode):
+    """Closed: tanpa superset bersupport sama; maximal: tanpa superset frekuen"""
+    result = {}
+    for itemset, support in expected.items():
+        supersets = [
+            other for other in expected if len(other) == len(itemset) + 1 and itemset < other
+        ]
+        if mode == "closed" and all(expected[other] != support for other in supersets):
+            result[itemset] = support
+        if mode == "maximal" and not supersets:
+            result[itemset] = support
+    return result
+
+
+def rule_rows(lattice, total_transactions):
+    return sorted(
+        (
+            rule["Rule"],
+            rule["Confidence"],
+            rule["Lift"],
+            rule["Itemset_Support_Count"],
+            rule["Antecedent_Support_Count"],
+            rule["Consequent_Support_Count"],
+        )
+        for rule in RuleGenerator().calculate_confidence_and_lift(lattice, total_transactions)
+    )
+
+
+@pytest.mark.parametrize("engine", ["tidlist", "bitset"])
+@pytest.mark.parametrize("mode", ["closed", "maximal"])
+def test_condensed_modes_match_brute_force(engine, mode, expected):
+    transactions, filtered_products = make_transactions()
+    lattice, _ = EclatAlgorithm().run_eclat(
+        transactions, filtered_products, MIN_SUPPORT, engine=engine, itemset_mode=mode
+    )
+    assert lattice["itemset_mode"] == mode
+    mined = mined_supports(lattice)
+    assert {itemset: s for itemset, s in mined.items() if len(itemset) >= 2} == {
+        itemset: s for itemset, s in condensed_expected(expected, mode).items() if len(itemset) >= 2
+    }
+    # Semua 1-itemset frekuen tetap ada untuk menghitung ulang support subset
+    assert {itemset: s for itemset, s in mined.items() if len(itemset) == 1} == {
+        itemset: s for itemset, s in expected.items() if len(itemset) == 1
+    }
+
+    # Rule dari lattice ringkas = rule dari lattice penuh untuk itemset ringkas
+    full, _ = EclatAlgorithm().run_eclat(
+        transactions, filtered_products, MIN_SUPPORT, engine=engine, itemset_mode="all"
+    )
+    kept = {itemset for itemset in mined if len(itemset) >= 2}
+    expected_rules = [
+        row
+        for row in rule_rows(full, len(transactions))
+        if frozenset(row[0].replace(" -> ", " + ").split(" + ")) in kept
+    ]
+    assert expected_rules
+    assert rule_rows(lattice, len(transactions)) == expected_rules
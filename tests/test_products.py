@@ -0,0 +1,185 @@
+"""Analisis produk terjual/tidak terjual dan pencocokan SKU."""
+
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app import ProductAnalyzer, SkuMatcher, app
+
+NULL_TOKENS = ["nan", "none", "", "null"]
+
+
+def per_row_product_sales(transaction_df, product_df):
+    """Implementasi lama analyze_product_sales (iterrows), untuk pembanding"""
+    sku_col, code_col = product_df.columns[0], product_df.columns[1]
+    master, mapping = set(), {}
+    for idx, row in product_df.iterrows():
+        sku, code = row[sku_col], row[code_col]
+        if pd.isna(sku):
+            continue
+        sku_clean = str(sku).strip()
+        if sku_clean.lower() in NULL_TOKENS:
+            continue
+        master.add(sku_clean)
+        mapping[sku_clean] = str(code).strip() if pd.notna(code) else f"P{idx+1}"
+
+    counts = defaultdict(int)
+    for _, row in transaction_df.iterrows():
+        value = row["Seller SKU"]
+        if pd.isna(value) or str(value).strip().lower() in NULL_TOKENS:
+            continue
+        counts[str(value).strip()] += 1
+
+    sold = master & set(counts)
+    if not sold:
+        lower = {sku.lower(): sku for sku in master}
+        sold = {lower[sku] for sku in set(lower) & {sku.lower() for sku in counts}}
+    return {
+        "total_products": len(master),
+        "sold": sorted((-counts.get(sku, 0), sku, mapping[sku]) for sku in sold),
+        "unsold": [(sku, mapping[sku]) for sku in sorted(master - sold)],
+        "mapping": list(mapping),
+    }
+
+
+def summarize(result):
+    return {
+        "total_products": result["total_products"],
+        "sold": sorted((-p["sales_count"], p["name"], p["code"]) for p in result["sold_products"]),
+        "unsold": [(p["name"], p["code"]) for p in result["unsold_products"]],
+        "mapping": list(result["product_mapping"]),
+    }
+
+
+def random_catalog(n_products, seed):
+    """Master dan transaksi acak dengan SKU duplikat, spasi, token null dan kode kosong"""
+    rng = np.random.default_rng(seed)
+    skus = [f"SKU-{i:05d}" for i in range(n_products)]
+    master_skus = [
+        rng.choice([sku, f" {sku} ", None, "null", "NaN"], p=[0.8, 0.1, 0.04, 0.03, 0.03])
+        for sku in skus
+    ]
+    master_skus += list(rng.choice(skus, size=n_products // 10))
+    codes = [None if rng.random() < 0.05 else f"K{i}" for i in range(len(master_skus))]
+    product_df = pd.DataFrame({"SKU Penjual": master_skus, "Kode Produk": codes})
+
+    sold = rng.choice(skus + ["LAIN-1", "LAIN-2", "", "none"], size=n_products * 5)
+    sold = [f"{sku}  " if rng.random() < 0.1 else sku for sku in sold]
+    transaction_df = pd.DataFrame({"Seller SKU": sold})
+    return transaction_df, product_df
+
+
+@pytest.fixture
+def exact_matching(monkeypatch):
+    monkeypatch.setitem(app.config, "SKU_FUZZY_MATCHING", False)
+
+
+@pytest.mark.parametrize("n_products, seed", [(20, 0), (200, 1), (2000, 2)])
+def test_product_sales_match_per_row(exact_matching, n_products, seed):
+    transaction_df, product_df = random_catalog(n_products, seed)
+    result, error = ProductAnalyzer().analyze_product_sales(transaction_df, product_df)
+    assert error is None
+    assert summarize(result) == per_row_product_sales(transaction_df, product_df)
+    assert result["sold_products_count"] + result["unsold_products_count"] == result["total_products"]
+    assert [count for _, count in result["top_selling"]] == sorted(
+        (p["sales_count"] for p in result["sold_products"]), reverse=True
+    )[:10]
+
+
+def test_product_sales_case_insensitive_fallback(exact_matching):
+    product_df = pd.DataFrame({"SKU Penjual": ["abc-1", "ABC-2", "xyz"], "Kode Produk": ["1", "2", "3"]})
+    transaction_df = pd.DataFrame({"Seller SKU": ["ABC-1", "abc-2", "abc-2"]})
+    result, error = ProductAnalyzer().analyze_product_sales(transaction_df, product_df)
+    assert error is None
+    assert summarize(result) == per_row_product_sales(transaction_df, product_df)
+    assert result["sold_products_count"] == 2
+
+
+def test_product_sales_without_valid_master(exact_matching):
+    product_df = pd.DataFrame({"SKU Penjual": [None, "null", " "], "Kode Produk": ["1", "2", "3"]})
+    result, error = ProductAnalyzer().analyze_product_sales(
+        pd.DataFrame({"Seller SKU": ["A"]}), product_df
+    )
+    assert result is None
+    assert "Tidak ada data produk" in error
+
+
+MASTER_SKUS = [
+    "KAOS-POLOS-HITAM-M",
+    "KAOS-POLOS-PUTIH-M",
+    "BOTOL-500",
+    "TUMBLER-STAINLESS-01",
+    "TUMBLER-STAINLESS-02",
+    "CELANA-JOGGER-ABU-XL",
+]
+
+
+@pytest.mark.parametrize(
+    "sku, master, method",
+    [
+        ("KAOS-POLOS-HITAM-M", "KAOS-POLOS-HITAM-M", "exact"),
+        ("kaos polos hitam m", "KAOS-POLOS-HITAM-M", "normalized"),
+        ("CELANA JOGGER ABU XL ", "CELANA-JOGGER-ABU-XL", "normalized"),
+        ("KAOS-POLOS-HITAM-M-BUNDLE", "KAOS-POLOS-HITAM-M", "prefix"),
+        ("TUMBLER-STAINLES-01", "TUMBLER-STAINLESS-01", "trigram"),
+        ("CELANA-JOGER-ABU-XL", "CELANA-JOGGER-ABU-XL", "trigram"),
+        # Angka adalah identitas produk: tidak dipotong, tidak boleh berbeda
+        ("BOTOL-5000", None, "none"),
+        ("TUMBLER-STAINLESS-03", None, "none"),
+        ("XYZ", None, "none"),
+        ("", None, "none"),
+    ],
+)
+def test_sku_matcher_methods(sku, master, method):
+    matched, confidence, matched_method = SkuMatcher(MASTER_SKUS).match(sku)
+    assert (matched, matched_method) == (master, method)
+    if master is None:
+        assert confidence == 0.0
+    else:
+        assert 0.75 <= confidence <= 1.0
+
+
+def test_sku_matcher_confidence_order_and_threshold():
+    matcher = SkuMatcher(MASTER_SKUS, min_confidence=0.5)
+    exact = matcher.match("BOTOL-500")[1]
+    normalized = matcher.match("botol 500")[1]
+    short_suffix = matcher.match("BOTOL-500-B")[1]
+    long_suffix = matcher.match("BOTOL-500-PROMO-SPESIAL")[1]
+    assert exact > normalized > short_suffix > long_suffix
+
+    # Suffix panjang tidak lolos threshold default
+    assert SkuMatcher(MASTER_SKUS).match("BOTOL-500-PROMO-SPESIAL") == (None, 0.0, "none")
+
+
+def test_sku_matcher_mapping_table_is_cached():
+    matcher = SkuMatcher(MASTER_SKUS)
+    table = matcher.mapping_table(["kaos polos putih m", "XYZ"])
+    assert table.columns.tolist() == ["transaction_sku", "master_sku", "confidence", "method"]
+    assert table["master_sku"].tolist() == ["KAOS-POLOS-PUTIH-M", None]
+    assert set(matcher.matches) == {"kaos polos putih m", "XYZ"}
+
+
+def test_fuzzy_matching_moves_sales_to_master(monkeypatch):
+    monkeypatch.setitem(app.config, "SKU_FUZZY_MATCHING", True)
+    product_df = pd.DataFrame({"SKU Penjual": MASTER_SKUS, "Kode Produk": list("ABCDEF")})
+    transaction_df = pd.DataFrame(
+        {
+            "Seller SKU": [
+                "KAOS-POLOS-HITAM-M",
+                "kaos polos hitam m",
+                "TUMBLER-STAINLES-01",
+                "BOTOL-5000",
+            ]
+        }
+    )
+    result, error = ProductAnalyzer().analyze_product_sales(transaction_df, product_df)
+    assert error is None
+    sold = {p["name"]: p["sales_count"] for p in result["sold_products"]}
+    assert sold == {"KAOS-POLOS-HITAM-M": 2, "TUMBLER-STAINLESS-01": 1}
+    assert result["fuzzy_matched_count"] == 2
+    assert {row["transaction_sku"] for row in result["sku_mapping"]} == {
+        "kaos polos hitam m",
+        "TUMBLER-STAINLES-01",
+    }
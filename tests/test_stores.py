@@ -0,0 +1,200 @@
+"""Penyimpanan persisten: katalog produk (CatalogStore) dan basket order (BasketStore)."""
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from app import BasketStore, CatalogStore, DataProcessor, TransactionStore
+
+
+def master(*rows):
+    return {sku: {"name": sku, "code": code} for sku, code in rows}
+
+
+def loader(mapping, calls=None):
+    def load():
+        if calls is not None:
+            calls.append(1)
+        return mapping, "SKU"
+
+    return load
+
+
+def catalog_rows(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT sku, code, position FROM catalog ORDER BY position").fetchall()
+
+
+def test_catalog_applies_master_as_diff(tmp_path, caplog):
+    path = str(tmp_path / "catalog.sqlite3")
+    store = CatalogStore(path)
+    store.record_sales("trx", pd.Series({"B": 3, "X": 1, "A": 2}))
+
+    catalog, sku_col, sales = store.snapshot(
+        "m1", "trx", loader(master(("A", "1"), ("B", "2"), ("C", "3")))
+    )
+    assert list(catalog) == ["A", "B", "C"]
+    assert sku_col == "SKU"
+    # SKU katalog urut master, lalu SKU di luar katalog
+    assert sales.to_dict() == {"A": 2, "B": 3, "X": 1}
+    assert sales.index.tolist() == ["A", "B", "X"]
+
+    caplog.set_level("INFO")
+    # B dihapus, C berubah kode, D baru; A tetap
+    catalog, _, sales = store.snapshot(
+        "m2", "trx", loader(master(("A", "1"), ("C", "9"), ("D", "4")))
+    )
+    assert catalog == master(("A", "1"), ("C", "9"), ("D", "4"))
+    assert sales.index.tolist() == ["A", "B", "X"]
+    assert catalog_rows(path) == [("A", "1", 0), ("C", "9", 1), ("D", "4", 2)]
+    assert "'added': 1, 'removed': 1, 'changed': 1, 'moved': 0" in caplog.text
+    assert store.master_state() == {"master_digest": "m2", "sku_col": "SKU"}
+
+
+def test_catalog_same_master_is_not_reloaded(tmp_path):
+    store = CatalogStore(str(tmp_path / "catalog.sqlite3"))
+    calls = []
+    mapping = master(("A", "1"), ("B", "2"))
+    first = store.snapshot("m1", "trx", loader(mapping, calls))
+    second = store.snapshot("m1", "trx", loader(mapping, calls))
+    assert calls == [1]
+    assert first[0] == second[0] == mapping
+
+    # Master tanpa SKU valid tidak mengubah katalog
+    assert store.snapshot("m2", "trx", loader({})) is None
+    assert store.master_state()["master_digest"] == "m1"
+
+
+def test_catalog_reorder_updates_positions_only(tmp_path):
+    path = str(tmp_path / "catalog.sqlite3")
+    store = CatalogStore(path)
+    store.snapshot("m1", "trx", loader(master(("A", "1"), ("B", "2"), ("C", "3"))))
+    catalog, _, _ = store.snapshot("m2", "trx", loader(master(("C", "3"), ("A", "1"), ("B", "2"))))
+    assert list(catalog) == ["C", "A", "B"]
+    assert catalog_rows(path) == [("C", "3", 0), ("A", "1", 1), ("B", "2", 2)]
+
+
+def test_catalog_migrates_old_layouts(tmp_path):
+    # Katalog tunggal tanpa kolom position
+    path = str(tmp_path / "single.sqlite3")
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE catalog (sku TEXT PRIMARY KEY, code TEXT NOT NULL)")
+        conn.execute("CREATE TABLE catalog_meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.executemany("INSERT INTO catalog VALUES (?, ?)", [("B", "2"), ("A", "1")])
+        conn.executemany(
+            "INSERT INTO catalog_meta VALUES (?, ?)", [("master_digest", "m1"), ("sku_col", "SKU")]
+        )
+    store = CatalogStore(path)
+    catalog, _, _ = store.snapshot("m1", "trx", loader({}))
+    assert list(catalog) == ["B", "A"]
+
+    # Katalog per digest
+    path = str(tmp_path / "digest.sqlite3")
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE catalog_masters (digest TEXT PRIMARY KEY, sku_col TEXT, created_at REAL)"
+        )
+        conn.execute(
+            "CREATE TABLE catalog_items (digest TEXT, sku TEXT, code TEXT, position INTEGER)"
+        )
+        conn.executemany(
+            "INSERT INTO catalog_masters VALUES (?, ?, ?)", [("old", "SKU", 1.0), ("new", "Seller SKU", 2.0)]
+        )
+        conn.executemany(
+            "INSERT INTO catalog_items VALUES (?, ?, ?, ?)",
+            [("old", "Z", "0", 0), ("new", "B", "2", 1), ("new", "A", "1", 0)],
+        )
+    store = CatalogStore(path)
+    assert store.master_state() == {"master_digest": "new", "sku_col": "Seller SKU"}
+    catalog, sku_col, _ = store.snapshot("new", "trx", loader({}))
+    assert list(catalog) == ["A", "B"]
+    assert sku_col == "Seller SKU"
+    with sqlite3.connect(path) as conn:
+        tables = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert "catalog_items" not in tables and "catalog_masters" not in tables
+
+
+def export(rows, with_date=True):
+    frame = pd.DataFrame(rows, columns=["Order ID", "Seller SKU", "Created Time"])
+    return frame if with_date else frame.drop(columns="Created Time")
+
+
+def append(store, frame):
+    orders, products, days = TransactionStore.clean_lines(frame)
+    return store.append(orders, products, days)
+
+
+def baskets(transaction_store):
+    return [sorted(basket) for basket in transaction_store.baskets.to_lists()]
+
+
+def test_basket_store_appends_only_new_orders(tmp_path):
+    store = BasketStore(str(tmp_path / "baskets.sqlite3"))
+    first = export(
+        [
+            ["1", "A", "01/03/2025 10:00:00"],
+            ["1", "B", "01/03/2025 10:00:00"],
+            ["2", "A", "02/03/2025 09:00:00"],
+        ]
+    )
+    summary = append(store, first)
+    assert summary["orders_added"] == 2
+    assert summary["new_items"] == 2
+
+    # Export berikutnya tumpang tindih: order 2 sudah ada, order 3 baru
+    overlap = export(
+        [
+            ["2", "A", "02/03/2025 09:00:00"],
+            ["3", "A", "03/03/2025 08:00:00"],
+            ["3", "C", "03/03/2025 08:00:00"],
+            ["3", "C", "03/03/2025 08:00:00"],
+        ]
+    )
+    summary = append(store, overlap)
+    assert summary["orders_in_file"] == 2
+    assert summary["orders_added"] == 1
+    assert summary["duplicate_orders"] == 1
+    assert summary["new_items"] == 1
+    assert summary["lines_added"] == 3
+    assert summary["total_orders"] == 3
+
+    with sqlite3.connect(store.db_path) as conn:
+        counts = dict(
+            (sku, (orders, lines))
+            for sku, orders, lines in conn.execute(
+                "SELECT sku, order_count, line_count FROM basket_items"
+            )
+        )
+    assert counts == {"A": (3, 3), "B": (1, 1), "C": (1, 2)}
+
+    history = store.transaction_store(summary["total_orders"])
+    assert baskets(history) == [["A", "B"], ["A"], ["A", "C"]]
+    assert history.tx_days.astype(str).tolist() == ["2025-03-01", "2025-03-02", "2025-03-03"]
+    # Snapshot n_orders mengabaikan order yang masuk belakangan
+    assert baskets(store.transaction_store(2)) == [["A", "B"], ["A"]]
+
+
+def test_basket_store_skips_known_export(tmp_path):
+    store = BasketStore(str(tmp_path / "baskets.sqlite3"))
+    frame = export([["1", "A", "01/03/2025"], ["1", "B", "01/03/2025"]])
+    orders, products, days = TransactionStore.clean_lines(frame)
+    assert store.append(orders, products, days, digest="d1")["orders_added"] == 1
+    again = store.append(orders, products, days, digest="d1")
+    assert again["orders_added"] == 0
+    assert again["total_orders"] == 1
+    assert again["ingests"] == 1
+
+
+def test_append_orders_without_date_column(tmp_path):
+    processor = DataProcessor()
+    processor._basket_store = BasketStore(str(tmp_path / "baskets.sqlite3"))
+    frame = export([["1", "A", None], ["1", "B", None], ["2", "B", None]], with_date=False)
+
+    summary, error = processor.append_orders(frame)
+    assert error is None
+    assert summary["orders_added"] == 2
+
+    history = processor.basket_store.transaction_store(summary["total_orders"])
+    assert baskets(history) == [["A", "B"], ["B"]]
+    assert np.isnat(history.tx_days).all()
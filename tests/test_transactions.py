@@ -0,0 +1,191 @@
+"""Pembentukan basket dan transaksi terenkode (EncodedTransactions)."""
+
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app import DataProcessor, EclatAlgorithm, EncodedTransactions, RuleGenerator
+
+
+def random_lines(n_lines, seed, n_orders=None, n_skus=40):
+    """Baris export acak: order berulang, SKU duplikat dalam order, nilai kosong"""
+    rng = np.random.default_rng(seed)
+    n_orders = n_orders or max(1, n_lines // 3)
+    orders = rng.integers(0, n_orders, size=n_lines)
+    # Distribusi SKU miring agar sebagian SKU gugur di min_support_count
+    skus = np.minimum(rng.geometric(0.08, size=n_lines), n_skus)
+    frame = pd.DataFrame(
+        {
+            "Order ID": [f"{5000 + order}" for order in orders],
+            "Seller SKU": [f" SKU-{sku:03d}" if sku % 7 == 0 else f"SKU-{sku:03d}" for sku in skus],
+            "SKU ID": [f"{900 + sku}" for sku in skus],
+        }
+    )
+    frame.loc[rng.random(n_lines) < 0.02, "Seller SKU"] = None
+    frame.loc[rng.random(n_lines) < 0.02, "SKU ID"] = None
+    return frame
+
+
+def per_row_baskets(df, min_support_count):
+    """Pembentukan basket lama: iterrows + cek `not in` per order"""
+    df_clean = df.dropna(subset=["Order ID", "Seller SKU", "SKU ID"]).astype(str)
+    df_clean["Seller SKU"] = df_clean["Seller SKU"].str.strip()
+    product_counts = df_clean["Seller SKU"].value_counts().to_dict()
+    filtered_products = {
+        product: count for product, count in product_counts.items() if count >= min_support_count
+    }
+    transactions_by_order = defaultdict(list)
+    for _, row in df_clean.iterrows():
+        product = row["Seller SKU"]
+        if product in filtered_products and product not in transactions_by_order[row["Order ID"]]:
+            transactions_by_order[row["Order ID"]].append(product)
+    return list(transactions_by_order.values()), filtered_products, df_clean["Order ID"].nunique()
+
+
+@pytest.mark.parametrize("n_lines, seed, min_support_count", [(50, 0, 2), (2000, 1, 2), (2000, 2, 10)])
+def test_prepare_transactions_matches_per_row(n_lines, seed, min_support_count):
+    df = random_lines(n_lines, seed)
+    transactions, error, single, total_orders, total_combined, filtered_products = (
+        DataProcessor().prepare_transactions(df, min_support_count=min_support_count)
+    )
+    assert error is None
+    expected, expected_products, expected_orders = per_row_baskets(df, min_support_count)
+
+    assert transactions.to_lists() == expected
+    assert filtered_products == expected_products
+    assert list(filtered_products) == list(expected_products)
+    assert total_orders == expected_orders
+    assert total_combined == len(expected)
+    assert single == sum(len(basket) < 2 for basket in expected)
+
+
+def test_prepare_transactions_skips_description_row():
+    df = random_lines(30, 3)
+    description = pd.DataFrame(
+        [["Platform unique order ID.", "Seller SKU desc", "SKU ID desc"]], columns=df.columns
+    )
+    with_description = pd.concat([description, df], ignore_index=True)
+    processor = DataProcessor()
+    plain = processor.prepare_transactions(df)
+    described = processor.prepare_transactions(with_description)
+    assert described[0].to_lists() == plain[0].to_lists()
+    assert described[3] == plain[3]
+
+
+def test_prepare_transactions_missing_columns():
+    result = DataProcessor().prepare_transactions(pd.DataFrame({"Order ID": ["1"]}))
+    assert result[0] is None
+    assert "tidak ditemukan" in result[1]
+
+
+LISTS = [["B", "A", "B"], ["C"], ["A", "C", "D"], ["D", "A"], ["B", "A"]]
+
+
+def test_from_codes_orders_baskets_by_first_line():
+    items = np.array(["A", "B", "C"], dtype=object)
+    # Order 7 muncul lebih dulu dari order 2; pasangan duplikat dibuang
+    line_tx = np.array([7, 2, 7, 7, 2, 9], dtype=np.int32)
+    line_item = np.array([2, 0, 0, 2, 1, 1], dtype=np.int32)
+    transactions = EncodedTransactions.from_codes(line_tx, line_item, items)
+    assert transactions.to_lists() == [["C", "A"], ["A", "B"], ["B"]]
+    assert transactions.indptr.tolist() == [0, 2, 4, 5]
+    assert transactions.indices.dtype == np.int32
+
+    empty = EncodedTransactions.from_codes(line_tx[:0], line_item[:0], items)
+    assert len(empty) == 0 and empty.to_lists() == []
+
+
+def test_encoded_transactions_round_trip():
+    transactions = EncodedTransactions.from_lists(LISTS)
+    assert transactions.items.tolist() == ["A", "B", "C", "D"]
+    assert transactions.to_lists() == [["B", "A"], ["C"], ["A", "C", "D"], ["D", "A"], ["B", "A"]]
+    assert transactions.basket_sizes().tolist() == [2, 1, 3, 2, 2]
+    assert transactions.encode(["D", "X", "A"]) == [3, 0]
+    assert transactions.decode([0, 3]) == ("A", "D")
+    assert transactions.total_weight == len(LISTS)
+
+
+def test_item_tidlists_and_counts():
+    transactions = EncodedTransactions.from_lists(LISTS)
+    tidlists = transactions.item_tidlists()
+    for item, sku in enumerate(transactions.items):
+        expected = [tid for tid, basket in enumerate(LISTS) if sku in basket]
+        assert tidlists[item].tolist() == expected
+    assert set(transactions.item_tidlists(item_ids=[1, 3])) == {1, 3}
+
+    assert transactions.item_counts().tolist() == [4, 2, 2, 2]
+    assert transactions.item_counts(np.array([0, 2])).tolist() == [2, 1, 1, 1]
+
+
+def test_subset_drops_empty_baskets():
+    transactions = EncodedTransactions.from_lists(LISTS)
+    keep_items = np.array([False, True, True, False])
+    subset = transactions.subset(
+        transaction_mask=np.array([True, True, True, True, False]), item_mask=keep_items
+    )
+    assert subset.to_lists() == [["B"], ["C"], ["C"]]
+    assert subset.items is transactions.items
+
+
+def rules_by_name(transactions, min_support=0.2):
+    lattice, _ = EclatAlgorithm().run_eclat(
+        transactions,
+        {sku: 2 for sku in transactions.items},
+        min_support,
+        workers=1,
+        itemset_mode="all",
+    )
+    rules = RuleGenerator().calculate_confidence_and_lift(lattice, transactions.total_weight)
+    return {
+        rule["Rule"]: (rule["Itemset_Support_Count"], rule["Confidence"], rule["Lift"])
+        for rule in rules
+    }
+
+
+def test_rules_are_decoded_at_output():
+    rules = rules_by_name(EncodedTransactions.from_lists(LISTS))
+    # A ada di 4 dari 5 basket, A+B di 2: confidence 2/4, lift 0.5 / (2/5)
+    assert rules["A -> B"] == (2, 0.5, pytest.approx(1.25))
+    assert rules["B -> A"] == (2, 1.0, pytest.approx(1.25))
+    assert all(isinstance(name, str) for name in rules)
+
+
+def test_collapse_merges_identical_baskets():
+    # ["B", "A"] dan ["A", "B"] adalah basket yang sama
+    lists = LISTS + [["A", "B"], ["C"], ["A", "B", "C"]]
+    transactions = EncodedTransactions.from_lists(lists)
+    collapsed, codes = transactions.collapse()
+    assert collapsed.to_lists() == [["B", "A"], ["C"], ["A", "C", "D"], ["D", "A"], ["A", "B", "C"]]
+    assert collapsed.weights.tolist() == [3, 2, 1, 1, 1]
+    assert codes.tolist() == [0, 1, 2, 3, 0, 0, 1, 4]
+    assert collapsed.total_weight == len(lists)
+
+    # Collapse ulang menjumlahkan bobot yang sudah ada
+    again, _ = collapsed.collapse()
+    assert again.weights.tolist() == collapsed.weights.tolist()
+
+
+def test_collapse_within_groups():
+    transactions = EncodedTransactions.from_lists([["A", "B"], ["A", "B"], ["A", "B"], ["C"]])
+    collapsed, codes = transactions.collapse(groups=np.array([1, 2, 1, 2]))
+    assert collapsed.to_lists() == [["A", "B"], ["A", "B"], ["C"]]
+    assert collapsed.weights.tolist() == [2, 1, 1]
+    assert codes.tolist() == [0, 1, 0, 2]
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_collapsed_rules_match_uncollapsed(seed):
+    rng = np.random.default_rng(seed)
+    common = [["A", "B"], ["A", "B", "C"], ["D"], ["C", "E"]]
+    lists = [
+        common[i] if i < len(common) else list(rng.choice(list("ABCDEF"), size=3, replace=False))
+        for i in rng.integers(0, 7, size=300)
+    ]
+    transactions = EncodedTransactions.from_lists(lists)
+    collapsed, _ = transactions.collapse()
+    assert len(collapsed) < len(transactions) / 3
+    expected = rules_by_name(transactions, min_support=0.05)
+    assert expected
+    assert rules_by_name(collapsed, min_support=0.05) == expected
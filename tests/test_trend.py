@@ -0,0 +1,177 @@
+"""Rentang tanggal lewat TransactionStore dan tren per window, dibandingkan dengan
+pipeline lama (filter DataFrame lalu prepare_transactions) per rentang."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app import (
+    BundlingRecommendationSystem,
+    DataProcessor,
+    DateFilter,
+    EclatAlgorithm,
+    RuleGenerator,
+    TransactionStore,
+)
+
+THRESHOLDS = {"min_support": 0.05, "min_confidence": 0.2, "min_lift": 1.0}
+
+
+def trend_export(seed=0, n_days=10, orders_per_day=30):
+    """Export acak: A+B sering di awal periode, C+D di akhir"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    order = 0
+    for day in range(n_days):
+        date = (pd.Timestamp("2025-03-01") + pd.Timedelta(days=day)).strftime("%d/%m/%Y 10:00:00")
+        pair = "AB" if day < n_days // 2 else "CD"
+        for _ in range(orders_per_day):
+            basket = set(rng.choice(list("ABCDEFG"), size=int(rng.integers(1, 4))))
+            if rng.random() < 0.5:
+                basket |= set(pair)
+            for sku in sorted(basket):
+                rows.append([f"O{order}", f"SKU-{sku}", date])
+            order += 1
+    return pd.DataFrame(rows, columns=["Order ID", "Seller SKU", "Created Time"])
+
+
+def reference_window(df, start, end):
+    """Window lewat jalur lama: filter DataFrame, prepare_transactions, ECLAT"""
+    date_format = "%d/%m/%Y"
+    filtered, error = DateFilter().filter_dataframe_by_date_range(
+        df, "Created Time", start.strftime(date_format), end.strftime(date_format)
+    )
+    assert error is None
+    transactions, error, _, _, _, filtered_products = DataProcessor().prepare_transactions(
+        filtered, min_support_count=2
+    )
+    assert error is None
+    all_tidlists, _ = EclatAlgorithm().run_eclat(
+        transactions, filtered_products, THRESHOLDS["min_support"], workers=1
+    )
+    generator = RuleGenerator()
+    rules = generator.deduplicate_rules(
+        generator.calculate_confidence_and_lift(all_tidlists, len(transactions))
+    )
+    return len(transactions), {
+        rule["Itemset_ID"]: pytest.approx(rule["Lift"])
+        for rule in rules
+        if rule["Itemset_Support"] >= THRESHOLDS["min_support"]
+        and rule["Confidence"] >= THRESHOLDS["min_confidence"]
+        and rule["Lift"] >= THRESHOLDS["min_lift"]
+    }
+
+
+@pytest.fixture(scope="module")
+def export_frame():
+    return trend_export()
+
+
+@pytest.fixture
+def export_path(tmp_path, export_frame):
+    path = tmp_path / "orders.csv"
+    export_frame.to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_trend_windows_match_per_range_mining(export_path, export_frame, workers):
+    result, error = BundlingRecommendationSystem().run_trend_analysis(
+        export_path, window_days=3, step_days=2, workers=workers, **THRESHOLDS
+    )
+    assert error is None
+
+    windows = result["windows"]
+    assert [(w["start"], w["end"]) for w in windows] == [
+        ("2025-03-01", "2025-03-03"),
+        ("2025-03-03", "2025-03-05"),
+        ("2025-03-05", "2025-03-07"),
+        ("2025-03-07", "2025-03-09"),
+    ]
+
+    series = {
+        tuple(trend["itemset"].split(" + ")): trend for trend in result["trends"]
+    }
+    for position, window in enumerate(windows):
+        start, end = pd.Timestamp(window["start"]), pd.Timestamp(window["end"])
+        transaction_count, rules = reference_window(export_frame, start, end)
+        assert window["transactions"] == transaction_count
+        assert window["rules_count"] == len(rules)
+        present = {
+            itemset: trend["lift"][position]
+            for itemset, trend in series.items()
+            if trend["lift"][position] is not None
+        }
+        assert present == rules
+
+    # A+B stabil di awal periode, C+D di akhir
+    ab = series[("SKU-A", "SKU-B")]
+    cd = series[("SKU-C", "SKU-D")]
+    assert ab["lift"][0] is not None and ab["lift"][-1] is None
+    assert cd["lift"][0] is None and cd["lift"][-1] is not None
+    assert ab["stability"] == ab["windows_present"] / len(windows)
+
+
+def test_trend_rejects_invalid_window(export_path):
+    system = BundlingRecommendationSystem()
+    assert system.run_trend_analysis(export_path, window_days=0)[1]
+    assert system.run_trend_analysis(export_path, step_days=0)[1]
+
+
+
+def decoded_supports(lattice):
+    items = lattice["items"]
+    return {
+        frozenset(items[list(key)] if isinstance(key, tuple) else [items[key]]): support
+        for key, support in lattice["supports"].items()
+    }
+
+
+@pytest.mark.parametrize("collapse", [False, True])
+@pytest.mark.parametrize(
+    "start, end", [("2025-03-01", "2025-03-10"), ("2025-03-04", "2025-03-06"), ("2025-03-09", "2025-03-09")]
+)
+def test_store_range_matches_filtered_frame(export_frame, collapse, start, end):
+    store = TransactionStore.build(export_frame)
+    start_day, end_day = np.datetime64(start), np.datetime64(end)
+    date_format = "%d/%m/%Y"
+    filtered, _ = DateFilter().filter_dataframe_by_date_range(
+        export_frame,
+        "Created Time",
+        pd.Timestamp(start).strftime(date_format),
+        pd.Timestamp(end).strftime(date_format),
+    )
+    expected, _, single, total_orders, _, filtered_products = DataProcessor().prepare_transactions(
+        filtered, min_support_count=2
+    )
+
+    mask = store.date_mask(start_day, end_day)
+    assert int(mask.sum()) == filtered["Order ID"].nunique()
+    transactions, store_single, store_total, store_products = store.select(mask, 2)
+    assert store_products == filtered_products
+    assert list(store_products) == list(filtered_products)
+    assert (len(transactions), store_single, store_total) == (len(expected), single, total_orders)
+
+    # Mining memakai tidlist yang sudah di-cache, dibatasi mask tanggal
+    item_tidlists, row_mask, weights = store.mining_selection(start_day, end_day, collapse)
+    lattice, _ = EclatAlgorithm().run_eclat(
+        transactions,
+        store_products,
+        0.05,
+        item_tidlists=item_tidlists,
+        transaction_mask=row_mask,
+        weights=weights,
+        workers=1,
+        itemset_mode="all",
+    )
+    reference, _ = EclatAlgorithm().run_eclat(
+        expected, filtered_products, 0.05, workers=1, itemset_mode="all"
+    )
+    assert decoded_supports(lattice) == decoded_supports(reference)
+
+
+def test_store_without_range_selects_everything(export_frame):
+    store = TransactionStore.build(export_frame)
+    assert store.date_mask(None, None).all()
+    assert len(store.date_mask(None, None)) == export_frame["Order ID"].nunique()
+    assert not store.date_mask(np.datetime64("2025-04-01"), np.datetime64("2025-04-30")).any()